@@ -0,0 +1,62 @@
+import sys
+from servicos.benchmark import (FORMATOS, TAMANHOS_ESTRATEGIAS, TAMANHOS_PADRAO, comparar,
+                                comparar_estrategias, executar_benchmark, salvar_benchmark,
+                                tabela_benchmark, tabela_estrategias)
+from servicos.simulador import SimuladorIncendios
+from utils.linha_comando import LinhaComando
+
+USO = ("Uso: python benchmark.py [--tamanhos 10,100,1000,10000] [--repeticoes N] [--max-dias N] "
+       "[--motor objetos|vetorizado] [--estrategia guloso|prioridade|fluxo] [--formato auto|matriz|arestas] "
+       "[--processos N] [--sem-memoria] [--saida arquivo.json] [--comparar referencia.json]\n"
+       "       python benchmark.py --estrategias guloso,fluxo [--tamanhos 100,1000] [--max-dias N] "
+       "[--processos N] [--saida arquivo.json]")
+
+
+def main():
+    if '--ajuda' in sys.argv[1:]:
+        print(USO)
+        sys.exit(0)
+
+    argumentos = LinhaComando(USO)
+
+    # --estrategias: mesmas instâncias com cada estratégia de alocação (tempo e dias até a extinção)
+    estrategias = argumentos.escolhas('--estrategias', list(SimuladorIncendios.ALOCADORES))
+    if estrategias:
+        tamanhos = argumentos.inteiros('--tamanhos', list(TAMANHOS_ESTRATEGIAS), minimo=2)
+        config = {'estrategias': estrategias, 'max_dias': argumentos.inteiro('--max-dias', 30, minimo=1),
+                  'processos': argumentos.inteiro('--processos', 1, minimo=1)}
+        linhas = comparar_estrategias(tamanhos, **config)
+        print()
+        print(tabela_estrategias(linhas))
+        salvar_benchmark(linhas, {'tamanhos': tamanhos, **config}, argumentos.valor('--saida'))
+        return
+
+    # Tamanho mínimo 2: uma instância precisa de ao menos um foco e um posto
+    tamanhos = argumentos.inteiros('--tamanhos', list(TAMANHOS_PADRAO), minimo=2)
+    config = {
+        'max_dias': argumentos.inteiro('--max-dias', 30, minimo=1),
+        'motor': argumentos.escolha('--motor', SimuladorIncendios.MOTORES, 'objetos'),
+        'estrategia': argumentos.escolha('--estrategia', list(SimuladorIncendios.ALOCADORES), 'guloso'),
+        'processos': argumentos.inteiro('--processos', 1, minimo=1),
+    }
+    if config['motor'] == 'vetorizado' and config['estrategia'] != 'guloso':
+        argumentos.sair_com_uso("O motor vetorizado usa sua própria alocação gulosa")
+    opcoes = {
+        'formato': argumentos.escolha('--formato', FORMATOS, 'auto'),
+        'repeticoes': argumentos.inteiro('--repeticoes', 1, minimo=1),
+        'memoria': '--sem-memoria' not in sys.argv[1:],
+    }
+
+    linhas = executar_benchmark(tamanhos, **opcoes, **config)
+    print()
+    print(tabela_benchmark(linhas))
+    salvar_benchmark(linhas, {'tamanhos': tamanhos, **opcoes, **config}, argumentos.valor('--saida'))
+
+    referencia = argumentos.valor('--comparar')
+    if referencia:
+        print()
+        print(comparar(linhas, referencia))
+
+
+if __name__ == '__main__':
+    main()
@@ -1,23 +1,29 @@
-from typing import List
+from typing import List, Optional
 
 
 class Foco:
     """Representa um foco de incêndio"""
 
-    def __init__(self, id_foco: str, area_inicial: float, taxa_alpha: float):
+    __slots__ = ('id', 'area_inicial', 'taxa_alpha', 'area_atual', 'status', 'dia_extincao',
+                 'historico_areas')
+
+    def __init__(self, id_foco: str, area_inicial: float, taxa_alpha: float,
+                 guardar_historico: bool = True):
         self.id = id_foco
         self.area_inicial = float(area_inicial)
         self.taxa_alpha = float(taxa_alpha)
         self.area_atual = float(area_inicial)
         self.status = 'ativo'  # 'ativo' ou 'extinto'
         self.dia_extincao = -1
-        self.historico_areas: List[float] = [float(area_inicial)]
+        # Sem histórico próprio quando o simulador guarda as áreas no HistoricoSimulacao
+        self.historico_areas: Optional[List[float]] = [float(area_inicial)] if guardar_historico else None
 
     def crescer(self) -> None:
         """Aplica o fator de crescimento diário se o foco estiver ativo."""
         if self.status == 'ativo':
             self.area_atual = round(self.area_atual * self.taxa_alpha, 4)
-            self.historico_areas.append(self.area_atual)
+            if self.historico_areas is not None:
+                self.historico_areas.append(self.area_atual)
 
     def combater(self, area_reduzida: float, dia_atual: int) -> bool:
         """
@@ -0,0 +1,188 @@
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+
+class HistoricoSimulacao:
+    """
+    Histórico compacto da simulação, guardado em arrays.
+
+    As alocações ficam em colunas tipadas (dia, posto, foco, capacidade, tempo de
+    combate, área reduzida), com postos e focos pelo índice em vez de referências
+    aos objetos. As áreas ficam numa matriz dias x focos: a linha 0 tem as áreas
+    iniciais e a linha d as áreas ao fim do dia d (NaN para focos extintos).
+    Os arrays dobram de tamanho quando enchem (crescimento amortizado).
+
+    Dias antigos podem ser descartados (descartar_ate); primeiro_dia indica então
+    o dia da linha 0 de áreas, e só as alocações depois dele continuam guardadas.
+    """
+
+    COLUNAS = (('dia', np.int32), ('posto', np.int32), ('foco', np.int32),
+               ('capacidade_alocada', np.float64), ('tempo_combate', np.float64),
+               ('area_reduzida', np.float64))
+
+    def __init__(self, focos_ids: List[str], postos_ids: List[str], capacidade_inicial: int = 64):
+        self.focos_ids = list(focos_ids)
+        self.postos_ids = list(postos_ids)
+        self.indice_focos = {foco_id: j for j, foco_id in enumerate(self.focos_ids)}
+        self.indice_postos = {posto_id: i for i, posto_id in enumerate(self.postos_ids)}
+
+        self.num_alocacoes = 0
+        self.colunas = {nome: np.empty(capacidade_inicial, dtype=tipo) for nome, tipo in self.COLUNAS}
+        self.num_dias = 0
+        self.areas = np.full((capacidade_inicial, len(self.focos_ids)), np.nan)
+        self._linhas_areas = 0
+        self.primeiro_dia = 0
+
+    def _reservar_alocacoes(self, quantidade: int) -> None:
+        necessario = self.num_alocacoes + quantidade
+        atual = len(self.colunas['dia'])
+        if necessario > atual:
+            nova = max(necessario, 2 * atual)
+            for nome, coluna in self.colunas.items():
+                maior = np.empty(nova, dtype=coluna.dtype)
+                maior[:self.num_alocacoes] = coluna[:self.num_alocacoes]
+                self.colunas[nome] = maior
+
+    def _reservar_areas(self, quantidade: int) -> None:
+        necessario = self._linhas_areas + quantidade
+        if necessario > len(self.areas):
+            maior = np.full((max(necessario, 2 * len(self.areas)), self.areas.shape[1]), np.nan)
+            maior[:self._linhas_areas] = self.areas[:self._linhas_areas]
+            self.areas = maior
+
+    def registrar_dia(self, dia: int, postos: np.ndarray, focos: np.ndarray, capacidades: np.ndarray,
+                      tempos_combate: np.ndarray, areas_reduzidas: np.ndarray) -> None:
+        """Registra as alocações de um dia já em forma de arrays (pode ser vazio)."""
+        quantidade = len(postos)
+        self._reservar_alocacoes(quantidade)
+        inicio, fim = self.num_alocacoes, self.num_alocacoes + quantidade
+        self.colunas['dia'][inicio:fim] = dia
+        self.colunas['posto'][inicio:fim] = postos
+        self.colunas['foco'][inicio:fim] = focos
+        self.colunas['capacidade_alocada'][inicio:fim] = capacidades
+        self.colunas['tempo_combate'][inicio:fim] = tempos_combate
+        self.colunas['area_reduzida'][inicio:fim] = areas_reduzidas
+        self.num_alocacoes = fim
+        self.num_dias = max(self.num_dias, dia)
+
+    def registrar_alocacoes(self, dia: int, alocacoes: List[dict]) -> None:
+        """Registra as alocações de um dia no formato de dicionário do AlocadorRecursos."""
+        self.registrar_dia(
+            dia,
+            np.fromiter((self.indice_postos[a['posto'].id] for a in alocacoes), np.int32, len(alocacoes)),
+            np.fromiter((self.indice_focos[a['foco'].id] for a in alocacoes), np.int32, len(alocacoes)),
+            np.fromiter((a['capacidade_alocada'] for a in alocacoes), np.float64, len(alocacoes)),
+            np.fromiter((a['tempo_combate'] for a in alocacoes), np.float64, len(alocacoes)),
+            np.fromiter((a['area_reduzida'] for a in alocacoes), np.float64, len(alocacoes)),
+        )
+
+    def repetir_dia(self, dia: int, dias: int) -> None:
+        """Replica as alocações de `dia` nos `dias` dias seguintes."""
+        inicio, fim = self.intervalo_dia(dia)
+        quantidade = fim - inicio
+        self._reservar_alocacoes(quantidade * dias)
+        destino = self.num_alocacoes
+        for nome, coluna in self.colunas.items():
+            coluna[destino:destino + quantidade * dias] = np.tile(coluna[inicio:fim], dias)
+        self.colunas['dia'][destino:destino + quantidade * dias] = \
+            np.repeat(np.arange(dia + 1, dia + dias + 1, dtype=np.int32), quantidade)
+        self.num_alocacoes += quantidade * dias
+        self.num_dias = max(self.num_dias, dia + dias)
+
+    def registrar_areas(self, areas: np.ndarray) -> None:
+        """Acrescenta uma ou mais linhas (dias) à matriz de áreas."""
+        areas = np.atleast_2d(areas)
+        self._reservar_areas(len(areas))
+        self.areas[self._linhas_areas:self._linhas_areas + len(areas)] = areas
+        self._linhas_areas += len(areas)
+
+    def carregar(self, colunas: Dict[str, np.ndarray], num_dias: int, areas: np.ndarray,
+                 primeiro_dia: int = 0) -> None:
+        """Substitui o conteúdo por cópias das colunas e das linhas de áreas (ex.: de um snapshot)."""
+        quantidade = len(colunas['dia'])
+        self.num_alocacoes = 0
+        self._reservar_alocacoes(quantidade)
+        for nome, _ in self.COLUNAS:
+            self.colunas[nome][:quantidade] = colunas[nome]
+        self.num_alocacoes = quantidade
+        self.num_dias = int(num_dias)
+        self.primeiro_dia = int(primeiro_dia)
+        self._linhas_areas = 0
+        self.areas[:] = np.nan
+        self.registrar_areas(areas)
+
+    def descartar_ate(self, dia: int) -> None:
+        """
+        Descarta as alocações até `dia` (inclusive) e as áreas anteriores a ele.
+
+        A linha de áreas de `dia` fica (é o estado de partida do dia seguinte). Os
+        dados restantes vão para arrays novos, então visões tiradas antes
+        (snapshots) continuam válidas.
+        """
+        dia = min(dia, self.primeiro_dia + self._linhas_areas - 1)
+        if dia <= self.primeiro_dia:
+            return
+        _, fim = self.intervalo_dia(dia)
+        restantes = self.num_alocacoes - fim
+        capacidade = max(64, 2 * restantes)
+        for nome, coluna in self.colunas.items():
+            nova = np.empty(capacidade, dtype=coluna.dtype)
+            nova[:restantes] = coluna[fim:self.num_alocacoes]
+            self.colunas[nome] = nova
+        self.num_alocacoes = restantes
+
+        descartadas = dia - self.primeiro_dia
+        linhas = self._linhas_areas - descartadas
+        areas = np.full((max(64, 2 * linhas), self.areas.shape[1]), np.nan)
+        areas[:linhas] = self.areas[descartadas:self._linhas_areas]
+        self.areas = areas
+        self._linhas_areas = linhas
+        self.primeiro_dia = dia
+
+    def _verificar_dia(self, dia: int) -> None:
+        """Rejeita dias descartados pela retenção ou ainda não simulados."""
+        ultimo = self.primeiro_dia + self._linhas_areas - 1
+        if not self.primeiro_dia <= dia <= ultimo:
+            raise ValueError(f"Dia {dia} fora do histórico (dias {self.primeiro_dia} a {ultimo})")
+
+    def intervalo_dia(self, dia: int) -> Tuple[int, int]:
+        """Posições [inicio, fim) das alocações do dia nas colunas."""
+        self._verificar_dia(dia)
+        dias = self.colunas['dia'][:self.num_alocacoes]
+        return (int(np.searchsorted(dias, dia, side='left')),
+                int(np.searchsorted(dias, dia, side='right')))
+
+    def alocacoes_do_dia(self, dia: int) -> Dict[str, np.ndarray]:
+        """Colunas das alocações de um dia (visões, sem cópia)."""
+        inicio, fim = self.intervalo_dia(dia)
+        return {nome: coluna[inicio:fim] for nome, coluna in self.colunas.items()}
+
+    def areas_do_dia(self, dia: int) -> np.ndarray:
+        """Áreas ao fim do dia (dia 0: áreas iniciais)."""
+        self._verificar_dia(dia)
+        return self.areas[dia - self.primeiro_dia]
+
+    def para_numpy(self) -> Dict[str, np.ndarray]:
+        """Exporta as colunas de alocação (cópias do trecho usado)."""
+        return {nome: coluna[:self.num_alocacoes].copy() for nome, coluna in self.colunas.items()}
+
+    def areas_numpy(self) -> np.ndarray:
+        """Exporta a matriz de áreas (linhas do primeiro_dia ao último registrado) x focos."""
+        return self.areas[:self._linhas_areas].copy()
+
+    def visoes(self) -> Tuple[Dict[str, np.ndarray], np.ndarray]:
+        """
+        Colunas e áreas registradas até agora, como visões sem cópia.
+
+        O histórico só acrescenta depois do trecho registrado, então as visões
+        continuam válidas enquanto a simulação segue (é o que torna o snapshot barato).
+        """
+        return ({nome: coluna[:self.num_alocacoes] for nome, coluna in self.colunas.items()},
+                self.areas[:self._linhas_areas])
+
+    def __len__(self) -> int:
+        return self.num_alocacoes
+
+    def __repr__(self) -> str:
+        return f"HistoricoSimulacao(dias={self.num_dias}, alocacoes={self.num_alocacoes})"
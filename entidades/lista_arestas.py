@@ -0,0 +1,26 @@
+import numpy as np
+
+
+class ListaArestas:
+    """Rede de estradas esparsa: arestas `u v distância` entre índices de nós (focos, depois postos)."""
+
+    def __init__(self, num_nos: int, origens: np.ndarray, destinos: np.ndarray,
+                 distancias: np.ndarray):
+        self.num_nos = int(num_nos)
+        self.origens = np.asarray(origens, dtype=np.int64)
+        self.destinos = np.asarray(destinos, dtype=np.int64)
+        self.distancias = np.asarray(distancias, dtype=np.float64)
+
+    def __len__(self) -> int:
+        return len(self.distancias)
+
+    def arestas_nomeadas(self, nomes_nos: list):
+        """Retorna (nome_u, nome_v, distância) das arestas com distância positiva."""
+        positivas = self.distancias > 0
+        nomes = np.array(nomes_nos, dtype=object)
+        return zip(nomes[self.origens[positivas]].tolist(),
+                   nomes[self.destinos[positivas]].tolist(),
+                   self.distancias[positivas].tolist())
+
+    def __repr__(self) -> str:
+        return f"ListaArestas(nos={self.num_nos}, arestas={len(self)})"
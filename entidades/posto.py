@@ -1,6 +1,8 @@
 class Posto:
     """Representa um posto de brigadistas com capacidade de operação."""
-     
+
+    __slots__ = ('id', 'capacidade_total_ph', 'tempo_trabalho_diario', 'capacidade_alocada')
+
     def __init__(self, id_posto: str, capacidade_total_ph: float):
         self.id = id_posto
         self.capacidade_total_ph = float(capacidade_total_ph)
@@ -0,0 +1,87 @@
+from typing import Dict, List, Optional
+import io
+
+import numpy as np
+
+from entidades.historico import HistoricoSimulacao
+
+
+class SnapshotSimulacao:
+    """
+    Estado completo do simulador num fim de dia, em arrays.
+
+    Guarda o dia atual, o estado de cada foco (área, status, dia de extinção) e de
+    cada posto (capacidade total e alocada), os dados fixos necessários para
+    recriá-los (ids, áreas iniciais, fatores, tempo de trabalho) e o histórico até
+    o dia, como visões das colunas do HistoricoSimulacao (sem cópia). A matriz de
+    tempos de deslocamento entra só por referência: ramos restaurados no mesmo
+    processo a reutilizam sem rodar nenhum caminho mínimo.
+    """
+
+    def __init__(self, dia_atual: int, focos_ids: List[str], postos_ids: List[str],
+                 areas_iniciais: np.ndarray, taxas: np.ndarray, areas: np.ndarray,
+                 ativos: np.ndarray, dias_extincao: np.ndarray, capacidades: np.ndarray,
+                 tempo_trabalho: np.ndarray, capacidades_alocadas: np.ndarray,
+                 colunas: Dict[str, np.ndarray], num_dias: int, areas_historico: np.ndarray,
+                 tempos_deslocamento: Optional[np.ndarray] = None, primeiro_dia: int = 0):
+        self.dia_atual = int(dia_atual)
+        self.focos_ids = list(focos_ids)
+        self.postos_ids = list(postos_ids)
+        self.areas_iniciais = areas_iniciais
+        self.taxas = taxas
+        self.areas = areas
+        self.ativos = ativos
+        self.dias_extincao = dias_extincao
+        self.capacidades = capacidades
+        self.tempo_trabalho = tempo_trabalho
+        self.capacidades_alocadas = capacidades_alocadas
+        self.colunas = colunas
+        self.num_dias = int(num_dias)
+        self.areas_historico = areas_historico
+        self.tempos_deslocamento = tempos_deslocamento
+        self.primeiro_dia = int(primeiro_dia)  # dia da primeira linha de areas_historico
+
+    def para_bytes(self, incluir_tempos: bool = False) -> bytes:
+        """
+        Serializa o snapshot num arquivo .npz (binário, sem compressão).
+
+        Args:
+            incluir_tempos: Grava também a matriz posto x foco de tempos de
+                            deslocamento (sem ela, quem restaurar precisa fornecê-la)
+        """
+        arrays = {
+            'dia_atual': np.int64(self.dia_atual), 'num_dias': np.int64(self.num_dias),
+            'primeiro_dia': np.int64(self.primeiro_dia),
+            'focos_ids': np.array(self.focos_ids, dtype=str),
+            'postos_ids': np.array(self.postos_ids, dtype=str),
+            'areas_iniciais': self.areas_iniciais, 'taxas': self.taxas, 'areas': self.areas,
+            'ativos': self.ativos, 'dias_extincao': self.dias_extincao,
+            'capacidades': self.capacidades, 'tempo_trabalho': self.tempo_trabalho,
+            'capacidades_alocadas': self.capacidades_alocadas,
+            'areas_historico': self.areas_historico,
+        }
+        arrays.update({f'coluna_{nome}': coluna for nome, coluna in self.colunas.items()})
+        if incluir_tempos and self.tempos_deslocamento is not None:
+            arrays['tempos_deslocamento'] = self.tempos_deslocamento
+        buffer = io.BytesIO()
+        np.savez(buffer, **arrays)
+        return buffer.getvalue()
+
+    def __repr__(self) -> str:
+        return (f"SnapshotSimulacao(dia={self.dia_atual}, focos_ativos={int(self.ativos.sum())}, "
+                f"alocacoes={len(self.colunas['dia'])})")
+
+
+def ler_snapshot(dados: bytes) -> SnapshotSimulacao:
+    """Reconstrói um snapshot gravado por SnapshotSimulacao.para_bytes."""
+    with np.load(io.BytesIO(dados), allow_pickle=False) as arquivo:
+        return SnapshotSimulacao(
+            int(arquivo['dia_atual']), arquivo['focos_ids'].tolist(), arquivo['postos_ids'].tolist(),
+            arquivo['areas_iniciais'], arquivo['taxas'], arquivo['areas'], arquivo['ativos'],
+            arquivo['dias_extincao'], arquivo['capacidades'], arquivo['tempo_trabalho'],
+            arquivo['capacidades_alocadas'],
+            {nome: arquivo[f'coluna_{nome}'] for nome, _ in HistoricoSimulacao.COLUNAS},
+            int(arquivo['num_dias']), arquivo['areas_historico'],
+            arquivo['tempos_deslocamento'] if 'tempos_deslocamento' in arquivo else None,
+            int(arquivo['primeiro_dia']),
+        )
@@ -0,0 +1,36 @@
+import sys
+from servicos.cache_tempos import CacheTempos
+from servicos.lote import executar_lote, listar_arquivos, salvar_resumo_csv, tabela_resumo
+
+USO = "Uso: python lote.py <diretorio_ou_glob> [--arestas] [--sem-cache] [--processos N]"
+
+
+def main():
+    if len(sys.argv) < 2:
+        print(USO)
+        sys.exit(1)
+
+    arquivos = listar_arquivos(sys.argv[1])
+    if not arquivos:
+        print(f"Nenhum arquivo de entrada encontrado em '{sys.argv[1]}'")
+        sys.exit(1)
+
+    processos = None
+    if '--processos' in sys.argv[2:]:
+        valor = sys.argv[sys.argv.index('--processos') + 1:][:1]
+        if not valor or not valor[0].isdigit() or int(valor[0]) < 1:
+            print("--processos espera um número inteiro positivo")
+            print(USO)
+            sys.exit(1)
+        processos = int(valor[0])
+
+    cache = None if '--sem-cache' in sys.argv[2:] else CacheTempos()
+    linhas = executar_lote(arquivos, arestas='--arestas' in sys.argv[2:],
+                           cache_tempos=cache, processos=processos)
+
+    print(tabela_resumo(linhas))
+    salvar_resumo_csv(linhas)
+
+
+if __name__ == '__main__':
+    main()
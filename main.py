@@ -1,48 +1,139 @@
 import sys
+import time
+INICIO = time.perf_counter()
+
 from servicos.simulador import SimuladorIncendios
 from utils.leitor_entrada import LeitorEntrada
 from utils.relatorio import GeradorRelatorio
-from servicos.visualizacao import visualizar_grafo
+from servicos.grafo import construir_grafo
+from servicos.cache_tempos import CacheTempos
+from servicos.instrumentacao import Instrumentacao
+from utils.linha_comando import LinhaComando
 
 from pathlib import Path
 
+# matplotlib (servicos.visualizacao) só é importado quando o gráfico é gerado
+FIM_IMPORTACOES = time.perf_counter()
+
 '''
 ANTONIO AUGUSTO NUNES DE SOUZA 15440698
 ASHTON APEBIO MERGULHÃO SEGNIBO 15441765
 CESAR MÂNCIO SILVA 15635890 
 MARIA RITA SOUSA BORGES 15656239
 '''
+def gerar_grafico(grafo, nome_base: str, usar_cache: bool) -> None:
+    from servicos.visualizacao import criar_cache_layout, visualizar_grafo
+    visualizar_grafo(grafo, nome_arquivo=nome_base,
+                     cache_layout=criar_cache_layout() if usar_cache else None)
+
+
+def gerar_graficos_diarios(grafo, historico, nome_base: str, usar_cache: bool) -> None:
+    from servicos.visualizacao import criar_cache_layout, visualizar_dias
+    visualizar_dias(grafo, historico, nome_arquivo=nome_base,
+                    cache_layout=criar_cache_layout() if usar_cache else None)
+
+
+USO = ("Uso: python main.py <arquivo_de_entrada> [--arestas] [--sem-cache] "
+       "[--formatos txt,csv,jsonl] [--imprimir] [--sem-grafico | --grafico-depois] "
+       "[--grafico-dias] [--tempos] [--perfil] [--regioes] [--leitura-texto]")
+
+
 def main():
     if len(sys.argv) < 2:
-        print("Uso: python main.py <arquivo_de_entrada>")
+        print(USO)
         sys.exit(1)
+
+    # Relatório (--formatos: lista separada por vírgulas; padrão só o texto), conferido
+    # antes da leitura para não descobrir um formato inválido depois da simulação
+    formatos = LinhaComando(USO, sys.argv[2:]).escolhas('--formatos', GeradorRelatorio.FORMATOS, ['txt'])
+
+    # --tempos: mostra quanto cada etapa levou, a partir do início do processo
+    tempos = {'importações': FIM_IMPORTACOES - INICIO}
+    marco = time.perf_counter()
+
+    def medir(etapa: str) -> None:
+        nonlocal marco
+        agora = time.perf_counter()
+        tempos[etapa] = agora - marco
+        marco = agora
     
-    # Carrega dados
-    dados = LeitorEntrada.ler_arquivo(sys.argv[1])
+    # Carrega dados (--arestas: arquivo no formato de lista de arestas; a matriz é lida
+    # por memory-map direto para NumPy, ou como listas de floats com --leitura-texto)
+    if '--arestas' in sys.argv[2:]:
+        dados = LeitorEntrada.ler_arquivo_arestas(sys.argv[1])
+    elif '--leitura-texto' in sys.argv[2:]:
+        dados = LeitorEntrada.ler_arquivo(sys.argv[1])
+    else:
+        dados = LeitorEntrada.ler_arquivo_mmap(sys.argv[1])
     if not dados:
         sys.exit(1)
+    medir('leitura')
         
     num_focos, num_postos, capacidades, areas_iniciais, fatores, matriz = dados
     
-    nome_base = Path('test_case1').stem
+    nome_base = Path(sys.argv[1]).stem
+
+    # Grafo construído uma vez, usado pela visualização e pela simulação
+    grafo = construir_grafo(num_focos, num_postos, matriz)
+    medir('grafo')
+
+    # --sem-cache: recalcula tempos de deslocamento e layout do gráfico sem consultar outputs/cache
+    cache = None if '--sem-cache' in sys.argv[2:] else CacheTempos()
 
-    # Visualização
-    visualizar_grafo(num_focos, num_postos, matriz)
+    # Visualização (--sem-grafico: não gera; --grafico-depois: só depois do relatório)
+    grafico = 'nao' if '--sem-grafico' in sys.argv[2:] else \
+        'depois' if '--grafico-depois' in sys.argv[2:] else 'antes'
+    if grafico == 'antes':
+        gerar_grafico(grafo, nome_base, cache is not None)
+        medir('gráfico')
     
-    # Simulação
-    simulador = SimuladorIncendios(max_dias=100)
-    simulador.carregar_dados(*dados)
+    # Simulação (--perfil: tempos por fase e contadores por dia, em outputs/perfis;
+    # --regioes: regiões independentes da rede simuladas em paralelo)
+    instrumentacao = Instrumentacao() if '--perfil' in sys.argv[2:] else None
+    simulador = SimuladorIncendios(max_dias=100, cache_tempos=cache, instrumentacao=instrumentacao,
+                                   por_regioes='--regioes' in sys.argv[2:])
+    simulador.carregar_dados(*dados, grafo=grafo)
     resultados = simulador.simular()
+    medir('simulação')
     
-    # Relatório
-    relatorio = GeradorRelatorio.gerar_relatorio(
+    GeradorRelatorio.gerar_relatorio(
         resultados,
         simulador.mapa_focos,
         simulador.mapa_postos,
-        simulador.historico_alocacoes,
+        simulador.historico,
+        nome_arquivo=nome_base,
+        formatos=formatos,
     )
 
-    print("\n"+relatorio)
+    # --imprimir: relatório completo no terminal, escrito seção por seção
+    print()
+    if '--imprimir' in sys.argv[2:]:
+        GeradorRelatorio.escrever_texto(sys.stdout, resultados, simulador.mapa_focos,
+                                        simulador.mapa_postos, simulador.historico)
+        print()
+    else:
+        print(GeradorRelatorio.cabecalho_relatorio(resultados))
+    medir('relatório')
+
+    if grafico == 'depois':
+        gerar_grafico(grafo, nome_base, cache is not None)
+        medir('gráfico')
+
+    # --grafico-dias: uma imagem por dia, com o tamanho de cada foco pela sua área
+    if '--grafico-dias' in sys.argv[2:]:
+        gerar_graficos_diarios(grafo, simulador.historico, nome_base, cache is not None)
+        medir('gráficos diários')
+
+    if instrumentacao:
+        print()
+        print(instrumentacao.resumo())
+        instrumentacao.exportar_json(f"outputs/perfis/perfil_{nome_base}.json")
+
+    if '--tempos' in sys.argv[2:]:
+        print("\nTempos (s):")
+        for etapa, segundos in tempos.items():
+            print(f"  {etapa:<18} {segundos:8.3f}")
+        print(f"  {'total':<18} {time.perf_counter() - INICIO:8.3f}")
 
 
 if __name__ == '__main__':
@@ -0,0 +1,52 @@
+import os
+import statistics
+import subprocess
+import sys
+
+from utils.linha_comando import LinhaComando
+
+USO = "Uso: python medir_inicializacao.py [--repeticoes 5] [--limite 1.0]"
+
+# Módulos que não devem ser carregados só por importar o main.py
+PROIBIDOS = ('matplotlib', 'servicos.visualizacao')
+RAIZ = os.path.dirname(os.path.abspath(__file__))
+
+
+def medir_importacao(repeticoes: int) -> list:
+    """Tempo (s) de `import main` num interpretador novo, medido dentro dele."""
+    codigo = "import time; t = time.perf_counter(); import main; print(time.perf_counter() - t)"
+    return [float(subprocess.run([sys.executable, '-c', codigo], capture_output=True,
+                                 text=True, check=True, cwd=RAIZ).stdout)
+            for _ in range(repeticoes)]
+
+
+def modulos_carregados() -> list:
+    codigo = f"import sys, main; print(','.join(m for m in {PROIBIDOS!r} if m in sys.modules))"
+    saida = subprocess.run([sys.executable, '-c', codigo], capture_output=True,
+                           text=True, check=True, cwd=RAIZ).stdout.strip()
+    return saida.split(',') if saida else []
+
+
+def main():
+    argumentos = LinhaComando(USO)
+    repeticoes = argumentos.inteiro('--repeticoes', 5, minimo=1)
+    limite = argumentos.numero('--limite', 1.0, minimo=0)
+
+    tempos = medir_importacao(repeticoes)
+    mediana = statistics.median(tempos)
+    print(f"import main: mediana {mediana:.3f}s (mín {min(tempos):.3f}s, máx {max(tempos):.3f}s, "
+          f"{repeticoes} execuções, limite {limite:.3f}s)")
+
+    falhas = []
+    if mediana > limite:
+        falhas.append(f"inicialização acima do limite ({mediana:.3f}s > {limite:.3f}s)")
+    carregados = modulos_carregados()
+    if carregados:
+        falhas.append(f"módulos pesados carregados na importação: {', '.join(carregados)}")
+    for falha in falhas:
+        print(f"REGRESSÃO: {falha}")
+    sys.exit(1 if falhas else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,162 @@
+from importlib.util import find_spec
+from typing import Dict, List
+
+import networkx as nx
+import numpy as np
+
+from entidades.foco import Foco
+from entidades.posto import Posto
+from servicos.alocador_recursos import AlocadorRecursos
+
+
+class AlocadorFluxo(AlocadorRecursos):
+    """
+    Alocação do dia inteiro como um único problema de programação linear.
+
+    É um fluxo generalizado posto → foco: a variável x de cada par alcançável é
+    a capacidade (km²/hora) que o posto manda ao foco, que apaga x * tempo de
+    combate (12h menos o deslocamento) da área do foco. Restrições: nenhum
+    posto passa da sua capacidade e nenhum foco recebe mais que a sua área.
+    Objetivo: maximizar a soma de alpha * área reduzida, isto é, a menor área
+    total no dia seguinte (sem o arredondamento). Ao contrário do guloso, um
+    posto distante não se esgota num foco que um posto próximo resolveria.
+
+    O LP é resolvido pelo HiGHS (scipy.optimize.linprog). Partida a quente: ele
+    começa só com os pares usados na véspera e os postos mais próximos de cada
+    foco; entram mais pares enquanto algum tiver custo reduzido favorável pelos
+    duais da rodada (geração de colunas), então o ótimo é o do LP completo.
+    Exige o scipy: sem ele o construtor falha em vez de trocar de estratégia.
+    """
+
+    COLUNAS_INICIAIS = 2  # postos mais próximos de cada foco na primeira rodada
+    TOLERANCIA = 1e-9     # custo reduzido (relativo) a partir do qual um par entra
+    MAX_RODADAS = 100
+    CAPACIDADE_MINIMA = 1e-9  # abaixo disso a capacidade do LP é ruído numérico
+
+    def __init__(self, mapa_focos: Dict[str, Foco], mapa_postos: Dict[str, Posto], grafo: nx.Graph,
+                 **kwargs):
+        if find_spec('scipy') is None:
+            raise ValueError("O alocador por fluxo precisa do scipy (pip install scipy)")
+        super().__init__(mapa_focos, mapa_postos, grafo, **kwargs)
+        self.lista_focos = list(mapa_focos.values())
+        self.lista_postos = list(mapa_postos.values())
+        self.taxas = np.array([f.taxa_alpha for f in self.lista_focos], dtype=np.float64)
+        self.rank_ids = np.empty(len(self.lista_focos), dtype=np.int64)
+        self.rank_ids[np.argsort([f.id for f in self.lista_focos], kind='stable')] = \
+            np.arange(len(self.lista_focos))
+        with self.instrumentacao.fase('busca_candidatos'):
+            self.precomputar_pares()
+
+    def precomputar_pares(self) -> None:
+        """Lista os pares posto → foco com tempo de combate positivo, por foco e do mais próximo ao mais distante."""
+        self.tempo_trabalho = np.array([p.tempo_trabalho_diario for p in self.lista_postos])
+        tempos = np.asarray(self.tempos_deslocamento)
+        postos, focos = np.nonzero(self.tempo_trabalho[:, None] - tempos > 0)
+        ordem = np.lexsort((postos, tempos[postos, focos], focos))
+        self.pares_postos, self.pares_focos = postos[ordem], focos[ordem]
+        self.pares_combate = self.tempo_trabalho[self.pares_postos] - tempos[self.pares_postos, self.pares_focos]
+        inicios = np.searchsorted(self.pares_focos, np.arange(len(self.lista_focos)))
+        self.posicao_no_foco = np.arange(len(ordem)) - inicios[self.pares_focos]
+        self.usados = np.zeros(len(ordem), dtype=bool)  # pares com capacidade na última solução
+
+    def tempos_atualizados(self, focos: np.ndarray) -> None:
+        """Refaz os pares depois de uma mudança na rede (a partida a quente recomeça)."""
+        self.precomputar_pares()
+
+    def alocar_recursos_dia(self) -> List[dict]:
+        """Realiza a alocação de recursos para o dia atual."""
+        for posto in self.lista_postos:
+            posto.reset_alocacao_diaria()
+
+        areas = np.array([f.area_atual if f.status == 'ativo' else 0.0 for f in self.lista_focos])
+        candidatos = np.flatnonzero(areas[self.pares_focos] > 0)
+        if candidatos.size == 0:
+            return []
+        disponivel = np.array([p.capacidade_disponivel() for p in self.lista_postos], dtype=np.float64)
+
+        with self.instrumentacao.fase('solver_lp'):
+            capacidades = self.resolver_lp(candidatos, disponivel, areas)
+        self.instrumentacao.contar('candidatos_avaliados', int(candidatos.size))
+
+        # Ordem dos registros: focos por maior área (empate pelo id), postos do mais próximo
+        escolhidos = candidatos[capacidades > self.CAPACIDADE_MINIMA]
+        capacidades = capacidades[capacidades > self.CAPACIDADE_MINIMA]
+        focos = self.pares_focos[escolhidos]
+        ordem = np.lexsort((escolhidos, self.rank_ids[focos], -areas[focos]))
+
+        alocacoes = []
+        for k in ordem.tolist():
+            par = escolhidos[k]
+            posto = self.lista_postos[self.pares_postos[par]]
+            foco = self.lista_focos[self.pares_focos[par]]
+            if foco.status != 'ativo':
+                continue  # já extinto pelos pares anteriores (arredondamento)
+            tempo_combate = float(self.pares_combate[par])
+            cap_alocar = min(float(capacidades[k]), posto.capacidade_disponivel())
+            if cap_alocar > 0 and posto.alocar_capacidade(cap_alocar):
+                area_reduzida = cap_alocar * tempo_combate
+                foco.combater(area_reduzida, 0)  # O dia atual será definido depois
+                alocacoes.append({
+                    'posto': posto,
+                    'foco': foco,
+                    'capacidade_alocada': cap_alocar,
+                    'tempo_combate': tempo_combate,
+                    'area_reduzida': area_reduzida
+                })
+        return alocacoes
+
+    def resolver_lp(self, candidatos: np.ndarray, disponivel: np.ndarray,
+                    areas: np.ndarray) -> np.ndarray:
+        """
+        Resolve o LP do dia sobre os pares candidatos, por geração de colunas.
+
+        Args:
+            candidatos: Índices dos pares cujo foco está ativo
+            disponivel: Capacidade disponível de cada posto
+            areas: Área de cada foco (0 para extintos)
+
+        Returns:
+            Capacidade alocada a cada par candidato
+        """
+        from scipy.optimize import linprog
+        from scipy.sparse import csc_matrix
+
+        num_postos = len(self.lista_postos)
+        linhas_restricoes = num_postos + len(self.lista_focos)
+        limites = np.concatenate((disponivel, areas))
+        ganhos = self.taxas[self.pares_focos[candidatos]] * self.pares_combate[candidatos]
+
+        # Partida a quente: pares usados na véspera e os mais próximos de cada foco
+        no_lp = self.usados[candidatos] | (self.posicao_no_foco[candidatos] < self.COLUNAS_INICIAIS)
+        rodadas = 0
+        while True:
+            rodadas += 1
+            colunas = np.flatnonzero(no_lp)
+            pares = candidatos[colunas]
+            n = len(pares)
+            matriz = csc_matrix(
+                (np.concatenate((np.ones(n), self.pares_combate[pares])),
+                 (np.concatenate((self.pares_postos[pares], num_postos + self.pares_focos[pares])),
+                  np.concatenate((np.arange(n), np.arange(n))))),
+                shape=(linhas_restricoes, n))
+            resultado = linprog(-ganhos[colunas], A_ub=matriz, b_ub=limites, bounds=(0, None),
+                                method='highs')
+            if resultado.status != 0:
+                raise ValueError(f"Falha no LP de alocação: {resultado.message}")
+
+            # Custo reduzido de cada par fora do LP, pelos duais (<= 0) das restrições
+            duais = resultado.ineqlin.marginals
+            reduzidos = -ganhos - duais[self.pares_postos[candidatos]] \
+                - self.pares_combate[candidatos] * duais[num_postos + self.pares_focos[candidatos]]
+            entram = ~no_lp & (reduzidos < -self.TOLERANCIA * np.maximum(1.0, ganhos))
+            if not entram.any() or rodadas >= self.MAX_RODADAS:
+                break
+            no_lp |= entram
+
+        capacidades = np.zeros(len(candidatos))
+        capacidades[colunas] = resultado.x
+        self.usados[:] = False
+        self.usados[candidatos[capacidades > self.CAPACIDADE_MINIMA]] = True
+        self.instrumentacao.contar('rodadas_lp', rodadas)
+        self.instrumentacao.contar('colunas_lp', int(len(colunas)))
+        return capacidades
@@ -0,0 +1,93 @@
+from typing import Dict, List
+import heapq
+
+import networkx as nx
+import numpy as np
+
+from entidades.foco import Foco
+from entidades.posto import Posto
+from servicos.alocador_recursos import AlocadorRecursos
+
+
+class AlocadorPrioridade(AlocadorRecursos):
+    """
+    Alocador guloso com as mesmas decisões do AlocadorRecursos, sem re-ordenações diárias.
+
+    Os postos alcançáveis por cada foco são calculados uma única vez, já
+    ordenados por tempo de deslocamento. A cada dia os focos saem de um heap
+    pela maior área e a capacidade restante de cada posto fica num índice
+    (array), então escolher o melhor posto é um argmax sobre a lista do foco.
+    """
+
+    def __init__(self, mapa_focos: Dict[str, Foco], mapa_postos: Dict[str, Posto], grafo: nx.Graph,
+                 **kwargs):
+        super().__init__(mapa_focos, mapa_postos, grafo, **kwargs)
+        self.lista_focos = list(mapa_focos.values())
+        self.lista_postos = list(mapa_postos.values())
+        with self.instrumentacao.fase('busca_candidatos'):
+            self.precomputar_candidatos()
+
+    def precomputar_candidatos(self) -> None:
+        """Monta, por foco, os postos com tempo de combate positivo, do mais próximo ao mais distante."""
+        self.tempo_trabalho = np.array([p.tempo_trabalho_diario for p in self.lista_postos])
+        self.candidatos: List[np.ndarray] = [None] * len(self.lista_focos)
+        self.tempos_combate_candidatos: List[np.ndarray] = [None] * len(self.lista_focos)
+        self.tempos_atualizados(np.arange(len(self.lista_focos)))
+
+    def tempos_atualizados(self, focos: np.ndarray) -> None:
+        """Refaz a lista de candidatos dos focos cujos tempos de deslocamento mudaram."""
+        tempos_combate = self.tempo_trabalho[:, None] - self.tempos_deslocamento[:, focos]
+        for k, j in enumerate(focos.tolist()):
+            postos = np.flatnonzero(tempos_combate[:, k] > 0)
+            # Empate no tempo: ordem dos postos, como no sort estável do alocador guloso
+            postos = postos[np.argsort(self.tempos_deslocamento[postos, j], kind='stable')]
+            self.candidatos[j] = postos
+            self.tempos_combate_candidatos[j] = tempos_combate[postos, k]
+
+    def alocar_recursos_dia(self) -> List[dict]:
+        """Realiza a alocação de recursos para o dia atual."""
+        alocacoes = []
+
+        for posto in self.lista_postos:
+            posto.reset_alocacao_diaria()
+        disponivel = np.array([p.capacidade_disponivel() for p in self.lista_postos], dtype=np.float64)
+
+        # Heap de focos ativos: maior área primeiro, empate pelo id
+        heap = [(-foco.area_atual, foco.id, j) for j, foco in enumerate(self.lista_focos)
+                if foco.status == 'ativo']
+        heapq.heapify(heap)
+        com_capacidade = int(np.count_nonzero(disponivel > 0))
+
+        while heap and com_capacidade:
+            _, _, j = heapq.heappop(heap)
+            foco = self.lista_focos[j]
+            if foco.area_atual <= 0:
+                continue
+
+            # Uma passada por foco tira os postos já esgotados no dia
+            vivos = disponivel[self.candidatos[j]] > 0
+            candidatos = self.candidatos[j][vivos]
+            if candidatos.size == 0:
+                continue
+            tempos_combate = self.tempos_combate_candidatos[j][vivos]
+            capacidades = disponivel[candidatos]
+
+            while True:
+                k = int(np.argmax(capacidades))  # primeiro máximo: o mais próximo
+                if capacidades[k] <= 0:
+                    break
+                capacidades[k] = 0.0  # já tentado para este foco
+
+                candidato = {'posto': self.lista_postos[candidatos[k]],
+                             'tempo_combate': float(tempos_combate[k])}
+                alocacao = self.alocar_recurso_foco(candidato, foco)
+                if alocacao:
+                    posto = alocacao['posto']
+                    disponivel[candidatos[k]] = posto.capacidade_disponivel()
+                    if disponivel[candidatos[k]] <= 0:
+                        com_capacidade -= 1
+                    alocacoes.append(alocacao)
+                    if foco.area_atual <= 0:
+                        break
+
+        return alocacoes
@@ -1,26 +1,208 @@
-from typing import Dict, List, Optional
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+import os
+
 import networkx as nx
+import numpy as np
 # Altere para:
 from entidades.foco import Foco
 from entidades.posto import Posto
+from servicos.cache_tempos import CacheTempos
+from servicos.instrumentacao import Instrumentacao
+
+# Abaixo disso o custo de subir processos é maior que o das buscas
+LIMIAR_PARALELO = 32
+
+_grafo_trabalhador: Optional[nx.Graph] = None
+_focos_trabalhador: List[str] = []
+
+
+def _inicializar_trabalhador(grafo: nx.Graph, focos_ids: List[str]) -> None:
+    """Guarda o grafo uma única vez em cada processo trabalhador."""
+    global _grafo_trabalhador, _focos_trabalhador
+    _grafo_trabalhador = grafo
+    _focos_trabalhador = focos_ids
+
+
+def _tempos_do_posto(grafo: nx.Graph, focos_ids: List[str], posto_id: str,
+                     limite: float) -> np.ndarray:
+    """Dijkstra a partir de um posto, limitado a `limite` horas; devolve a linha posto x focos."""
+    linha = np.full(len(focos_ids), np.inf)
+    if posto_id not in grafo:
+        return linha
+    distancias = nx.single_source_dijkstra_path_length(grafo, posto_id, cutoff=limite,
+                                                       weight='weight')
+    for j, foco_id in enumerate(focos_ids):
+        distancia = distancias.get(foco_id)
+        if distancia is not None:
+            linha[j] = distancia
+    return linha
+
+
+def _tempos_do_posto_trabalhador(tarefa: tuple) -> np.ndarray:
+    posto_id, limite = tarefa
+    return _tempos_do_posto(_grafo_trabalhador, _focos_trabalhador, posto_id, limite)
 
 
 class AlocadorRecursos:
     """Responsável por alocar recursos dos postos para os focos de forma otimizada."""
     
-    def __init__(self, mapa_focos: Dict[str, Foco], mapa_postos: Dict[str, Posto], grafo: nx.Graph):
+    def __init__(self, mapa_focos: Dict[str, Foco], mapa_postos: Dict[str, Posto], grafo: nx.Graph,
+                 processos: Optional[int] = None, cache: Optional[CacheTempos] = None,
+                 tempos_deslocamento: Optional[np.ndarray] = None,
+                 instrumentacao: Optional[Instrumentacao] = None):
+        """
+        Args:
+            mapa_focos: Focos indexados pelo id
+            mapa_postos: Postos indexados pelo id
+            grafo: Grafo de conexões com pesos em horas
+            processos: Processos usados nas buscas de caminho mínimo (padrão: núcleos da máquina)
+            cache: Cache em disco dos tempos de deslocamento (None: sempre recalcula)
+            tempos_deslocamento: Matriz posto x foco já calculada; usada sem cópia e
+                                 sem rodar nenhuma busca de caminho mínimo
+            instrumentacao: Tempos por fase e contadores (padrão: desligada)
+        """
         self.mapa_focos = mapa_focos
         self.mapa_postos = mapa_postos
         self.grafo = grafo
-        self.precomputar_tempos_deslocamento()
+        self.processos = processos or os.cpu_count() or 1
+        self.cache = cache
+        self.instrumentacao = instrumentacao or Instrumentacao(ativa=False)
+        self.indice_postos = {posto_id: i for i, posto_id in enumerate(mapa_postos)}
+        self.indice_focos = {foco_id: j for j, foco_id in enumerate(mapa_focos)}
+        if tempos_deslocamento is not None:
+            if tempos_deslocamento.shape != (len(mapa_postos), len(mapa_focos)):
+                raise ValueError("Matriz de tempos de deslocamento não corresponde a postos x focos")
+            self.tempos_deslocamento = tempos_deslocamento
+        else:
+            with self.instrumentacao.fase('caminhos_minimos'):
+                self.precomputar_tempos_deslocamento()
+        # Matriz recebida de fora ou do cache pode ser compartilhada: copiada antes de ser reparada
+        self._tempos_proprios = False
 
     def precomputar_tempos_deslocamento(self) -> None:
-        """Pré-computa os tempos de deslocamento entre todos os nós."""
-        self.tempos_deslocamento = dict(nx.all_pairs_dijkstra_path_length(self.grafo, weight='weight'))
+        """
+        Pré-computa a matriz posto x foco de tempos de deslocamento.
+
+        Roda um Dijkstra por posto, limitado ao tempo de trabalho diário do posto:
+        focos além desse limite não podem ser combatidos e ficam com tempo infinito.
+        Com muitos postos, as buscas são distribuídas entre processos.
+        """
+        focos_ids = list(self.mapa_focos)
+        tarefas = [(posto.id, posto.tempo_trabalho_diario) for posto in self.mapa_postos.values()]
+
+        chave = None
+        if self.cache:
+            chave = self.cache.chave(self.grafo, focos_ids, [p for p, _ in tarefas],
+                                     [limite for _, limite in tarefas])
+            tempos = self.cache.carregar(chave)
+            if tempos is not None and tempos.shape == (len(tarefas), len(focos_ids)):
+                self.tempos_deslocamento = tempos
+                return
+
+        if self.processos > 1 and len(tarefas) >= LIMIAR_PARALELO:
+            with ProcessPoolExecutor(max_workers=self.processos,
+                                     initializer=_inicializar_trabalhador,
+                                     initargs=(self.grafo, focos_ids)) as executor:
+                linhas = list(executor.map(_tempos_do_posto_trabalhador, tarefas,
+                                           chunksize=max(1, len(tarefas) // (4 * self.processos))))
+        else:
+            linhas = [_tempos_do_posto(self.grafo, focos_ids, posto_id, limite)
+                      for posto_id, limite in tarefas]
+
+        self.tempos_deslocamento = np.full((len(tarefas), len(focos_ids)), np.inf)
+        for i, linha in enumerate(linhas):
+            self.tempos_deslocamento[i] = linha
+
+        if chave:
+            self.cache.salvar(chave, self.tempos_deslocamento)
+
+    def _distancias_a_partir(self, no: str, limite: float) -> Tuple[np.ndarray, np.ndarray]:
+        """Distâncias de `no` a cada posto e a cada foco (inf além de `limite`)."""
+        distancias = nx.single_source_dijkstra_path_length(self.grafo, no, cutoff=limite,
+                                                           weight='weight')
+        postos = np.fromiter((distancias.get(p, np.inf) for p in self.mapa_postos), np.float64,
+                             len(self.mapa_postos))
+        focos = np.fromiter((distancias.get(f, np.inf) for f in self.mapa_focos), np.float64,
+                            len(self.mapa_focos))
+        return postos, focos
+
+    def alterar_aresta(self, u: str, v: str, distancia: Optional[float]) -> np.ndarray:
+        """
+        Muda o peso de uma aresta (insere se não existir; distancia None remove) e repara os tempos.
+
+        Com dois Dijkstras (a partir de u e de v, na rede antes da mudança) dá para
+        saber quais pares posto → foco a aresta pode afetar:
+        - redução/inserção: o novo tempo é min(tempo, d(p,u) + w + d(v,f), d(p,v) + w + d(u,f)),
+          exato para uma aresta e sem nenhuma busca a mais;
+        - aumento/remoção: só mudam os pares cujo caminho mínimo passava pela aresta
+          (tempo == d(p,u) + w_antigo + d(v,f) ou o simétrico); só os postos desses
+          pares rodam o Dijkstra de novo.
+
+        Returns:
+            Índices dos focos com algum tempo alterado
+        """
+        if u not in self.grafo or v not in self.grafo or u == v:
+            raise ValueError(f"Aresta inválida '{u}'-'{v}'")
+        antigo = self.grafo[u][v]['weight'] if self.grafo.has_edge(u, v) else None
+        if distancia is not None and distancia <= 0:
+            raise ValueError("A distância da aresta deve ser positiva (use None para remover)")
+        if antigo == distancia:
+            return np.empty(0, dtype=np.int64)
+
+        limites = np.array([p.tempo_trabalho_diario for p in self.mapa_postos.values()])
+        limite = float(limites.max()) if len(limites) else 0.0
+        du_postos, du_focos = self._distancias_a_partir(u, limite)
+        dv_postos, dv_focos = self._distancias_a_partir(v, limite)
+
+        if distancia is None:
+            self.grafo.remove_edge(u, v)
+        else:
+            self.grafo.add_edge(u, v, weight=float(distancia))
+
+        if not self._tempos_proprios:
+            self.tempos_deslocamento = np.array(self.tempos_deslocamento, dtype=np.float64)
+            self._tempos_proprios = True
+        tempos = self.tempos_deslocamento
+
+        # Só postos que alcançam u ou v e focos alcançados a partir de u ou v podem mudar
+        linhas = np.flatnonzero(np.isfinite(du_postos) | np.isfinite(dv_postos))
+        colunas = np.flatnonzero(np.isfinite(du_focos) | np.isfinite(dv_focos))
+        if linhas.size == 0 or colunas.size == 0:
+            return np.empty(0, dtype=np.int64)
+        bloco = tempos[np.ix_(linhas, colunas)]
+
+        if antigo is not None and (distancia is None or distancia > antigo):
+            pela_aresta = np.minimum(du_postos[linhas, None] + antigo + dv_focos[None, colunas],
+                                     dv_postos[linhas, None] + antigo + du_focos[None, colunas])
+            usavam = np.isfinite(bloco) & np.isclose(bloco, pela_aresta, rtol=1e-12, atol=1e-9)
+            afetados = linhas[usavam.any(axis=1)]
+            focos_ids = list(self.mapa_focos)
+            postos = list(self.mapa_postos.values())
+            for i in afetados.tolist():
+                tempos[i] = _tempos_do_posto(self.grafo, focos_ids, postos[i].id,
+                                             postos[i].tempo_trabalho_diario)
+        else:
+            pela_aresta = np.minimum(du_postos[linhas, None] + distancia + dv_focos[None, colunas],
+                                     dv_postos[linhas, None] + distancia + du_focos[None, colunas])
+            melhores = (pela_aresta < bloco) & (pela_aresta <= limites[linhas, None])
+            tempos[np.ix_(linhas, colunas)] = np.where(melhores, pela_aresta, bloco)
+
+        alterados = colunas[(tempos[np.ix_(linhas, colunas)] != bloco).any(axis=0)]
+        if alterados.size:
+            self.tempos_atualizados(alterados)
+        return alterados
+
+    def tempos_atualizados(self, focos: np.ndarray) -> None:
+        """Chamado depois que os tempos dos focos (índices) mudam; subclasses refazem o que derivam deles."""
 
     def obter_tempo_deslocamento(self, posto_id: str, foco_id: str) -> float:
         """Retorna o tempo de deslocamento entre um posto e um foco."""
-        return self.tempos_deslocamento.get(posto_id, {}).get(foco_id, float('inf'))
+        i = self.indice_postos.get(posto_id)
+        j = self.indice_focos.get(foco_id)
+        if i is None or j is None:
+            return float('inf')
+        return float(self.tempos_deslocamento[i, j])
 
     def alocar_recursos_dia(self) -> List[dict]:
         """Realiza a alocação de recursos para o dia atual."""
@@ -38,7 +220,8 @@ class AlocadorRecursos:
             if foco.area_atual <= 0:
                 continue
             # Encontrar postos candidatos para este foco
-            postos_candidatos = self.encontrar_postos_candidatos(foco)
+            with self.instrumentacao.fase('busca_candidatos'):
+                postos_candidatos = self.encontrar_postos_candidatos(foco)
             
             # Alocar recursos dos postos para este foco
             for candidato in postos_candidatos:
@@ -70,6 +253,7 @@ class AlocadorRecursos:
 
     def alocar_recurso_foco(self, candidato: dict, foco: Foco) -> Optional[dict]:
         """Tenta alocar recurso de um posto para um foco."""
+        self.instrumentacao.contar('candidatos_avaliados')
         posto = candidato['posto']
         tempo_combate = candidato['tempo_combate']
         cap_necessaria = foco.area_atual / tempo_combate
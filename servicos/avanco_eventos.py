@@ -0,0 +1,144 @@
+from typing import Dict, List
+import numpy as np
+
+from entidades.foco import Foco
+from entidades.historico import HistoricoSimulacao
+from entidades.posto import Posto
+from servicos.alocador_recursos import AlocadorRecursos
+
+
+class AvancoEventos:
+    """
+    Avança a simulação por trechos estáveis sem executar dia a dia.
+
+    Um trecho é estável quando as alocações de hoje são idênticas às de ontem:
+    cada posto entrega toda a sua capacidade ao mesmo foco, nenhum foco é extinto
+    e a ordem de prioridade dos focos não muda. Enquanto isso vale, cada foco
+    segue a forma fechada de a' = alpha * (a - D), onde D é a área combatida por dia:
+    a_k = a* + alpha^k * (a_0 - a*), com ponto fixo a* = D * alpha / (alpha - 1)
+    (focos sem combate têm D = 0 e só crescem a * alpha^k). O salto vai direto até o próximo evento: extinção ou
+    mudança de alocação, saturação (área deixa de ser representável) ou o limite de dias.
+
+    A forma fechada não aplica o arredondamento diário de 4 casas do Foco, então
+    as áreas depois de um salto podem diferir do modo dia a dia nessa ordem de grandeza.
+    """
+
+    TAMANHO_BLOCO = 256  # dias avaliados por vez na busca do próximo evento
+    ASSINATURA = ('posto', 'foco', 'capacidade_alocada', 'tempo_combate')  # colunas comparadas entre dias
+
+    def __init__(self, mapa_focos: Dict[str, Foco], mapa_postos: Dict[str, Posto],
+                 alocador: AlocadorRecursos):
+        self.focos = list(mapa_focos.values())
+        self.ids = np.array([f.id for f in self.focos])
+        self.taxas = np.array([f.taxa_alpha for f in self.focos], dtype=np.float64)
+        tempo_trabalho = np.array([p.tempo_trabalho_diario for p in mapa_postos.values()])
+        self.tempo_trabalho = tempo_trabalho
+        # Focos que nenhum posto alcança: nunca recebem recursos, só crescem
+        self.alcancaveis = np.zeros(len(self.focos), dtype=bool)
+        self.atualizar_tempos(alocador.tempos_deslocamento, np.arange(len(self.focos)))
+        # Abaixo disso um foco sem recursos poderia não recebê-los só por ser pequeno demais
+        self.area_minima = 0.001 * (tempo_trabalho.max() if len(tempo_trabalho) else 0.0)
+        self.saltos: List[Dict] = []  # saltos com algum dia ainda no histórico (ver descartar_ate)
+
+    def atualizar_tempos(self, tempos_deslocamento: np.ndarray, focos: np.ndarray) -> None:
+        """Recalcula quais dos focos indicados algum posto alcança (após mudança na rede)."""
+        if len(self.tempo_trabalho):
+            tempos_combate = self.tempo_trabalho[:, None] - tempos_deslocamento[:, focos]
+            self.alcancaveis[focos] = (tempos_combate > 0).any(axis=0)
+
+    def descartar_ate(self, dia: int) -> None:
+        """Esquece os saltos que terminam antes do dia, junto com o descarte do histórico."""
+        self.saltos = [salto for salto in self.saltos if salto['dia_inicio'] + salto['dias'] > dia]
+
+    def expandir_salto(self, salto: Dict, inicio: int = 1, fim: int = None) -> np.ndarray:
+        """
+        Reconstrói as áreas diárias de um salto pela forma fechada.
+
+        Returns:
+            Array (dias x focos do salto) com as áreas ao fim dos dias inicio..fim do salto
+        """
+        fim = salto['dias'] if fim is None else fim
+        k = np.arange(inicio, fim + 1, dtype=np.float64)[:, None]
+        taxas, a0, reducao = salto['taxas'], salto['areas_iniciais'], salto['reducoes']
+        with np.errstate(over='ignore', invalid='ignore', divide='ignore'):
+            # Forma com ponto fixo: evita subtrair dois termos enormes e quase iguais
+            ponto_fixo = np.where(reducao > 0, reducao * taxas / (taxas - 1.0), 0.0)
+            crescimento = np.power(taxas, k) * (a0 - ponto_fixo) + ponto_fixo
+            return np.where(taxas != 1.0, crescimento, a0 - reducao * k)
+
+    def tentar_avancar(self, historico: HistoricoSimulacao, dia_atual: int, max_dias: int) -> int:
+        """
+        Verifica se o dia atual abre um trecho estável e, se sim, salta até o próximo evento.
+
+        Returns:
+            Quantidade de dias avançados (0 se não houve salto)
+        """
+        if dia_atual < 2 or dia_atual >= max_dias:
+            return 0
+        hoje = historico.alocacoes_do_dia(dia_atual)
+        ontem = historico.alocacoes_do_dia(dia_atual - 1)
+        if len(hoje['dia']) == 0 or len(hoje['dia']) != len(ontem['dia']) or \
+                not all(np.array_equal(hoje[c], ontem[c]) for c in self.ASSINATURA):
+            return 0
+        # Alocação limitada pelo posto: o foco continua ativo depois do combate
+        if any(self.focos[j].status != 'ativo' for j in hoje['foco'].tolist()):
+            return 0
+
+        ativos = np.flatnonzero([f.status == 'ativo' for f in self.focos])
+        areas = np.array([self.focos[j].area_atual for j in ativos], dtype=np.float64)
+        reducoes_focos = np.zeros(len(self.focos))
+        # Área combatida duas vezes por dia: na alocação e no combate do simulador
+        np.add.at(reducoes_focos, hoje['foco'], 2 * hoje['area_reduzida'])
+        reducoes = reducoes_focos[ativos]
+        combatidos = reducoes > 0
+        sem_combate = self.alcancaveis[ativos] & ~combatidos
+        # Hoje esses focos ficaram sem recursos por falta de postos livres, não por serem pequenos
+        if not (areas[sem_combate] / self.taxas[ativos][sem_combate] > self.area_minima).all():
+            return 0
+
+        # Ordem de prioridade (maior área, depois id) usada hoje pelos focos que disputam postos;
+        # o salto só vale enquanto ela se mantiver
+        disputam = np.flatnonzero(self.alcancaveis[ativos])
+        areas_hoje = historico.areas_do_dia(dia_atual - 1)[ativos[disputam]]
+        ordem = disputam[np.lexsort((self.ids[ativos][disputam], -areas_hoje))]
+        ids_crescentes = self.ids[ativos][ordem][:-1] < self.ids[ativos][ordem][1:]
+
+        # As alocações dos dias saltados já ficam no histórico (repetir_dia)
+        salto = {'dia_inicio': dia_atual + 1, 'dias': 0,
+                 'focos': self.ids[ativos].tolist(), 'taxas': self.taxas[ativos],
+                 'areas_iniciais': areas, 'reducoes': reducoes}
+
+        limite = max_dias - dia_atual
+        dias = 0
+        inicio = 0
+        while dias == inicio and inicio < limite:
+            fim = min(inicio + self.TAMANHO_BLOCO, limite) - 1
+            if inicio == 0:
+                bloco = np.vstack((areas[None, :], self.expandir_salto(salto, 1, fim)))
+            else:
+                bloco = self.expandir_salto(salto, inicio, fim)
+            estaveis = np.isfinite(bloco).all(axis=1)
+            estaveis &= (bloco[:, combatidos] > reducoes[combatidos] + 0.001).all(axis=1)
+            estaveis &= (bloco[:, sem_combate] > self.area_minima).all(axis=1)
+            if len(ordem) > 1:
+                atual, proximo = bloco[:, ordem[:-1]], bloco[:, ordem[1:]]
+                estaveis &= ((atual > proximo) | ((atual == proximo) & ids_crescentes)).all(axis=1)
+            falhas = np.flatnonzero(~estaveis)
+            dias = inicio + int(falhas[0] if falhas.size else len(bloco))
+            inicio = fim + 1
+
+        dias = min(dias, limite)
+        if dias < 2:
+            return 0
+
+        salto['dias'] = dias
+        diarias = np.round(self.expandir_salto(salto), 4)
+        for i, j in enumerate(ativos):
+            self.focos[j].area_atual = float(diarias[-1, i])
+        areas_salto = np.full((dias, len(self.focos)), np.nan)
+        areas_salto[:, ativos] = diarias
+        historico.registrar_areas(areas_salto)
+        # Os dias saltados repetem as alocações de hoje
+        historico.repetir_dia(dia_atual, dias)
+        self.saltos.append(salto)
+        return dias
@@ -0,0 +1,268 @@
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+import json
+import os
+import platform
+import subprocess
+import tempfile
+import time
+import tracemalloc
+
+import networkx as nx
+import numpy as np
+
+from servicos.instrumentacao import Instrumentacao
+from servicos.simulador import SimuladorIncendios
+from utils.gerador_instancias import GeradorInstancias
+from utils.leitor_entrada import LeitorEntrada
+from utils.relatorio import GeradorRelatorio
+
+ETAPAS = ('leitura', 'construir_grafo', 'tempos_deslocamento', 'alocacao_dia', 'simulacao', 'relatorio')
+TAMANHOS_PADRAO = (10, 100, 1000, 10000)
+TAMANHOS_ESTRATEGIAS = (100, 1000)
+FORMATOS = ('auto', 'matriz', 'arestas')
+LIMITE_MATRIZ = 2000  # acima disso o formato 'auto' grava lista de arestas (a matriz teria N² valores)
+
+
+class MedidorEtapas:
+    """Mede o tempo e, se pedido, o pico de memória alocada (tracemalloc) de cada etapa."""
+
+    def __init__(self, memoria: bool = False):
+        self.memoria = memoria
+        self.tempos: Dict[str, float] = {}
+        self.picos_mb: Dict[str, float] = {}
+
+    @contextmanager
+    def etapa(self, nome: str):
+        if self.memoria:
+            tracemalloc.reset_peak()
+            base = tracemalloc.get_traced_memory()[0]
+        inicio = time.perf_counter()
+        yield
+        self.tempos[nome] = time.perf_counter() - inicio
+        if self.memoria:
+            self.picos_mb[nome] = (tracemalloc.get_traced_memory()[1] - base) / 1024 ** 2
+
+
+def executar_etapas(caminho: str, formato: str, medidor: MedidorEtapas, max_dias: int = 30,
+                    motor: str = 'objetos', estrategia: str = 'guloso',
+                    processos: Optional[int] = 1) -> Dict:
+    """
+    Roda o fluxo completo sobre um arquivo, medindo cada etapa separadamente.
+
+    Etapas: leitura do arquivo, _construir_grafo, cálculo dos tempos de
+    deslocamento (precomputar_tempos_deslocamento), um alocar_recursos_dia sobre
+    o estado inicial, simular() completo (com os tempos já calculados) e a
+    escrita do relatório em texto.
+
+    Returns:
+        Resultados da simulação
+    """
+    leitor = LeitorEntrada.ler_arquivo_arestas if formato == 'arestas' else LeitorEntrada.ler_arquivo_mmap
+    with medidor.etapa('leitura'):
+        dados = leitor(caminho)
+    if not dados:
+        raise ValueError(f"Não foi possível ler a instância {caminho}")
+    num_focos, num_postos, capacidades, areas_iniciais, fatores, rede = dados
+
+    base = SimuladorIncendios(max_dias=max_dias)
+    base._criar_entidades(num_focos, num_postos, capacidades, areas_iniciais, fatores)
+    with medidor.etapa('construir_grafo'):
+        base._construir_grafo(rede)
+
+    classe_alocador = SimuladorIncendios.ALOCADORES[estrategia]
+    with medidor.etapa('tempos_deslocamento'):
+        tempos = SimuladorIncendios.ALOCADORES['guloso'](
+            base.mapa_focos, base.mapa_postos, base.grafo, processos=processos).tempos_deslocamento
+
+    alocador = classe_alocador(base.mapa_focos, base.mapa_postos, base.grafo,
+                               tempos_deslocamento=tempos)
+    with medidor.etapa('alocacao_dia'):
+        alocador.alocar_recursos_dia()
+
+    simulador = SimuladorIncendios(max_dias=max_dias, motor=motor, estrategia_alocacao=estrategia)
+    simulador.carregar_dados(*dados, grafo=base.grafo, tempos_deslocamento=tempos)
+    with medidor.etapa('simulacao'):
+        resultados = simulador.simular()
+
+    with tempfile.TemporaryFile('w', encoding='utf-8') as f, medidor.etapa('relatorio'):
+        GeradorRelatorio.escrever_texto(f, resultados, simulador.mapa_focos,
+                                        simulador.mapa_postos, simulador.historico)
+    return resultados
+
+
+def medir_tamanho(num_nos: int, fracao_postos: float = 0.2, grau_medio: float = 4.0,
+                  formato: str = 'auto', repeticoes: int = 1, memoria: bool = True,
+                  semente: int = 0, **config) -> Dict:
+    """
+    Gera uma instância de `num_nos` nós e mede todas as etapas sobre ela.
+
+    O tempo de cada etapa é o menor entre as repetições; a memória é medida numa
+    execução à parte, com tracemalloc ligado, para não pesar nos tempos.
+
+    Args:
+        config: max_dias, motor, estrategia e processos de executar_etapas
+
+    Returns:
+        Linha do resultado: nos, focos, postos, arestas, formato, dias_totais,
+        sucesso, tempos (s) e memoria_mb (pico alocado) por etapa
+    """
+    num_postos = min(num_nos - 1, max(1, int(round(num_nos * fracao_postos))))
+    num_focos = num_nos - num_postos
+    if formato == 'auto':
+        formato = 'matriz' if num_nos <= LIMITE_MATRIZ else 'arestas'
+    dados = GeradorInstancias.gerar(num_focos, num_postos, grau_medio=grau_medio, semente=semente)
+
+    with tempfile.TemporaryDirectory() as diretorio:
+        caminho = os.path.join(diretorio, f'instancia_{num_nos}.txt')
+        GeradorInstancias.salvar(dados, caminho, formato)
+
+        tempos: Dict[str, float] = {}
+        for _ in range(max(1, repeticoes)):
+            medidor = MedidorEtapas()
+            resultados = executar_etapas(caminho, formato, medidor, **config)
+            for etapa, segundos in medidor.tempos.items():
+                tempos[etapa] = min(segundos, tempos.get(etapa, float('inf')))
+
+        picos: Dict[str, float] = {}
+        if memoria:
+            medidor = MedidorEtapas(memoria=True)
+            tracemalloc.start()
+            try:
+                executar_etapas(caminho, formato, medidor, **config)
+            finally:
+                tracemalloc.stop()
+            picos = medidor.picos_mb
+
+    return {
+        'nos': num_nos, 'focos': num_focos, 'postos': num_postos, 'arestas': len(dados[5]),
+        'formato': formato, 'dias_totais': resultados['dias_totais'],
+        'sucesso': resultados['sucesso'], 'tempos': tempos, 'memoria_mb': picos,
+    }
+
+
+def executar_benchmark(tamanhos: Sequence[int] = TAMANHOS_PADRAO, **opcoes) -> List[Dict]:
+    """Mede cada tamanho em sequência (ver medir_tamanho), mostrando o progresso."""
+    linhas = []
+    for num_nos in tamanhos:
+        print(f"Medindo {num_nos} nós...", flush=True)
+        linhas.append(medir_tamanho(num_nos, **opcoes))
+    return linhas
+
+
+def comparar_estrategias(tamanhos: Sequence[int] = TAMANHOS_ESTRATEGIAS,
+                         estrategias: Sequence[str] = ('guloso', 'fluxo'), max_dias: int = 30,
+                         fracao_postos: float = 0.2, grau_medio: float = 4.0,
+                         semente: int = 0, processos: Optional[int] = 1) -> List[Dict]:
+    """
+    Roda as mesmas instâncias com cada estratégia de alocação e compara tempo e resultado.
+
+    Os tempos de deslocamento de cada instância são calculados uma vez e
+    reaproveitados por todas as estratégias; o tempo de alocação é a fase
+    'alocacao' da instrumentação somada em todos os dias.
+
+    Returns:
+        Uma linha por tamanho e estratégia: nos, estrategia, sucesso, dias_totais,
+        focos_ativos e area_ativa (no último dia), tempo_alocacao e
+        tempo_simulacao (s)
+    """
+    linhas = []
+    for num_nos in tamanhos:
+        print(f"Comparando estratégias com {num_nos} nós...", flush=True)
+        num_postos = min(num_nos - 1, max(1, int(round(num_nos * fracao_postos))))
+        dados = GeradorInstancias.gerar(num_nos - num_postos, num_postos, grau_medio=grau_medio,
+                                        semente=semente)
+        base = SimuladorIncendios(processos=processos)
+        base.carregar_dados(*dados)
+        for estrategia in estrategias:
+            instrumentacao = Instrumentacao()
+            simulador = SimuladorIncendios(max_dias=max_dias, estrategia_alocacao=estrategia,
+                                           instrumentacao=instrumentacao)
+            simulador.carregar_dados(*dados, grafo=base.grafo,
+                                     tempos_deslocamento=base.alocador.tempos_deslocamento)
+            inicio = time.perf_counter()
+            resultados = simulador.simular()
+            linhas.append({
+                'nos': num_nos, 'estrategia': estrategia, 'sucesso': resultados['sucesso'],
+                'dias_totais': resultados['dias_totais'],
+                'focos_ativos': len(resultados['focos_ativos']),
+                'area_ativa': float(sum(resultados['focos_ativos'].values())),
+                'tempo_alocacao': instrumentacao.tempos_totais.get('alocacao', 0.0),
+                'tempo_simulacao': time.perf_counter() - inicio,
+            })
+    return linhas
+
+
+def tabela_estrategias(linhas: List[Dict]) -> str:
+    """Monta a tabela da comparação entre estratégias de alocação."""
+    cabecalho = (f"{'NÓS':>7} {'ESTRATÉGIA':>11} {'SUCESSO':>8} {'DIAS':>5} {'ATIVOS':>7} "
+                 f"{'ÁREA ATIVA':>14} {'ALOCAÇÃO (s)':>13} {'TOTAL (s)':>10}")
+    tabela = [cabecalho, '-' * len(cabecalho)]
+    for linha in linhas:
+        tabela.append(f"{linha['nos']:>7} {linha['estrategia']:>11} {str(linha['sucesso']):>8} "
+                      f"{linha['dias_totais']:>5} {linha['focos_ativos']:>7} {linha['area_ativa']:>14.2f} "
+                      f"{linha['tempo_alocacao']:>13.4f} {linha['tempo_simulacao']:>10.4f}")
+    return "\n".join(tabela)
+
+
+def tabela_benchmark(linhas: List[Dict]) -> str:
+    """Monta a tabela de tempos (s) e picos de memória (MB) por etapa."""
+    cabecalho = f"{'NÓS':>7} {'ARESTAS':>8} {'DIAS':>5}" + "".join(f" {e[:12]:>12}" for e in ETAPAS)
+    tabela = ["Tempo (s)", cabecalho, '-' * len(cabecalho)]
+    for linha in linhas:
+        tabela.append(f"{linha['nos']:>7} {linha['arestas']:>8} {linha['dias_totais']:>5}"
+                      + "".join(f" {linha['tempos'].get(e, float('nan')):>12.4f}" for e in ETAPAS))
+    if any(linha['memoria_mb'] for linha in linhas):
+        tabela += ["", "Pico de memória alocada (MB)", cabecalho, '-' * len(cabecalho)]
+        for linha in linhas:
+            tabela.append(f"{linha['nos']:>7} {linha['arestas']:>8} {linha['dias_totais']:>5}"
+                          + "".join(f" {linha['memoria_mb'].get(e, float('nan')):>12.2f}" for e in ETAPAS))
+    return "\n".join(tabela)
+
+
+def metadados(config: Dict) -> Dict:
+    """Ambiente da medição, para comparar só execuções comparáveis."""
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                                text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {'data': time.strftime('%Y-%m-%d %H:%M:%S'), 'commit': commit,
+            'python': platform.python_version(), 'numpy': np.__version__,
+            'networkx': nx.__version__, 'plataforma': platform.platform(),
+            'processadores': os.cpu_count(), 'config': config}
+
+
+def salvar_benchmark(linhas: List[Dict], config: Dict,
+                     nome_saida: Optional[str] = None) -> Optional[str]:
+    """Grava resultados e metadados em JSON (padrão: outputs/benchmarks/benchmark_<data>.json)."""
+    if nome_saida is None:
+        nome_saida = f"outputs/benchmarks/benchmark_{time.strftime('%Y%m%d-%H%M%S')}.json"
+    try:
+        Path(nome_saida).parent.mkdir(parents=True, exist_ok=True)
+        with open(nome_saida, 'w', encoding='utf-8') as f:
+            json.dump({'meta': metadados(config), 'resultados': linhas}, f, ensure_ascii=False, indent=2)
+        print(f'Resultados salvos em {nome_saida}')
+        return nome_saida
+    except Exception as e:
+        print(f'Erro ao salvar os resultados: {str(e)}')
+        return None
+
+
+def comparar(linhas: List[Dict], nome_referencia: str) -> str:
+    """Compara os tempos com um JSON salvo antes: razão atual / referência por etapa (< 1 é melhora)."""
+    with open(nome_referencia, encoding='utf-8') as f:
+        referencia = {linha['nos']: linha for linha in json.load(f)['resultados']}
+    cabecalho = f"{'NÓS':>7}" + "".join(f" {e[:12]:>12}" for e in ETAPAS)
+    tabela = [f"Tempo atual / referência ({nome_referencia})", cabecalho, '-' * len(cabecalho)]
+    for linha in linhas:
+        anterior = referencia.get(linha['nos'])
+        if anterior is None:
+            continue
+        razoes = []
+        for etapa in ETAPAS:
+            atual, antes = linha['tempos'].get(etapa), anterior['tempos'].get(etapa)
+            razoes.append(f" {atual / antes:>11.2f}x" if atual is not None and antes else f" {'-':>12}")
+        tabela.append(f"{linha['nos']:>7}" + "".join(razoes))
+    return "\n".join(tabela)
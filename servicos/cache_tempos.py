@@ -0,0 +1,78 @@
+from pathlib import Path
+from typing import List, Optional
+import os
+import tempfile
+
+import networkx as nx
+import numpy as np
+
+from servicos.grafo import hash_grafo
+
+
+class CacheTempos:
+    """
+    Cache em disco das matrizes posto x foco de tempos de deslocamento.
+
+    A chave é o hash do conteúdo da rede (arestas e pesos) e da disposição de
+    postos e focos, então mudar capacidades, áreas ou fatores de crescimento
+    reaproveita os tempos já calculados. Cada matriz fica num arquivo .npy
+    aberto com memory-map; quando o diretório passa do limite de tamanho, os
+    arquivos usados há mais tempo são removidos (LRU pela data de modificação).
+    """
+
+    def __init__(self, diretorio: str = 'outputs/cache', limite_bytes: int = 1024 ** 3):
+        """
+        Args:
+            diretorio: Pasta onde as matrizes são guardadas
+            limite_bytes: Tamanho máximo da pasta (padrão: 1 GiB)
+        """
+        self.diretorio = Path(diretorio)
+        self.limite_bytes = limite_bytes
+
+    def chave(self, grafo: nx.Graph, focos_ids: List[str], postos_ids: List[str],
+              limites: List[float]) -> str:
+        """Calcula o hash da rede e da disposição de focos e postos."""
+        h = hash_grafo(grafo)
+        h.update('\n'.join(focos_ids).encode())
+        h.update('\n'.join(postos_ids).encode())
+        h.update(np.asarray(limites, dtype=np.float64).tobytes())
+        return h.hexdigest()
+
+    def _caminho(self, chave: str) -> Path:
+        return self.diretorio / f"{chave}.npy"
+
+    def carregar(self, chave: str) -> Optional[np.ndarray]:
+        """Retorna a matriz da chave (somente leitura, via memory-map) ou None."""
+        caminho = self._caminho(chave)
+        try:
+            tempos = np.load(caminho, mmap_mode='r')
+            os.utime(caminho)  # marca como usado recentemente
+            return tempos
+        except (FileNotFoundError, ValueError, OSError):
+            return None
+
+    def salvar(self, chave: str, tempos: np.ndarray) -> None:
+        """Grava a matriz de forma atômica e aplica o limite de tamanho."""
+        try:
+            self.diretorio.mkdir(parents=True, exist_ok=True)
+            with tempfile.NamedTemporaryFile(dir=self.diretorio, suffix='.tmp', delete=False) as f:
+                np.save(f, np.ascontiguousarray(tempos))
+            os.replace(f.name, self._caminho(chave))
+        except OSError as e:
+            print(f"Erro ao salvar tempos no cache: {str(e)}")
+            return
+        self.aplicar_limite()
+
+    def aplicar_limite(self) -> None:
+        """Remove as matrizes menos usadas até o diretório caber no limite."""
+        arquivos = sorted(self.diretorio.glob('*.npy'), key=lambda p: p.stat().st_mtime)
+        total = sum(p.stat().st_size for p in arquivos)
+        for arquivo in arquivos:
+            if total <= self.limite_bytes:
+                break
+            tamanho = arquivo.stat().st_size
+            try:
+                arquivo.unlink()
+            except OSError:
+                continue  # ainda aberto por outro processo
+            total -= tamanho
@@ -0,0 +1,87 @@
+from typing import List
+import hashlib
+
+import networkx as nx
+import numpy as np
+
+from entidades.lista_arestas import ListaArestas
+
+
+def nomes_nos(num_focos: int, num_postos: int) -> List[str]:
+    """Nomes dos nós na ordem da matriz: focos (f0, f1, ...) e depois postos (b0, b1, ...)."""
+    return [f'f{i}' for i in range(num_focos)] + [f'b{i}' for i in range(num_postos)]
+
+
+def arestas_da_matriz(matriz_distancias) -> tuple:
+    """
+    Extrai as arestas da matriz numa única passada vetorizada.
+
+    Cada par de nós aparece uma só vez (i <= j). Se a matriz não for simétrica,
+    vale o valor de baixo da diagonal, como quando a matriz inteira era percorrida
+    e a segunda inserção sobrescrevia a primeira.
+
+    Returns:
+        (origens, destinos, distancias) como arrays
+    """
+    matriz = np.asarray(matriz_distancias, dtype=np.float64)
+    num_nos = matriz.shape[0]
+    linhas, colunas = np.nonzero(matriz > 0)
+    pesos = matriz[linhas, colunas]
+
+    # Entradas de baixo da diagonal primeiro: np.unique fica com a primeira ocorrência
+    abaixo = linhas > colunas
+    ordem = np.concatenate((np.flatnonzero(abaixo), np.flatnonzero(~abaixo)))
+    menores = np.minimum(linhas, colunas)[ordem]
+    maiores = np.maximum(linhas, colunas)[ordem]
+    _, primeiros = np.unique(menores * num_nos + maiores, return_index=True)
+
+    return menores[primeiros], maiores[primeiros], pesos[ordem][primeiros]
+
+
+def construir_grafo(num_focos: int, num_postos: int, rede) -> nx.Graph:
+    """
+    Constrói o grafo de conexões uma única vez, para a simulação e a visualização.
+
+    Args:
+        num_focos: Número de focos de incêndio
+        num_postos: Número de postos de brigadistas
+        rede: Matriz de distâncias entre todos os nós, ou ListaArestas
+
+    Returns:
+        Grafo com todos os nós (atributo 'tipo': 'foco' ou 'posto') e as
+        arestas de distância positiva (atributo 'weight')
+    """
+    nomes = nomes_nos(num_focos, num_postos)
+    grafo = nx.Graph()
+    grafo.add_nodes_from(nomes[:num_focos], tipo='foco')
+    grafo.add_nodes_from(nomes[num_focos:], tipo='posto')
+
+    if isinstance(rede, ListaArestas):
+        grafo.add_weighted_edges_from(rede.arestas_nomeadas(nomes))
+    else:
+        origens, destinos, distancias = arestas_da_matriz(rede)
+        nomes_array = np.array(nomes, dtype=object)
+        grafo.add_weighted_edges_from(zip(nomes_array[origens].tolist(),
+                                          nomes_array[destinos].tolist(),
+                                          distancias.tolist()))
+    return grafo
+
+
+def hash_grafo(grafo: nx.Graph) -> 'hashlib._Hash':
+    """
+    Hash do conteúdo da rede: nomes dos nós e arestas com peso, em forma canônica.
+
+    Retorna o objeto sha256 ainda aberto, para quem usa acrescentar o resto da chave.
+    """
+    indice = {no: i for i, no in enumerate(sorted(grafo.nodes, key=str))}
+    arestas = np.array([(indice[u], indice[v], w) for u, v, w in grafo.edges(data='weight')],
+                       dtype=np.float64).reshape(-1, 3)
+    menores = np.minimum(arestas[:, 0], arestas[:, 1])
+    maiores = np.maximum(arestas[:, 0], arestas[:, 1])
+    ordem = np.lexsort((maiores, menores))
+    canonico = np.column_stack((menores, maiores, arestas[:, 2]))[ordem]
+
+    h = hashlib.sha256()
+    h.update('\n'.join(sorted(map(str, indice))).encode())
+    h.update(np.ascontiguousarray(canonico).tobytes())
+    return h
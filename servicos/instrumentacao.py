@@ -0,0 +1,157 @@
+from collections import defaultdict
+from contextlib import nullcontext
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence
+import json
+import time
+
+import numpy as np
+
+_SEM_MEDICAO = nullcontext()
+
+
+class _Fase:
+    """Cronômetro de uma fase: soma o tempo no dia corrente e no total ao sair do bloco."""
+
+    __slots__ = ('instrumentacao', 'nome', 'inicio')
+
+    def __init__(self, instrumentacao: 'Instrumentacao', nome: str):
+        self.instrumentacao = instrumentacao
+        self.nome = nome
+
+    def __enter__(self):
+        self.inicio = time.perf_counter()
+        return self
+
+    def __exit__(self, *excecao):
+        self.instrumentacao.adicionar_tempo(self.nome, time.perf_counter() - self.inicio)
+        return False
+
+
+class Instrumentacao:
+    """
+    Tempos por fase e contadores da simulação, por dia e acumulados.
+
+    Fases: caminhos_minimos e busca_candidatos (preparação do alocador, fora dos
+    dias), alocacao (inclui busca_candidatos no alocador guloso e solver_lp no
+    alocador por fluxo), combate, crescimento, registro (histórico),
+    reparo_tempos (alterações de rede), avanco_eventos (medida entre dois dias,
+    conta no último dia fechado) e regioes (simulação por regiões inteira).
+    Contadores: focos_ativos (no início do dia), candidatos_avaliados, alocacoes,
+    arestas_alteradas e dias_saltados; a utilização de cada posto (capacidade
+    alocada / total) é guardada por dia.
+
+    Desligada (ativa=False), fase() devolve um contexto vazio e contar() volta
+    na hora, então o simulador pode chamá-las sempre; cada simulador sem
+    instrumentação cria a sua desligada, para nada (ganchos inclusive) ser
+    compartilhado entre simulações. Ganchos recebem
+    (evento, dados): 'fase' com {'dia', 'fase', 'segundos'} e 'dia' com o
+    registro do dia que acabou de ser fechado.
+    """
+
+    EVENTOS = ('fase', 'dia')
+
+    def __init__(self, ativa: bool = True):
+        self.ativa = ativa
+        self.tempos_totais: Dict[str, float] = defaultdict(float)
+        self.contadores_totais: Dict[str, int] = defaultdict(int)
+        self.preparacao: Dict[str, float] = defaultdict(float)  # fases medidas antes do primeiro dia
+        self.dias: List[Dict] = []
+        self.postos_ids: List[str] = []
+        self.ganchos: Dict[str, List[Callable[[str, Dict], None]]] = {e: [] for e in self.EVENTOS}
+        self._dia: Optional[Dict] = None
+
+    def registrar_gancho(self, evento: str, funcao: Callable[[str, Dict], None]) -> None:
+        """Chama `funcao(evento, dados)` a cada fim de fase ('fase') ou de dia ('dia')."""
+        if evento not in self.ganchos:
+            raise ValueError(f"Evento inválido '{evento}' - opções: {', '.join(self.EVENTOS)}")
+        self.ganchos[evento].append(funcao)
+
+    def fase(self, nome: str):
+        """Contexto que mede o bloco como a fase `nome`."""
+        if not self.ativa:
+            return _SEM_MEDICAO
+        return _Fase(self, nome)
+
+    def _registro_atual(self) -> Optional[Dict]:
+        """Dia aberto; entre dois dias, o último fechado (ex.: avanço por eventos)."""
+        if self._dia is not None:
+            return self._dia
+        return self.dias[-1] if self.dias else None
+
+    def adicionar_tempo(self, nome: str, segundos: float) -> None:
+        self.tempos_totais[nome] += segundos
+        registro = self._registro_atual()
+        if registro is None:
+            self.preparacao[nome] += segundos
+        else:
+            tempos = registro['tempos']
+            tempos[nome] = tempos.get(nome, 0.0) + segundos
+        for gancho in self.ganchos['fase']:
+            gancho('fase', {'dia': registro['dia'] if registro else None,
+                            'fase': nome, 'segundos': segundos})
+
+    def contar(self, nome: str, quantidade: int = 1) -> None:
+        if not self.ativa:
+            return
+        self.contadores_totais[nome] += quantidade
+        registro = self._registro_atual()
+        if registro is not None:
+            contadores = registro['contadores']
+            contadores[nome] = contadores.get(nome, 0) + quantidade
+
+    def iniciar_dia(self, dia: int) -> None:
+        if self.ativa:
+            self._dia = {'dia': dia, 'tempos': {}, 'contadores': {}, 'utilizacao_postos': []}
+
+    def finalizar_dia(self, utilizacao_postos: Optional[np.ndarray] = None) -> None:
+        """Fecha o dia corrente, guardando a utilização de cada posto (fração da capacidade)."""
+        if self._dia is None:
+            return
+        if utilizacao_postos is not None:
+            self._dia['utilizacao_postos'] = np.round(utilizacao_postos, 6).tolist()
+        registro, self._dia = self._dia, None
+        self.dias.append(registro)
+        for gancho in self.ganchos['dia']:
+            gancho('dia', registro)
+
+    def utilizacao_media(self) -> List[float]:
+        """Utilização média de cada posto nos dias registrados."""
+        utilizacoes = [d['utilizacao_postos'] for d in self.dias if d['utilizacao_postos']]
+        if not utilizacoes:
+            return []
+        return np.round(np.mean(utilizacoes, axis=0), 6).tolist()
+
+    def para_dict(self) -> Dict:
+        return {
+            'tempos_totais': dict(self.tempos_totais),
+            'contadores_totais': dict(self.contadores_totais),
+            'preparacao': dict(self.preparacao),
+            'postos': self.postos_ids,
+            'utilizacao_media_postos': self.utilizacao_media(),
+            'dias': self.dias,
+        }
+
+    def exportar_json(self, nome_arquivo: str) -> Optional[str]:
+        """Grava as métricas em JSON; retorna o caminho, ou None se não conseguiu gravar."""
+        try:
+            Path(nome_arquivo).parent.mkdir(parents=True, exist_ok=True)
+            with open(nome_arquivo, 'w', encoding='utf-8') as f:
+                json.dump(self.para_dict(), f, ensure_ascii=False, indent=2)
+            print(f'Perfil salvo em {nome_arquivo}')
+            return nome_arquivo
+        except Exception as e:
+            print(f'Erro ao salvar o perfil: {str(e)}')
+            return None
+
+    def resumo(self, fases: Optional[Sequence[str]] = None) -> str:
+        """Tabela com o tempo total de cada fase e os contadores acumulados."""
+        fases = fases or sorted(self.tempos_totais, key=self.tempos_totais.get, reverse=True)
+        linhas = ["Perfil da simulação (s):"]
+        linhas += [f"  {fase:<22} {self.tempos_totais[fase]:10.4f}"
+                   for fase in fases if fase in self.tempos_totais]
+        linhas += [f"  {nome:<22} {valor:10d}" for nome, valor in self.contadores_totais.items()]
+        utilizacao = self.utilizacao_media()
+        if utilizacao:
+            linhas.append(f"  {'utilização média':<22} {np.mean(utilizacao):10.2%}")
+        return "\n".join(linhas)
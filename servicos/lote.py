@@ -0,0 +1,128 @@
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stderr, redirect_stdout
+from pathlib import Path
+from typing import Dict, List, Optional
+import csv
+import glob
+import io
+import os
+import time
+
+from servicos.cache_tempos import CacheTempos
+from servicos.simulador import SimuladorIncendios
+from utils.leitor_entrada import LeitorEntrada
+from utils.relatorio import GeradorRelatorio
+
+
+def listar_arquivos(entrada: str) -> List[Path]:
+    """Expande um diretório (todos os .txt dele) ou um padrão glob em arquivos de entrada."""
+    caminho = Path(entrada)
+    if caminho.is_dir():
+        return sorted(caminho.glob('*.txt'))
+    return sorted(Path(p) for p in glob.glob(entrada) if Path(p).is_file())
+
+
+def processar_arquivo(caminho: str, max_dias: int = 100, arestas: bool = False,
+                      cache_tempos: Optional[CacheTempos] = None) -> Dict:
+    """
+    Roda leitura, simulação e relatório de um arquivo, no processo atual.
+
+    O relatório é salvo com o nome do próprio arquivo de entrada.
+
+    Returns:
+        Linha do resumo: arquivo, sucesso, dias_totais, limite_atingido,
+        focos_ativos, tempo_s e erro (None se tudo correu bem)
+    """
+    inicio = time.perf_counter()
+    nome_base = Path(caminho).stem
+    linha = {'arquivo': nome_base, 'sucesso': False, 'dias_totais': None,
+             'limite_atingido': False, 'focos_ativos': None, 'tempo_s': 0.0, 'erro': None}
+    try:
+        # Silencia as mensagens de cada arquivo; erros de leitura vão para o resumo
+        erros = io.StringIO()
+        with redirect_stdout(io.StringIO()), redirect_stderr(erros):
+            leitor = LeitorEntrada.ler_arquivo_arestas if arestas else LeitorEntrada.ler_arquivo_mmap
+            dados = leitor(str(caminho))
+            if not dados:
+                raise ValueError(erros.getvalue().strip() or "arquivo de entrada inválido")
+
+            simulador = SimuladorIncendios(max_dias=max_dias, cache_tempos=cache_tempos,
+                                           processos=1)
+            simulador.carregar_dados(*dados)
+            resultados = simulador.simular()
+
+            GeradorRelatorio.gerar_relatorio(
+                resultados,
+                simulador.mapa_focos,
+                simulador.mapa_postos,
+                simulador.historico,
+                nome_arquivo=nome_base,
+            )
+        linha.update(sucesso=resultados['sucesso'], dias_totais=resultados['dias_totais'],
+                     limite_atingido=resultados['limite_atingido'],
+                     focos_ativos=len(resultados['focos_ativos']))
+    except Exception as e:
+        linha['erro'] = str(e)
+    linha['tempo_s'] = time.perf_counter() - inicio
+    return linha
+
+
+def _processar_tarefa(tarefa: tuple) -> Dict:
+    return processar_arquivo(*tarefa)
+
+
+def executar_lote(arquivos: List[Path], max_dias: int = 100, arestas: bool = False,
+                  cache_tempos: Optional[CacheTempos] = None,
+                  processos: Optional[int] = None) -> List[Dict]:
+    """
+    Processa vários arquivos de entrada num pool de processos.
+
+    Cada processo roda um arquivo inteiro com os caminhos mínimos em série,
+    para não disputar núcleos com o próprio pool.
+
+    Returns:
+        Uma linha de resumo por arquivo, na ordem de `arquivos`
+    """
+    tarefas = [(str(a), max_dias, arestas, cache_tempos) for a in arquivos]
+    processos = min(processos or os.cpu_count() or 1, max(1, len(tarefas)))
+    if processos == 1:
+        return [_processar_tarefa(t) for t in tarefas]
+    with ProcessPoolExecutor(max_workers=processos) as executor:
+        return list(executor.map(_processar_tarefa, tarefas))
+
+
+def tabela_resumo(linhas: List[Dict]) -> str:
+    """Monta a tabela de resumo do lote em texto."""
+    cabecalho = f"{'ARQUIVO':<30} {'STATUS':<10} {'DIAS':>6} {'ATIVOS':>7} {'TEMPO (s)':>10}"
+    tabela = [cabecalho, '-' * len(cabecalho)]
+    for linha in linhas:
+        if linha['erro']:
+            status = 'ERRO'
+        elif linha['sucesso']:
+            status = 'EXTINTO'
+        elif linha['limite_atingido']:
+            status = 'LIMITE'
+        else:
+            status = 'FALHA'
+        dias = linha['dias_totais'] if linha['dias_totais'] is not None else '-'
+        ativos = linha['focos_ativos'] if linha['focos_ativos'] is not None else '-'
+        tabela.append(f"{linha['arquivo']:<30} {status:<10} {dias:>6} {ativos:>7} "
+                      f"{linha['tempo_s']:>10.3f}")
+        if linha['erro']:
+            tabela.append(f"    {linha['erro']}")
+    sucessos = sum(1 for linha in linhas if linha['sucesso'])
+    tabela.append(f"\n{sucessos}/{len(linhas)} cenários com todos os focos extintos.")
+    return "\n".join(tabela)
+
+
+def salvar_resumo_csv(linhas: List[Dict], nome_saida: str = 'outputs/relatorios/resumo_lote.csv') -> None:
+    """Grava o resumo do lote em CSV."""
+    campos = ['arquivo', 'sucesso', 'dias_totais', 'limite_atingido', 'focos_ativos', 'tempo_s', 'erro']
+    try:
+        with open(nome_saida, 'w', encoding='utf-8', newline='') as f:
+            escritor = csv.DictWriter(f, fieldnames=campos)
+            escritor.writeheader()
+            escritor.writerows(linhas)
+        print(f'Resumo do lote salvo em {nome_saida}')
+    except Exception as e:
+        print(f'Erro ao salvar o resumo: {str(e)}')
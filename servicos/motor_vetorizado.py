@@ -0,0 +1,188 @@
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from entidades.foco import Foco
+from entidades.historico import HistoricoSimulacao
+from entidades.posto import Posto
+from servicos.alocador_recursos import AlocadorRecursos
+from servicos.instrumentacao import Instrumentacao
+
+
+def arredondar(valores: np.ndarray, casas: int = 4) -> np.ndarray:
+    """
+    Arredonda um array com o mesmo resultado do round() do Python.
+
+    np.round multiplica por 10**casas antes de arredondar e pode errar o lado
+    em valores muito próximos de x.5; esses poucos casos são refeitos com round().
+    Valores grandes o bastante para não terem casas decimais representáveis
+    voltam inalterados, como no round().
+    """
+    escala = 10.0 ** casas
+    escalado = valores * escala
+    resultado = np.rint(escalado) / escala
+    grandes = np.abs(valores) >= 2.0 ** 39
+    resultado[grandes] = valores[grandes]
+    tolerancia = 1e-6 + np.abs(escalado) * 1e-15
+    duvidosos = (np.abs(np.abs(escalado - np.floor(escalado)) - 0.5) < tolerancia) & ~grandes
+    if duvidosos.any():
+        for i in np.flatnonzero(duvidosos):
+            resultado[i] = round(float(valores[i]), casas)
+    return resultado
+
+
+class MotorVetorizado:
+    """
+    Motor de simulação baseado em arrays NumPy.
+
+    Mantém áreas, taxas, status e capacidades em arrays e aplica combate,
+    crescimento e extinção de um dia inteiro em operações vetorizadas. Produz
+    os mesmos resultados do motor de objetos (Foco/Posto).
+    """
+
+    def __init__(self, mapa_focos: Dict[str, Foco], mapa_postos: Dict[str, Posto],
+                 alocador: AlocadorRecursos, instrumentacao: Optional[Instrumentacao] = None):
+        self.instrumentacao = instrumentacao or Instrumentacao(ativa=False)
+        self.focos = list(mapa_focos.values())
+        self.postos = list(mapa_postos.values())
+
+        self.areas = np.array([f.area_atual for f in self.focos], dtype=np.float64)
+        self.taxas = np.array([f.taxa_alpha for f in self.focos], dtype=np.float64)
+        self.ativos = np.array([f.status == 'ativo' for f in self.focos], dtype=bool)
+        self.dias_extincao = np.array([f.dia_extincao for f in self.focos], dtype=np.int64)
+        self.capacidades = np.array([p.capacidade_total_ph for p in self.postos], dtype=np.float64)
+        self.capacidades_alocadas = np.zeros(len(self.postos), dtype=np.float64)
+        self.tempo_trabalho = np.array([p.tempo_trabalho_diario for p in self.postos],
+                                       dtype=np.float64)
+
+        # Desempate da ordem dos focos pelo id (ordem de string, como no motor de objetos)
+        self.rank_ids = np.empty(len(self.focos), dtype=np.int64)
+        self.rank_ids[np.argsort([f.id for f in self.focos], kind='stable')] = np.arange(len(self.focos))
+
+        # Matriz posto x foco de tempos de deslocamento e de combate
+        self.tempos_desloc = alocador.tempos_deslocamento
+        self.tempos_combate = self.tempo_trabalho[:, None] - self.tempos_desloc
+
+    def atualizar_tempos(self, tempos_deslocamento: np.ndarray, focos: np.ndarray) -> None:
+        """Passa a usar a matriz de tempos reparada, refazendo os tempos de combate dos focos alterados."""
+        self.tempos_desloc = tempos_deslocamento
+        self.tempos_combate[:, focos] = self.tempo_trabalho[:, None] - tempos_deslocamento[:, focos]
+
+    def existe_ativo(self) -> bool:
+        return bool(self.ativos.any())
+
+    def _alocar_dia(self) -> List[tuple]:
+        """
+        Replica a alocação gulosa do AlocadorRecursos sobre os arrays.
+
+        Retorna tuplas (posto, foco, capacidade, tempo_combate, area_reduzida).
+        """
+        self.capacidades_alocadas[:] = 0.0
+        alocacoes = []
+        avaliados = 0
+
+        indices_ativos = np.flatnonzero(self.ativos)
+        ordem = indices_ativos[np.lexsort((self.rank_ids[indices_ativos],
+                                           -self.areas[indices_ativos]))]
+
+        for f in ordem:
+            area = float(self.areas[f])
+            if area <= 0:
+                continue
+
+            disponivel = np.maximum(0.0, self.capacidades - self.capacidades_alocadas)
+            tempos_combate = self.tempos_combate[:, f]
+            candidatos = np.flatnonzero((tempos_combate > 0) & (disponivel > 0))
+            if candidatos.size == 0:
+                continue
+            candidatos = candidatos[np.lexsort((self.tempos_desloc[candidatos, f],
+                                                -disponivel[candidatos]))]
+
+            for p in candidatos:
+                avaliados += 1
+                tempo_combate = float(tempos_combate[p])
+                disp_p = max(0, float(self.capacidades[p] - self.capacidades_alocadas[p]))
+                cap_alocar = min(area / tempo_combate, disp_p)
+                if cap_alocar > 0.001 and cap_alocar <= disp_p:
+                    self.capacidades_alocadas[p] += cap_alocar
+                    area_reduzida = cap_alocar * tempo_combate
+                    alocacoes.append((int(p), int(f), cap_alocar, tempo_combate, area_reduzida))
+                    if self.ativos[f]:
+                        area = max(0, round(area - area_reduzida, 4))
+                        if area <= 0.001:
+                            area = 0
+                            self.ativos[f] = False
+                            self.dias_extincao[f] = 0
+                    self.areas[f] = area
+                    if area <= 0:
+                        break
+
+        self.instrumentacao.contar('candidatos_avaliados', avaliados)
+        return alocacoes
+
+    def _combater(self, alocacoes: List[tuple], dia_atual: int) -> None:
+        """Aplica o combate do dia em rodadas: a k-ésima alocação de cada foco por vez."""
+        rodadas: List[List[tuple]] = []
+        contagem: Dict[int, int] = {}
+        for _, f, _, _, area_reduzida in alocacoes:
+            k = contagem.get(f, 0)
+            contagem[f] = k + 1
+            if k == len(rodadas):
+                rodadas.append([])
+            rodadas[k].append((f, area_reduzida))
+
+        for rodada in rodadas:
+            idx = np.fromiter((f for f, _ in rodada), dtype=np.int64, count=len(rodada))
+            reducao = np.fromiter((r for _, r in rodada), dtype=np.float64, count=len(rodada))
+            mascara = self.ativos[idx]
+            idx, reducao = idx[mascara], reducao[mascara]
+            if idx.size == 0:
+                continue
+            novas = np.maximum(0.0, arredondar(self.areas[idx] - reducao))
+            extintos = novas <= 0.001
+            novas[extintos] = 0.0
+            self.areas[idx] = novas
+            self.ativos[idx[extintos]] = False
+            self.dias_extincao[idx[extintos]] = dia_atual
+
+    def _crescer(self) -> None:
+        """Aplica o crescimento diário a todos os focos ativos."""
+        ativos = self.ativos
+        self.areas[ativos] = arredondar(self.areas[ativos] * self.taxas[ativos])
+
+    def executar_dia(self, dia_atual: int, historico: HistoricoSimulacao,
+                     parar_sem_alocacao: bool = True) -> bool:
+        """
+        Executa um dia sobre os arrays e registra alocações e áreas no histórico.
+
+        Retorna True se a simulação pode continuar, False se não foi possível alocar
+        recursos (com parar_sem_alocacao=False o dia segue sem combate).
+        """
+        instrumentacao = self.instrumentacao
+        with instrumentacao.fase('alocacao'):
+            alocacoes = self._alocar_dia()
+        with instrumentacao.fase('registro'):
+            colunas = np.array(alocacoes, dtype=np.float64).reshape(len(alocacoes), 5).T
+            historico.registrar_dia(dia_atual, *colunas)
+
+        if not alocacoes and parar_sem_alocacao and self.existe_ativo():
+            historico.registrar_areas(np.where(self.ativos, self.areas, np.nan))
+            return False
+
+        with instrumentacao.fase('combate'):
+            self._combater(alocacoes, dia_atual)
+        with instrumentacao.fase('crescimento'):
+            self._crescer()
+        with instrumentacao.fase('registro'):
+            historico.registrar_areas(np.where(self.ativos, self.areas, np.nan))
+        return True
+
+    def sincronizar(self) -> None:
+        """Copia o estado dos arrays de volta para os objetos Foco e Posto."""
+        for i, foco in enumerate(self.focos):
+            ativo = bool(self.ativos[i])
+            foco.status = 'ativo' if ativo else 'extinto'
+            foco.area_atual = float(self.areas[i])
+            foco.dia_extincao = int(self.dias_extincao[i])
+        for j, posto in enumerate(self.postos):
+            posto.capacidade_alocada = float(self.capacidades_alocadas[j])
@@ -0,0 +1,191 @@
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Tuple
+import heapq
+
+import networkx as nx
+import numpy as np
+
+from entidades.historico import HistoricoSimulacao
+from servicos.motor_vetorizado import MotorVetorizado
+
+# Abaixo disso as regiões são simuladas no próprio processo
+LIMIAR_PARALELO = 2
+
+
+def dividir_regioes(tempos_deslocamento: np.ndarray,
+                    tempo_trabalho: np.ndarray) -> List[Tuple[np.ndarray, np.ndarray]]:
+    """
+    Separa focos e postos em regiões independentes.
+
+    Uma região é uma componente conexa do grafo posto — foco das ligações com
+    tempo de combate positivo, as únicas em que pode haver alocação. Cada uma
+    fica dentro de uma componente da rede de estradas (postos de uma componente
+    têm tempo infinito até focos de outra) e pode ser mais fina que ela, quando
+    partes da mesma componente ficam além do dia de trabalho.
+
+    Returns:
+        (índices dos focos, índices dos postos) de cada região com focos
+    """
+    num_postos, num_focos = tempos_deslocamento.shape
+    postos, focos = np.nonzero(tempo_trabalho[:, None] - tempos_deslocamento > 0)
+    ligacoes = nx.Graph()
+    ligacoes.add_nodes_from(range(num_focos + num_postos))
+    ligacoes.add_edges_from(zip(focos.tolist(), (postos + num_focos).tolist()))
+
+    regioes = []
+    for componente in nx.connected_components(ligacoes):
+        nos = np.sort(np.fromiter(componente, dtype=np.int64, count=len(componente)))
+        focos_regiao = nos[nos < num_focos]
+        if focos_regiao.size:
+            regioes.append((focos_regiao, nos[nos >= num_focos] - num_focos))
+    return regioes
+
+
+def agrupar_regioes(regioes: List[Tuple[np.ndarray, np.ndarray]],
+                    grupos: int) -> List[Tuple[np.ndarray, np.ndarray]]:
+    """
+    Junta as regiões em até `grupos` lotes de custo parecido (focos x postos por dia).
+
+    Um lote de regiões independentes continua independente do resto, então cada
+    lote é simulado como uma só sub-simulação; isso evita uma tarefa por região
+    quando há milhares de regiões pequenas.
+    """
+    lotes: List[Tuple[float, int, List[int]]] = [(0.0, k, []) for k in range(min(grupos, len(regioes)))]
+    custos = [len(f) * max(1, len(p)) for f, p in regioes]
+    for r in sorted(range(len(regioes)), key=lambda r: -custos[r]):
+        custo, k, membros = heapq.heappop(lotes)
+        membros.append(r)
+        heapq.heappush(lotes, (custo + custos[r], k, membros))
+    agrupadas = []
+    for _, _, membros in sorted(lotes, key=lambda lote: lote[1]):
+        if membros:
+            agrupadas.append((np.sort(np.concatenate([regioes[r][0] for r in membros])),
+                              np.sort(np.concatenate([regioes[r][1] for r in membros]))))
+    return agrupadas
+
+
+def _simular_regiao(tarefa: tuple) -> Dict:
+    """Roda a sub-simulação de uma região (em processo trabalhador) sem parar em dias sem alocação."""
+    from servicos.simulador import SimuladorIncendios
+
+    focos_ids, postos_ids, capacidades, areas, fatores, tempos, configuracao = tarefa
+    simulador = SimuladorIncendios(**configuracao)
+    simulador.parar_sem_alocacao = False
+    simulador.carregar_dados(len(focos_ids), len(postos_ids), capacidades, areas, fatores, None,
+                             tempos_deslocamento=tempos, focos_ids=focos_ids, postos_ids=postos_ids)
+    simulador.simular()
+    return {'colunas': simulador.historico.para_numpy(), 'areas': simulador.historico.areas_numpy(),
+            'dia_final': simulador.dia_atual,
+            'dias_extincao': np.array([f.dia_extincao for f in simulador.mapa_focos.values()])}
+
+
+def simular_por_regioes(simulador) -> None:
+    """
+    Simula cada região em paralelo e junta o resultado no próprio simulador.
+
+    As regiões não disputam postos, então a alocação de cada uma é a mesma da
+    simulação inteira. Só o encerramento é global: a simulação para no primeiro
+    dia em que nenhuma região aloca nada com focos ainda ativos (ou quando todos
+    se extinguem), o que é decidido aqui, cortando os históricos das regiões.
+    Ao final, focos, postos, histórico e dia atual ficam como na simulação
+    serial, e gerar_resultados e os relatórios funcionam normalmente.
+    """
+    focos = list(simulador.mapa_focos.values())
+    postos = list(simulador.mapa_postos.values())
+    tempos = np.asarray(simulador.alocador.tempos_deslocamento)
+    tempo_trabalho = np.array([p.tempo_trabalho_diario for p in postos])
+
+    regioes = dividir_regioes(tempos, tempo_trabalho)
+    processos = simulador.processos or 1
+    if processos > 1:
+        regioes = agrupar_regioes(regioes, 4 * processos)
+    configuracao = {'max_dias': simulador.max_dias, 'motor': simulador.motor,
+                    'estrategia_alocacao': simulador.estrategia_alocacao,
+                    'avanco_eventos': simulador.avanco_eventos, 'processos': 1}
+    tarefas = [([focos[j].id for j in f], [postos[i].id for i in p],
+                [postos[i].capacidade_total_ph for i in p], [focos[j].area_atual for j in f],
+                [focos[j].taxa_alpha for j in f], np.ascontiguousarray(tempos[np.ix_(p, f)]),
+                configuracao)
+               for f, p in regioes]
+
+    with simulador.instrumentacao.fase('regioes'):
+        if processos > 1 and len(tarefas) >= LIMIAR_PARALELO:
+            with ProcessPoolExecutor(max_workers=min(processos, len(tarefas))) as executor:
+                resultados = list(executor.map(_simular_regiao, tarefas))
+        else:
+            resultados = [_simular_regiao(tarefa) for tarefa in tarefas]
+
+    juntar_regioes(simulador, regioes, resultados)
+
+
+def juntar_regioes(simulador, regioes: List[Tuple[np.ndarray, np.ndarray]],
+                   resultados: List[Dict]) -> None:
+    """Decide o último dia da simulação inteira e monta estado e histórico a partir das regiões."""
+    focos = list(simulador.mapa_focos.values())
+    postos = list(simulador.mapa_postos.values())
+    max_dias = simulador.max_dias
+
+    # Alocações e focos ativos (no início de cada dia) somados entre as regiões
+    alocacoes = np.zeros(max_dias + 2, dtype=np.int64)
+    ativos = np.zeros(max_dias + 2, dtype=np.int64)
+    for resultado in resultados:
+        alocacoes += np.bincount(resultado['colunas']['dia'], minlength=max_dias + 2)[:max_dias + 2]
+        vivos = (~np.isnan(resultado['areas'])).sum(axis=1)
+        ativos[1:len(vivos) + 1] += vivos[:max_dias + 1]
+
+    ultimo, falha = 0, False
+    for dia in range(1, max_dias + 1):
+        if ativos[dia] == 0:
+            break
+        ultimo = dia
+        if alocacoes[dia] == 0:
+            falha = True
+            break
+
+    areas = np.full((ultimo + 1, len(focos)), np.nan)
+    colunas = {nome: [] for nome, _ in HistoricoSimulacao.COLUNAS}
+    for (indices_focos, indices_postos), resultado in zip(regioes, resultados):
+        linhas = min(ultimo + 1, len(resultado['areas']))
+        areas[:linhas, indices_focos] = resultado['areas'][:linhas]
+        dentro = resultado['colunas']['dia'] <= ultimo
+        for nome, _ in HistoricoSimulacao.COLUNAS:
+            coluna = resultado['colunas'][nome][dentro]
+            if nome == 'posto':
+                coluna = indices_postos[coluna]
+            elif nome == 'foco':
+                coluna = indices_focos[coluna]
+            colunas[nome].append(coluna)
+        for k, j in enumerate(indices_focos.tolist()):
+            focos[j].dia_extincao = int(resultado['dias_extincao'][k])
+    if falha:
+        areas[ultimo] = areas[ultimo - 1]  # no dia sem alocação não há combate nem crescimento
+    colunas = {nome: np.concatenate(partes) if partes else np.empty(0, dtype=tipo)
+               for (nome, tipo), partes in zip(HistoricoSimulacao.COLUNAS, colunas.values())}
+
+    # Ordem da simulação inteira: dia, depois focos por maior área no início do dia e id
+    ordem_ids = np.empty(len(focos), dtype=np.int64)
+    ordem_ids[np.argsort([f.id for f in focos], kind='stable')] = np.arange(len(focos))
+    area_inicio = areas[colunas['dia'] - 1, colunas['foco']]
+    ordem = np.lexsort((np.arange(len(colunas['dia'])), ordem_ids[colunas['foco']],
+                        -area_inicio, colunas['dia']))
+    colunas = {nome: coluna[ordem] for nome, coluna in colunas.items()}
+
+    for j, foco in enumerate(focos):
+        if np.isnan(areas[ultimo, j]):
+            foco.status, foco.area_atual = 'extinto', 0
+        else:
+            foco.status, foco.area_atual, foco.dia_extincao = 'ativo', float(areas[ultimo, j]), -1
+    do_ultimo_dia = colunas['dia'] == ultimo
+    alocado = np.bincount(colunas['posto'][do_ultimo_dia], weights=colunas['capacidade_alocada'][do_ultimo_dia],
+                          minlength=len(postos))
+    for i, posto in enumerate(postos):
+        posto.capacidade_alocada = float(alocado[i])
+
+    simulador.historico = HistoricoSimulacao(list(simulador.mapa_focos), list(simulador.mapa_postos),
+                                             capacidade_inicial=max(64, len(colunas['dia'])))
+    simulador.historico.carregar(colunas, ultimo, areas)
+    simulador.dia_atual = ultimo
+    if simulador.motor_vetorizado:
+        simulador.motor_vetorizado = MotorVetorizado(simulador.mapa_focos, simulador.mapa_postos,
+                                                     simulador.alocador, simulador.instrumentacao)
+        simulador.motor_vetorizado.capacidades_alocadas[:] = alocado
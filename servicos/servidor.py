@@ -0,0 +1,307 @@
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+import asyncio
+import json
+import time
+
+import networkx as nx
+import numpy as np
+
+from servicos.cache_tempos import CacheTempos
+from servicos.grafo import construir_grafo
+from servicos.simulador import SimuladorIncendios
+from utils.leitor_entrada import LeitorEntrada
+
+LIMITE_CORPO = 64 * 1024 ** 2  # maior corpo de requisição aceito (bytes)
+MENSAGENS_HTTP = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+                  413: 'Payload Too Large', 500: 'Internal Server Error'}
+
+
+class RedeResidente:
+    """Rede carregada uma vez e mantida em memória: dados do arquivo, grafo e tempos posto x foco."""
+
+    def __init__(self, caminho: str, arestas: bool, dados: Tuple, grafo: nx.Graph,
+                 tempos_deslocamento: np.ndarray, segundos_carga: float):
+        self.caminho = caminho
+        self.arestas = arestas
+        self.dados = dados
+        self.grafo = grafo
+        self.tempos_deslocamento = tempos_deslocamento
+        self.segundos_carga = segundos_carga
+        self.usos = 0
+
+    def descricao(self) -> Dict:
+        return {'rede': self.caminho, 'arestas': self.arestas, 'focos': self.dados[0],
+                'postos': self.dados[1], 'segundos_carga': round(self.segundos_carga, 6),
+                'usos': self.usos}
+
+
+def carregar_rede(caminho: str, arestas: bool = False, cache_tempos: Optional[CacheTempos] = None,
+                  processos: Optional[int] = 1) -> RedeResidente:
+    """Lê o arquivo, constrói o grafo e calcula (ou lê do cache) os tempos de deslocamento."""
+    inicio = time.perf_counter()
+    leitor = LeitorEntrada.ler_arquivo_arestas if arestas else LeitorEntrada.ler_arquivo_mmap
+    dados = leitor(caminho)
+    if not dados:
+        raise ValueError(f"Não foi possível ler a rede '{caminho}'")
+    num_focos, num_postos, capacidades, areas_iniciais, fatores, rede = dados
+    grafo = construir_grafo(num_focos, num_postos, rede)
+
+    base = SimuladorIncendios(cache_tempos=cache_tempos, processos=processos)
+    base.carregar_dados(*dados, grafo=grafo)
+    # Só os valores ficam residentes: a rede em si já está no grafo
+    return RedeResidente(caminho, arestas, (num_focos, num_postos, capacidades, areas_iniciais, fatores, None),
+                         grafo, base.alocador.tempos_deslocamento, time.perf_counter() - inicio)
+
+
+def simular_cenario(rede: RedeResidente, cenario: Dict) -> Dict:
+    """
+    Simula um cenário sobre uma rede residente, sem reler o arquivo nem recalcular caminhos.
+
+    Args:
+        cenario: 'capacidades', 'areas' e 'fatores' (listas; o que faltar vem do
+                 arquivo), 'max_dias' (padrão: 100), 'motor', 'estrategia',
+                 'avanco_eventos', 'alteracoes' ([dia, u, v, distância ou null]) e
+                 'dias' (true para incluir focos ativos e área total de cada dia)
+
+    Returns:
+        Resultados da simulação (ver SimuladorIncendios.gerar_resultados)
+    """
+    num_focos, num_postos, capacidades, areas_iniciais, fatores, _ = rede.dados
+    valores = {'capacidades': (cenario.get('capacidades', capacidades), num_postos),
+               'areas': (cenario.get('areas', areas_iniciais), num_focos),
+               'fatores': (cenario.get('fatores', fatores), num_focos)}
+    for nome, (lista, tamanho) in valores.items():
+        if not isinstance(lista, list) or len(lista) != tamanho:
+            raise ValueError(f"'{nome}' deve ser uma lista com {tamanho} valores")
+    max_dias = cenario.get('max_dias', 100)
+    if not isinstance(max_dias, int) or max_dias < 0:
+        raise ValueError("'max_dias' deve ser um inteiro não negativo")
+
+    simulador = SimuladorIncendios(max_dias=max_dias, motor=cenario.get('motor', 'objetos'),
+                                   estrategia_alocacao=cenario.get('estrategia', 'guloso'),
+                                   avanco_eventos=bool(cenario.get('avanco_eventos', False)))
+    simulador.carregar_dados(num_focos, num_postos, [float(v) for v in valores['capacidades'][0]],
+                             [float(v) for v in valores['areas'][0]],
+                             [float(v) for v in valores['fatores'][0]], None,
+                             grafo=rede.grafo, tempos_deslocamento=rede.tempos_deslocamento)
+    for alteracao in cenario.get('alteracoes', []):
+        simulador.agendar_alteracao_aresta(*alteracao)
+
+    if not cenario.get('dias'):
+        return simulador.simular()
+    dias = [{'dia': estado['dia'], 'focos_ativos': estado['focos_ativos'],
+             'area_total': estado['area_total']} for estado in simulador.simular_dias()]
+    return {**simulador.gerar_resultados(), 'dias': dias}
+
+
+class RedesResidentes:
+    """
+    Redes mantidas em memória, das mais às menos usadas recentemente (LRU).
+
+    Cada rede é identificada pelo caminho do arquivo, pelo formato e pela data
+    de modificação (arquivo alterado é relido). Pedidos simultâneos da mesma
+    rede esperam uma única carga; acima do limite, a rede usada há mais tempo
+    sai da memória (simulações em andamento continuam com a referência que têm).
+    """
+
+    def __init__(self, limite: int = 4, raiz: str = '.', cache_tempos: Optional[CacheTempos] = None,
+                 processos: Optional[int] = 1):
+        """
+        Args:
+            limite: Número máximo de redes residentes
+            raiz: Diretório de onde as redes podem ser lidas (caminhos relativos a ele)
+            cache_tempos: Cache em disco dos tempos, usado na primeira carga de cada rede
+            processos: Processos para os caminhos mínimos da carga (padrão 1: a carga roda
+                       numa thread, e um pool criado fora da thread principal usaria fork)
+        """
+        if limite < 1:
+            raise ValueError("O limite de redes residentes deve ser pelo menos 1")
+        self.limite = limite
+        self.raiz = Path(raiz).resolve()
+        self.cache_tempos = cache_tempos
+        self.processos = processos
+        self.redes: 'OrderedDict[tuple, RedeResidente]' = OrderedDict()
+        self.cargas: Dict[tuple, asyncio.Future] = {}
+        self.acertos = 0
+        self.faltas = 0
+
+    def _chave(self, caminho: str, arestas: bool) -> tuple:
+        resolvido = (self.raiz / caminho).resolve()
+        if not resolvido.is_relative_to(self.raiz):
+            raise ValueError(f"A rede '{caminho}' está fora de {self.raiz}")
+        try:
+            modificado = resolvido.stat().st_mtime_ns
+        except OSError:
+            raise ValueError(f"Rede '{caminho}' não encontrada")
+        return (str(resolvido), arestas, modificado)
+
+    async def obter(self, caminho: str, arestas: bool = False) -> RedeResidente:
+        """Rede residente do arquivo, carregando-a (numa thread) se ainda não estiver em memória."""
+        chave = self._chave(caminho, arestas)
+        rede = self.redes.get(chave)
+        if rede is not None:
+            self.redes.move_to_end(chave)
+            self.acertos += 1
+            return rede
+        if chave not in self.cargas:
+            self.faltas += 1
+            carga = asyncio.ensure_future(asyncio.to_thread(carregar_rede, chave[0], arestas,
+                                                            self.cache_tempos, self.processos))
+            carga.add_done_callback(lambda c: self._guardar(chave, caminho, c))
+            self.cargas[chave] = carga
+        # shield: um cliente que desiste não cancela a carga dos outros
+        return await asyncio.shield(self.cargas[chave])
+
+    def _guardar(self, chave: tuple, caminho: str, carga: asyncio.Future) -> None:
+        """Põe a rede carregada no LRU, tirando as usadas há mais tempo além do limite."""
+        del self.cargas[chave]
+        if carga.cancelled() or carga.exception() is not None:
+            return
+        rede = carga.result()
+        rede.caminho = caminho
+        self.redes[chave] = rede
+        while len(self.redes) > self.limite:
+            self.redes.popitem(last=False)
+
+    def descricao(self) -> Dict:
+        return {'limite': self.limite, 'acertos': self.acertos, 'faltas': self.faltas,
+                'redes': [rede.descricao() for rede in reversed(self.redes.values())]}
+
+
+class ServidorSimulacao:
+    """
+    Servidor HTTP local (asyncio) que simula cenários sobre redes residentes.
+
+    Rotas (corpo e respostas em JSON):
+        GET  /saude      -> {'status': 'ok'}
+        GET  /redes      -> redes residentes, acertos e faltas do LRU
+        POST /redes      {'rede', 'arestas'} -> carrega a rede antes do primeiro cenário
+        POST /simular    {'rede', 'arestas', ...cenário} -> resultados (ver simular_cenario)
+
+    Cada conexão pode mandar várias requisições (keep-alive). As simulações rodam
+    em threads, no máximo `simultaneas` de cada vez (padrão 1), e o laço de
+    eventos segue atendendo as demais conexões; os caminhos mínimos só rodam na
+    primeira carga de cada rede. É concorrente, não paralelo: a simulação é
+    Python puro na maior parte e o GIL deixa uma thread por vez, então mais
+    simultâneas só ajudam quando há espera (ex.: cargas de rede em andamento).
+    """
+
+    def __init__(self, redes: RedesResidentes, simultaneas: Optional[int] = None):
+        self.redes = redes
+        self.simultaneas = simultaneas or 1
+        self._limite_simulacoes: Optional[asyncio.Semaphore] = None
+        self.atendidas = 0
+
+    async def iniciar(self, host: str = '127.0.0.1', porta: int = 8765,
+                      socket_unix: Optional[str] = None) -> asyncio.AbstractServer:
+        """Abre o servidor em host:porta, ou no socket Unix se informado."""
+        self._limite_simulacoes = asyncio.Semaphore(self.simultaneas)
+        if socket_unix:
+            return await asyncio.start_unix_server(self.atender, path=socket_unix)
+        return await asyncio.start_server(self.atender, host, porta)
+
+    async def atender(self, leitor: asyncio.StreamReader, escritor: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                requisicao = await self._ler_cabecalho(leitor)
+                if requisicao is None:
+                    break
+                metodo, rota, cabecalhos = requisicao
+                tamanho = int(cabecalhos.get('content-length', 0) or 0)
+                if tamanho > LIMITE_CORPO:
+                    self._escrever_resposta(escritor, 413, {'erro': f"Corpo maior que {LIMITE_CORPO} bytes"}, False)
+                    break
+                corpo = await leitor.readexactly(tamanho) if tamanho else b''
+                status, resposta = await self.responder(metodo, rota, corpo)
+                manter = cabecalhos.get('connection', '').lower() != 'close'
+                self._escrever_resposta(escritor, status, resposta, manter)
+                await escritor.drain()
+                self.atendidas += 1
+                if not manter:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        except ValueError as e:
+            self._escrever_resposta(escritor, 400, {'erro': str(e)}, False)
+        finally:
+            escritor.close()
+
+    async def _ler_cabecalho(self, leitor: asyncio.StreamReader) -> Optional[Tuple[str, str, Dict]]:
+        """Lê linha de requisição e cabeçalhos; None quando o cliente fecha a conexão."""
+        linha = await leitor.readline()
+        if not linha.strip():
+            return None
+        partes = linha.decode('latin-1').split()
+        if len(partes) != 3:
+            raise ValueError("Linha de requisição inválida")
+        metodo, rota, _ = partes
+        cabecalhos = {}
+        while True:
+            linha = await leitor.readline()
+            if linha in (b'\r\n', b'\n', b''):
+                break
+            nome, _, valor = linha.decode('latin-1').partition(':')
+            cabecalhos[nome.strip().lower()] = valor.strip()
+        return metodo, rota.split('?', 1)[0], cabecalhos
+
+    def _escrever_resposta(self, escritor: asyncio.StreamWriter, status: int, resposta: Dict,
+                           manter: bool) -> None:
+        corpo = json.dumps(resposta, ensure_ascii=False).encode('utf-8')
+        escritor.write((f"HTTP/1.1 {status} {MENSAGENS_HTTP[status]}\r\n"
+                        f"Content-Type: application/json; charset=utf-8\r\n"
+                        f"Content-Length: {len(corpo)}\r\n"
+                        f"Connection: {'keep-alive' if manter else 'close'}\r\n\r\n").encode('latin-1') + corpo)
+
+    async def responder(self, metodo: str, rota: str, corpo: bytes) -> Tuple[int, Dict]:
+        """Atende uma requisição já lida; retorna (status HTTP, resposta JSON)."""
+        rotas = {'/saude': ('GET',), '/redes': ('GET', 'POST'), '/simular': ('POST',)}
+        if rota not in rotas:
+            return 404, {'erro': f"Rota '{rota}' não existe"}
+        if metodo not in rotas[rota]:
+            return 405, {'erro': f"Use {' ou '.join(rotas[rota])} em {rota}"}
+        try:
+            if rota == '/saude':
+                return 200, {'status': 'ok', 'atendidas': self.atendidas}
+            if metodo == 'GET':
+                return 200, self.redes.descricao()
+
+            pedido = json.loads(corpo or b'{}')
+            if not isinstance(pedido, dict) or not isinstance(pedido.get('rede'), str):
+                raise ValueError("Informe 'rede' (caminho do arquivo de entrada)")
+            rede = await self.redes.obter(pedido['rede'], bool(pedido.get('arestas', False)))
+            if rota == '/redes':
+                return 200, rede.descricao()
+
+            rede.usos += 1
+            inicio = time.perf_counter()
+            async with self._limite_simulacoes:
+                resultados = await asyncio.to_thread(simular_cenario, rede, pedido)
+            return 200, {**resultados, 'tempo_s': time.perf_counter() - inicio}
+        except (ValueError, TypeError, KeyError) as e:
+            return 400, {'erro': str(e)}
+        except Exception as e:
+            return 500, {'erro': f"{type(e).__name__}: {e}"}
+
+
+async def servir(host: str = '127.0.0.1', porta: int = 8765, socket_unix: Optional[str] = None,
+                 precarregar: List[Tuple[str, bool]] = (), **opcoes) -> None:
+    """
+    Sobe o servidor e atende até ser interrompido.
+
+    Args:
+        precarregar: (caminho, arestas) das redes carregadas antes de aceitar conexões
+        opcoes: limite, raiz, cache_tempos e processos de RedesResidentes e
+                simultaneas de ServidorSimulacao
+    """
+    simultaneas = opcoes.pop('simultaneas', None)
+    redes = RedesResidentes(**opcoes)
+    for caminho, arestas in precarregar:
+        rede = await redes.obter(caminho, arestas)
+        print(f"Rede {caminho} carregada em {rede.segundos_carga:.3f} s")
+    servidor = ServidorSimulacao(redes, simultaneas)
+    aberto = await servidor.iniciar(host, porta, socket_unix)
+    print(f"Servidor ouvindo em {socket_unix or f'http://{host}:{porta}'}", flush=True)
+    async with aberto:
+        await aberto.serve_forever()
@@ -1,32 +1,101 @@
-from typing import Dict, List, Optional
+from typing import AsyncIterator, Dict, Iterator, List, Optional, Tuple, Union
 from entidades.foco import Foco
+from entidades.historico import HistoricoSimulacao
 from entidades.posto import Posto
+from entidades.snapshot import SnapshotSimulacao
+from servicos.alocador_fluxo import AlocadorFluxo
+from servicos.alocador_prioridade import AlocadorPrioridade
 from servicos.alocador_recursos import AlocadorRecursos
+from servicos.avanco_eventos import AvancoEventos
+from servicos.cache_tempos import CacheTempos
+from servicos.grafo import construir_grafo
+from servicos.instrumentacao import Instrumentacao
+from servicos.motor_vetorizado import MotorVetorizado
 
 import networkx as nx
+import numpy as np
 
 
 class SimuladorIncendios:
     """Classe principal que gerencia a simulação do combate a incêndios."""
     
-    def __init__(self, max_dias: int = 100):
+    MOTORES = ('objetos', 'vetorizado')
+    ALOCADORES = {'guloso': AlocadorRecursos, 'prioridade': AlocadorPrioridade, 'fluxo': AlocadorFluxo}
+    RETENCOES = ('todos', 'nenhum')
+
+    def __init__(self, max_dias: int = 100, motor: str = 'objetos',
+                 cache_tempos: Optional[CacheTempos] = None, processos: Optional[int] = None,
+                 estrategia_alocacao: str = 'guloso', avanco_eventos: bool = False,
+                 instrumentacao: Optional[Instrumentacao] = None,
+                 retencao_historico: Union[str, int] = 'todos', por_regioes: bool = False):
         """
         Inicializa o simulador com configurações padrão.
         
         Args:
             max_dias: Número máximo de dias para a simulação (padrão: 100)
+            motor: 'objetos' (Foco/Posto um a um) ou 'vetorizado' (arrays NumPy)
+            cache_tempos: Cache em disco dos tempos de deslocamento (padrão: sem cache)
+            processos: Processos para os caminhos mínimos (padrão: núcleos da máquina)
+            estrategia_alocacao: 'guloso' (AlocadorRecursos), 'prioridade' (heap de focos e
+                                 candidatos pré-computados, mesmas decisões) ou 'fluxo' (um LP
+                                 por dia, ver AlocadorFluxo); só no motor de objetos
+            avanco_eventos: Salta trechos estáveis pela forma fechada do crescimento, até o
+                            próximo evento (ver AvancoEventos); só no motor de objetos
+            instrumentacao: Tempos por fase e contadores por dia (padrão: desligada, sem
+                            custo perceptível); ver servicos.instrumentacao
+            retencao_historico: Dias mantidos no histórico: 'todos', 'nenhum' ou um número N
+                                (os N últimos); com avanço por eventos fica pelo menos 1
+            por_regioes: Simula cada região independente da rede (postos e focos que não
+                         alcançam os de outras regiões) em paralelo, em até `processos`
+                         processos, e junta os resultados (ver servicos.regioes)
         """
+        if motor not in self.MOTORES:
+            raise ValueError(f"Motor inválido '{motor}' - opções: {', '.join(self.MOTORES)}")
+        if estrategia_alocacao not in self.ALOCADORES:
+            raise ValueError(f"Estratégia de alocação inválida '{estrategia_alocacao}' - "
+                             f"opções: {', '.join(self.ALOCADORES)}")
+        if motor == 'vetorizado' and estrategia_alocacao != 'guloso':
+            raise ValueError("O motor vetorizado usa sua própria alocação gulosa")
+        if motor == 'vetorizado' and avanco_eventos:
+            raise ValueError("O avanço por eventos só está disponível no motor de objetos")
+        if estrategia_alocacao == 'fluxo' and avanco_eventos:
+            raise ValueError("O avanço por eventos supõe a alocação gulosa (cada posto num só foco)")
+        if retencao_historico not in self.RETENCOES and \
+                not (isinstance(retencao_historico, int) and retencao_historico >= 0):
+            raise ValueError(f"Retenção de histórico inválida '{retencao_historico}' - "
+                             f"opções: {', '.join(self.RETENCOES)} ou um número de dias")
+        if por_regioes and retencao_historico != 'todos':
+            raise ValueError("A simulação por regiões guarda o histórico completo")
         self.mapa_focos: Dict[str, Foco] = {}
         self.mapa_postos: Dict[str, Posto] = {}
         self.grafo = nx.Graph()
         self.alocador: Optional[AlocadorRecursos] = None
         self.dia_atual = 0
         self.max_dias = max_dias
-        self.historico_alocacoes: List[List[dict]] = []
+        self.historico: Optional[HistoricoSimulacao] = None
+        self.motor = motor
+        self.motor_vetorizado: Optional[MotorVetorizado] = None
+        self.cache_tempos = cache_tempos
+        self.processos = processos
+        self.estrategia_alocacao = estrategia_alocacao
+        self.avanco_eventos = avanco_eventos
+        self.eventos: Optional[AvancoEventos] = None
+        self.instrumentacao = instrumentacao or Instrumentacao(ativa=False)
+        self.retencao_historico = retencao_historico
+        self.por_regioes = por_regioes
+        self.alteracoes_rede: Dict[int, List[Tuple[str, str, Optional[float]]]] = {}
+        self._grafo_proprio = False  # grafo recebido/compartilhado: copiado antes da primeira alteração
+        # Dia sem nenhuma alocação com focos ativos encerra a simulação; as regiões
+        # simuladas em paralelo seguem, e o encerramento é decidido na junção
+        self.parar_sem_alocacao = True
 
     def carregar_dados(self, num_focos: int, num_postos: int, capacidades: List[float],
                        areas_iniciais: List[float], fatores_crescimento: List[float],
-                       matriz_distancias: List[List[float]]) -> None:
+                       matriz_distancias: Optional[List[List[float]]],
+                       grafo: Optional[nx.Graph] = None,
+                       tempos_deslocamento: Optional[np.ndarray] = None,
+                       focos_ids: Optional[List[str]] = None,
+                       postos_ids: Optional[List[str]] = None) -> None:
         """       
         Args:
             num_focos: Número de focos de incêndio
@@ -34,34 +103,230 @@ class SimuladorIncendios:
             capacidades: Lista de capacidades dos postos (km²/hora)
             areas_iniciais: Lista de áreas iniciais dos focos (km²)
             fatores_crescimento: Lista de fatores de crescimento diário dos focos
-            matriz_distancias: Matriz de distâncias entre todos os nós
+            matriz_distancias: Matriz de distâncias entre todos os nós, ou ListaArestas
+            grafo: Grafo já construído por servicos.grafo.construir_grafo; se
+                   informado, a matriz não é percorrida de novo
+            tempos_deslocamento: Matriz posto x foco já calculada (ex.: de outra
+                   simulação na mesma rede); com ela a matriz de distâncias pode ser None
+            focos_ids, postos_ids: Ids dos focos e postos (padrão: f0.., b0..), ex.: de uma
+                   região de uma rede maior; devem ser os nomes dos nós do grafo
         """
         self._criar_entidades(num_focos, num_postos, capacidades, 
-                              areas_iniciais, fatores_crescimento)
-        self._construir_grafo(matriz_distancias)
-        self.alocador = AlocadorRecursos(self.mapa_focos, self.mapa_postos,
-                                         self.grafo)
+                              areas_iniciais, fatores_crescimento, focos_ids, postos_ids)
+        self.historico = HistoricoSimulacao(list(self.mapa_focos), list(self.mapa_postos))
+        self.historico.registrar_areas(self._areas_atuais())
+        if grafo is not None:
+            self.grafo = grafo
+        elif matriz_distancias is not None:
+            self._construir_grafo(matriz_distancias)
+        self._grafo_proprio = False
+        self._preparar_alocacao(tempos_deslocamento)
+
+    def _preparar_alocacao(self, tempos_deslocamento: Optional[np.ndarray]) -> None:
+        """Cria o alocador (e o motor vetorizado / avanço por eventos) sobre as entidades atuais."""
+        classe_alocador = self.ALOCADORES[self.estrategia_alocacao]
+        self.alocador = classe_alocador(self.mapa_focos, self.mapa_postos,
+                                        self.grafo, processos=self.processos,
+                                        cache=self.cache_tempos,
+                                        tempos_deslocamento=tempos_deslocamento,
+                                        instrumentacao=self.instrumentacao)
+        if self.instrumentacao.ativa:
+            self.instrumentacao.postos_ids = list(self.mapa_postos)
+        if self.avanco_eventos:
+            self.eventos = AvancoEventos(self.mapa_focos, self.mapa_postos, self.alocador)
+        if self.motor == 'vetorizado':
+            self.motor_vetorizado = MotorVetorizado(self.mapa_focos, self.mapa_postos,
+                                                    self.alocador, self.instrumentacao)
+
+    def snapshot(self) -> SnapshotSimulacao:
+        """
+        Captura o estado completo da simulação no fim do dia atual.
+
+        Custa O(focos + postos): o histórico entra como visões das colunas já
+        registradas e os tempos de deslocamento por referência.
+        """
+        if self.historico is None or not self.alocador:
+            raise RuntimeError("Nenhum dado carregado para o snapshot")
+        focos = list(self.mapa_focos.values())
+        postos = list(self.mapa_postos.values())
+        if self.motor_vetorizado:
+            motor = self.motor_vetorizado
+            areas, ativos = motor.areas.copy(), motor.ativos.copy()
+            dias_extincao, capacidades = motor.dias_extincao.copy(), motor.capacidades.copy()
+            capacidades_alocadas = motor.capacidades_alocadas.copy()
+        else:
+            areas = np.fromiter((f.area_atual for f in focos), np.float64, len(focos))
+            ativos = np.fromiter((f.status == 'ativo' for f in focos), bool, len(focos))
+            dias_extincao = np.fromiter((f.dia_extincao for f in focos), np.int64, len(focos))
+            capacidades = np.fromiter((p.capacidade_total_ph for p in postos), np.float64, len(postos))
+            capacidades_alocadas = np.fromiter((p.capacidade_alocada for p in postos),
+                                               np.float64, len(postos))
+        colunas, areas_historico = self.historico.visoes()
+        # A matriz sai por referência: a próxima alteração de rede daqui a copia antes de reparar
+        self.alocador._tempos_proprios = False
+        return SnapshotSimulacao(
+            self.dia_atual, list(self.mapa_focos), list(self.mapa_postos),
+            np.fromiter((f.area_inicial for f in focos), np.float64, len(focos)),
+            np.fromiter((f.taxa_alpha for f in focos), np.float64, len(focos)),
+            areas, ativos, dias_extincao, capacidades,
+            np.fromiter((p.tempo_trabalho_diario for p in postos), np.float64, len(postos)),
+            capacidades_alocadas, colunas, self.historico.num_dias, areas_historico,
+            self.alocador.tempos_deslocamento, self.historico.primeiro_dia,
+        )
+
+    def restaurar(self, snapshot: SnapshotSimulacao,
+                  tempos_deslocamento: Optional[np.ndarray] = None) -> None:
+        """
+        Volta a simulação ao estado de um snapshot, sem refazer os dias anteriores.
+
+        Focos, postos e histórico são recriados (o snapshot continua válido para
+        outras restaurações); o grafo atual é mantido.
+
+        Args:
+            snapshot: Estado capturado por snapshot() ou lido com ler_snapshot
+            tempos_deslocamento: Matriz posto x foco, se o snapshot não trouxer a sua
+                                 (padrão: a do snapshot, ou a do alocador atual)
+        """
+        if tempos_deslocamento is None:
+            tempos_deslocamento = snapshot.tempos_deslocamento
+        if tempos_deslocamento is None and self.alocador:
+            tempos_deslocamento = self.alocador.tempos_deslocamento
+        if tempos_deslocamento is None:
+            raise ValueError("O snapshot não traz os tempos de deslocamento; informe tempos_deslocamento")
+
+        self._criar_entidades(len(snapshot.focos_ids), len(snapshot.postos_ids),
+                              snapshot.capacidades.tolist(), snapshot.areas_iniciais.tolist(),
+                              snapshot.taxas.tolist(), snapshot.focos_ids, snapshot.postos_ids)
+        for i, foco in enumerate(self.mapa_focos.values()):
+            foco.area_atual = float(snapshot.areas[i])
+            foco.status = 'ativo' if snapshot.ativos[i] else 'extinto'
+            foco.dia_extincao = int(snapshot.dias_extincao[i])
+        for j, posto in enumerate(self.mapa_postos.values()):
+            posto.tempo_trabalho_diario = float(snapshot.tempo_trabalho[j])
+            posto.capacidade_alocada = float(snapshot.capacidades_alocadas[j])
+
+        self.dia_atual = snapshot.dia_atual
+        self.historico = HistoricoSimulacao(snapshot.focos_ids, snapshot.postos_ids,
+                                            capacidade_inicial=max(64, len(snapshot.colunas['dia'])))
+        self.historico.carregar(snapshot.colunas, snapshot.num_dias, snapshot.areas_historico,
+                                snapshot.primeiro_dia)
+        self._preparar_alocacao(tempos_deslocamento)
+
+    def fork(self, instrumentacao: Optional[Instrumentacao] = None) -> 'SimuladorIncendios':
+        """
+        Cria um ramo independente a partir do dia atual, no mesmo processo.
+
+        O ramo tem a mesma configuração e as mesmas alterações de rede agendadas,
+        compartilha o grafo e os tempos de deslocamento (copiados por quem os
+        alterar primeiro) e segue sem afetar esta simulação, por exemplo depois de
+        alterar_capacidade.
+        """
+        ramo = SimuladorIncendios(max_dias=self.max_dias, motor=self.motor,
+                                  cache_tempos=self.cache_tempos, processos=self.processos,
+                                  estrategia_alocacao=self.estrategia_alocacao,
+                                  avanco_eventos=self.avanco_eventos, instrumentacao=instrumentacao,
+                                  retencao_historico=self.retencao_historico)
+        ramo.grafo = self.grafo
+        self._grafo_proprio = False  # agora compartilhado com o ramo
+        ramo.restaurar(self.snapshot())  # snapshot() também marca os tempos como compartilhados
+        ramo.alteracoes_rede = {dia: list(alteracoes) for dia, alteracoes in self.alteracoes_rede.items()}
+        return ramo
+
+    def alterar_capacidade(self, posto_id: str, capacidade: float) -> None:
+        """Muda a capacidade (km²/hora) de um posto a partir do próximo dia."""
+        posto = self.mapa_postos[posto_id]
+        posto.capacidade_total_ph = float(capacidade)
+        if self.motor_vetorizado:
+            self.motor_vetorizado.capacidades[self.alocador.indice_postos[posto_id]] = posto.capacidade_total_ph
+
+    def agendar_alteracao_aresta(self, dia: int, u: str, v: str,
+                                 distancia: Optional[float] = None) -> None:
+        """
+        Agenda uma mudança na rede para o início de um dia (antes da alocação).
+
+        Muda o peso da aresta u-v, inserindo-a se não existir; distancia None a remove
+        (estrada fechada). Os tempos de deslocamento são reparados só onde a mudança
+        pode ter efeito (ver AlocadorRecursos.alterar_aresta), sem recalcular tudo.
+
+        Args:
+            dia: Dia em que a mudança passa a valer (depois do dia atual)
+            u, v: Nós da aresta ('f0', 'b2', ...)
+            distancia: Novo tempo de percurso em horas, ou None para remover
+        """
+        if dia <= self.dia_atual:
+            raise ValueError(f"O dia {dia} já foi simulado (dia atual: {self.dia_atual})")
+        if u not in self.grafo or v not in self.grafo:
+            raise ValueError(f"Aresta inválida '{u}'-'{v}': nó fora da rede")
+        self.alteracoes_rede.setdefault(dia, []).append((u, v, distancia))
+
+    def _aplicar_alteracoes_rede(self, dia: int) -> None:
+        alteracoes = self.alteracoes_rede.pop(dia, None)
+        if not alteracoes:
+            return
+        if not self._grafo_proprio:
+            self.grafo = self.grafo.copy()
+            self.alocador.grafo = self.grafo
+            self._grafo_proprio = True
+        with self.instrumentacao.fase('reparo_tempos'):
+            focos = np.unique(np.concatenate([self.alocador.alterar_aresta(u, v, distancia)
+                                              for u, v, distancia in alteracoes]))
+            if focos.size:
+                tempos = self.alocador.tempos_deslocamento
+                if self.motor_vetorizado:
+                    self.motor_vetorizado.atualizar_tempos(tempos, focos)
+                if self.eventos:
+                    self.eventos.atualizar_tempos(tempos, focos)
+        self.instrumentacao.contar('arestas_alteradas', len(alteracoes))
 
     def _criar_entidades(self, num_focos: int, num_postos: int, capacidades: List[float],
-                         areas_iniciais: List[float], fatores_crescimento: List[float]) -> None:
+                         areas_iniciais: List[float], fatores_crescimento: List[float],
+                         focos_ids: Optional[List[str]] = None,
+                         postos_ids: Optional[List[str]] = None) -> None:
 
+        focos_ids = focos_ids or [f"f{i}" for i in range(num_focos)]
+        postos_ids = postos_ids or [f"b{i}" for i in range(num_postos)]
         self.mapa_focos = {
-            f"f{i}": Foco(f"f{i}", areas_iniciais[i], fatores_crescimento[i]) 
+            focos_ids[i]: Foco(focos_ids[i], areas_iniciais[i], fatores_crescimento[i],
+                               guardar_historico=False)
             for i in range(num_focos)
         }
         self.mapa_postos = {
-            f"b{i}": Posto(f"b{i}", capacidades[i]) 
+            postos_ids[i]: Posto(postos_ids[i], capacidades[i]) 
             for i in range(num_postos)
         }
 
     def _construir_grafo(self, matriz_distancias: List[List[float]]) -> None:
-        """Constrói o grafo de conexões a partir da matriz de distâncias."""
-        node_names = list(self.mapa_focos.keys()) + list(self.mapa_postos.keys())
-        for i in range(len(node_names)):
-            for j in range(len(node_names)):
-                distancia = matriz_distancias[i][j]
-                if distancia > 0:  # Ignora conexões com distância zero
-                    self.grafo.add_edge(node_names[i], node_names[j], weight=distancia)
+        """Constrói o grafo de conexões a partir da matriz de distâncias ou da lista de arestas."""
+        self.grafo = construir_grafo(len(self.mapa_focos), len(self.mapa_postos), matriz_distancias)
+
+    def _areas_atuais(self) -> np.ndarray:
+        """Áreas dos focos na ordem do histórico, NaN para os extintos."""
+        return np.fromiter((f.area_atual if f.status == 'ativo' else np.nan
+                            for f in self.mapa_focos.values()), np.float64, len(self.mapa_focos))
+
+    @property
+    def historico_alocacoes(self) -> List[List[dict]]:
+        """
+        Histórico de alocações no formato antigo (uma lista de dicionários por dia).
+
+        Montado a partir do HistoricoSimulacao a cada acesso; para simulações longas
+        prefira ler self.historico diretamente.
+        """
+        if self.historico is None:
+            return []
+        focos = list(self.mapa_focos.values())
+        postos = list(self.mapa_postos.values())
+        colunas = {nome: coluna.tolist() for nome, coluna in self.historico.para_numpy().items()}
+        dias: List[List[dict]] = [[] for _ in range(self.historico.num_dias)]
+        for i, dia in enumerate(colunas['dia']):
+            dias[dia - 1].append({
+                'posto': postos[colunas['posto'][i]],
+                'foco': focos[colunas['foco'][i]],
+                'capacidade_alocada': colunas['capacidade_alocada'][i],
+                'tempo_combate': colunas['tempo_combate'][i],
+                'area_reduzida': colunas['area_reduzida'][i],
+            })
+        return dias
 
     def executar_dia(self) -> bool:
         """
@@ -74,25 +339,66 @@ class SimuladorIncendios:
         
         if not self.alocador:
             raise RuntimeError("Alocador de recursos não foi inicializado")
+
+        instrumentacao = self.instrumentacao
+        if not instrumentacao.ativa:
+            return self._executar_dia()
+
+        instrumentacao.iniciar_dia(self.dia_atual)
+        instrumentacao.contar('focos_ativos', self._contar_focos_ativos())
+        continuar = self._executar_dia()
+        alocacoes = self.historico.alocacoes_do_dia(self.dia_atual)
+        instrumentacao.contar('alocacoes', len(alocacoes['posto']))
+        instrumentacao.finalizar_dia(self._utilizacao_postos(alocacoes))
+        return continuar
+
+    def _executar_dia(self) -> bool:
+        instrumentacao = self.instrumentacao
+        if self.alteracoes_rede:
+            self._aplicar_alteracoes_rede(self.dia_atual)
+        if self.motor_vetorizado:
+            return self.motor_vetorizado.executar_dia(self.dia_atual, self.historico,
+                                                      self.parar_sem_alocacao)
             
-        alocacoes = self.alocador.alocar_recursos_dia()
-        self.historico_alocacoes.append(alocacoes)
+        with instrumentacao.fase('alocacao'):
+            alocacoes = self.alocador.alocar_recursos_dia()
+        with instrumentacao.fase('registro'):
+            self.historico.registrar_alocacoes(self.dia_atual, alocacoes)
         
         # Verifica se há focos ativos sem alocação
-        if not alocacoes and any(f.status == 'ativo' for f in self.mapa_focos.values()):
+        if not alocacoes and self.parar_sem_alocacao and \
+                any(f.status == 'ativo' for f in self.mapa_focos.values()):
+            self.historico.registrar_areas(self._areas_atuais())
             return False
         
         # Aplica o combate aos focos
-        for aloc in alocacoes:
-            aloc['foco'].combater(aloc['area_reduzida'], self.dia_atual)
+        with instrumentacao.fase('combate'):
+            for aloc in alocacoes:
+                aloc['foco'].combater(aloc['area_reduzida'], self.dia_atual)
         
         # Aplica crescimento aos focos ativos
-        for foco in self.mapa_focos.values():
-            if foco.status == 'ativo':
-                foco.crescer()
+        with instrumentacao.fase('crescimento'):
+            for foco in self.mapa_focos.values():
+                if foco.status == 'ativo':
+                    foco.crescer()
+        with instrumentacao.fase('registro'):
+            self.historico.registrar_areas(self._areas_atuais())
         
         return True
 
+    def _contar_focos_ativos(self) -> int:
+        if self.motor_vetorizado:
+            return int(self.motor_vetorizado.ativos.sum())
+        return sum(f.status == 'ativo' for f in self.mapa_focos.values())
+
+    def _utilizacao_postos(self, alocacoes: Dict[str, np.ndarray]) -> np.ndarray:
+        """Fração da capacidade de cada posto alocada no dia, pelas colunas do histórico."""
+        capacidades = np.array([p.capacidade_total_ph for p in self.mapa_postos.values()])
+        alocado = np.bincount(alocacoes['posto'], weights=alocacoes['capacidade_alocada'],
+                              minlength=len(capacidades))
+        return np.divide(alocado, capacidades, out=np.zeros(len(capacidades)),
+                         where=capacidades > 0)
+
     def simular(self) -> Dict:
         """
         Executa a simulação completa até extinguir todos os focos ou atingir o limite de dias.
@@ -107,17 +413,130 @@ class SimuladorIncendios:
                 'focos_ativos': Dict[str, float]
             }
         """
+        if self.por_regioes:
+            if self.alteracoes_rede:
+                raise ValueError("Alterações de rede agendadas não são suportadas na simulação por regiões")
+            if self.dia_atual:
+                raise ValueError("A simulação por regiões começa do dia 0")
+            from servicos.regioes import simular_por_regioes  # servicos.regioes cria simuladores
+            simular_por_regioes(self)
+            return self.gerar_resultados()
+        for _ in self._passos():
+            pass
+        return self.gerar_resultados()
+
+    def _passos(self) -> Iterator[Tuple[int, int]]:
+        """
+        Laço da simulação: produz (primeiro, último) dia de cada passo.
+
+        Um passo é um dia, ou vários quando o avanço por eventos salta um trecho
+        estável. A retenção do histórico é aplicada quando o passo seguinte começa,
+        depois de quem consome os dias já os ter lido.
+        """
         while self.dia_atual < self.max_dias:
-            if not any(f.status == 'ativo' for f in self.mapa_focos.values()):
+            if not self._existe_foco_ativo():
                 break  # Todos os focos extintos
-                
-            if not self.executar_dia():
+
+            inicio = self.dia_atual + 1
+            continuar = self.executar_dia()
+
+            if continuar and self.eventos:
+                # O salto para antes da próxima alteração de rede agendada
+                limite = min(self.max_dias, min(self.alteracoes_rede, default=self.max_dias + 1) - 1)
+                with self.instrumentacao.fase('avanco_eventos'):
+                    saltados = self.eventos.tentar_avancar(self.historico, self.dia_atual, limite)
+                self.instrumentacao.contar('dias_saltados', saltados)
+                self.dia_atual += saltados
+
+            yield inicio, self.dia_atual
+            self._aplicar_retencao()
+            if not continuar:
                 break  # Falha na alocação
-        
-        return self.gerar_resultados()
+
+    def _aplicar_retencao(self) -> None:
+        """Descarta do histórico os dias além da política de retenção."""
+        if self.retencao_historico == 'todos':
+            return
+        dias = 0 if self.retencao_historico == 'nenhum' else self.retencao_historico
+        if self.eventos:
+            dias = max(dias, 1)  # o avanço por eventos compara o dia com o anterior
+        limite = self.dia_atual - dias
+        # Com N grande, só compacta quando há ao menos N dias sobrando (custo amortizado)
+        if limite - self.historico.primeiro_dia >= max(1, dias):
+            self.historico.descartar_ate(limite)
+            if self.eventos:
+                self.eventos.descartar_ate(self.historico.primeiro_dia)
+
+    def estado_dia(self, dia: int) -> Dict:
+        """
+        Estado de um dia já simulado e ainda no histórico, em cópias independentes.
+
+        Returns:
+            {'dia', 'alocacoes' (colunas posto, foco, capacidade_alocada, tempo_combate
+            e area_reduzida, com índices de historico.postos_ids/focos_ids), 'areas' (ao
+            fim do dia, NaN para extintos), 'focos_ativos', 'area_total'}
+
+        Raises:
+            ValueError: Se o dia foi descartado pela retenção ou ainda não foi simulado
+        """
+        alocacoes = {nome: coluna.copy() for nome, coluna in self.historico.alocacoes_do_dia(dia).items()
+                     if nome != 'dia'}
+        areas = self.historico.areas_do_dia(dia).copy()
+        ativos = ~np.isnan(areas)
+        return {'dia': dia, 'alocacoes': alocacoes, 'areas': areas,
+                'focos_ativos': int(ativos.sum()), 'area_total': float(areas[ativos].sum())}
+
+    def simular_dias(self) -> Iterator[Dict]:
+        """
+        Executa a simulação produzindo o estado de cada dia (ver estado_dia) assim que é calculado.
+
+        Parar de consumir interrompe a simulação no último dia produzido; os
+        resultados até ali ficam em gerar_resultados(). Dias saltados pelo avanço
+        por eventos também são produzidos, um a um.
+        """
+        if self.por_regioes:
+            raise ValueError("A simulação por regiões não produz os dias um a um; use simular()")
+        for inicio, fim in self._passos():
+            for dia in range(inicio, fim + 1):
+                yield self.estado_dia(dia)
+
+    async def simular_async(self, em_thread: bool = False) -> AsyncIterator[Dict]:
+        """
+        Variante assíncrona de simular_dias, para `async for`.
+
+        Devolve o controle ao laço de eventos a cada dia; com em_thread=True cada
+        passo roda numa thread (asyncio.to_thread), sem bloquear o laço.
+        """
+        import asyncio
+
+        dias = self.simular_dias()
+        fim = object()
+        try:
+            while True:
+                if em_thread:
+                    estado = await asyncio.to_thread(next, dias, fim)
+                else:
+                    estado = next(dias, fim)
+                    await asyncio.sleep(0)
+                if estado is fim:
+                    break
+                yield estado
+        finally:
+            dias.close()
+
+    def _existe_foco_ativo(self) -> bool:
+        if self.motor_vetorizado:
+            return self.motor_vetorizado.existe_ativo()
+        return any(f.status == 'ativo' for f in self.mapa_focos.values())
+
+    def sincronizar_entidades(self) -> None:
+        """No motor vetorizado, copia o estado dos arrays para os objetos Foco/Posto."""
+        if self.motor_vetorizado:
+            self.motor_vetorizado.sincronizar()
 
     def gerar_resultados(self) -> Dict:
         """Compila os resultados finais da simulação."""
+        self.sincronizar_entidades()
         return {
             'sucesso': not any(f.status == 'ativo' for f in self.mapa_focos.values()),
             'dias_totais': self.dia_atual,
@@ -130,6 +549,7 @@ class SimuladorIncendios:
 
     def obter_estado_atual(self) -> Dict:
         """Retorna um resumo do estado atual da simulação."""
+        self.sincronizar_entidades()
         return {
             'dia': self.dia_atual,
             'focos': {f.id: {'area': f.area_atual, 'status': f.status} 
@@ -0,0 +1,228 @@
+from concurrent.futures import ProcessPoolExecutor
+from itertools import product
+from multiprocessing import shared_memory
+from typing import Callable, Dict, List, Optional, Sequence, Tuple, Union
+import os
+
+import numpy as np
+
+from servicos.cache_tempos import CacheTempos
+from servicos.simulador import SimuladorIncendios
+
+PARAMETROS = ('capacidades', 'areas_iniciais', 'fatores_crescimento')
+
+# ('uniforme', a, b): multiplica cada valor por U(a, b)
+# ('normal', desvio): multiplica cada valor por 1 + N(0, desvio), sem deixar negativo
+# função(rng, base) -> array: perturbação livre, do mesmo tamanho de base
+Distribuicao = Union[Tuple, Callable[[np.random.Generator, np.ndarray], np.ndarray]]
+
+
+def _valores_base(dados: Tuple) -> Dict[str, np.ndarray]:
+    _, _, capacidades, areas_iniciais, fatores_crescimento, _ = dados
+    return {
+        'capacidades': np.asarray(capacidades, dtype=np.float64),
+        'areas_iniciais': np.asarray(areas_iniciais, dtype=np.float64),
+        'fatores_crescimento': np.asarray(fatores_crescimento, dtype=np.float64),
+    }
+
+
+def gerar_cenarios_aleatorios(dados: Tuple, num_execucoes: int,
+                              distribuicoes: Dict[str, Distribuicao],
+                              semente: Optional[int] = None) -> Dict[str, np.ndarray]:
+    """
+    Sorteia cenários Monte Carlo a partir dos valores do arquivo de entrada.
+
+    Args:
+        dados: Tupla retornada pelo LeitorEntrada
+        num_execucoes: Quantidade de cenários
+        distribuicoes: Perturbação por parâmetro ('capacidades', 'areas_iniciais',
+                       'fatores_crescimento'); parâmetros ausentes ficam fixos
+        semente: Semente do gerador aleatório
+
+    Returns:
+        Um array (execuções x valores) por parâmetro
+    """
+    rng = np.random.default_rng(semente)
+    cenarios = {}
+    for nome, base in _valores_base(dados).items():
+        distribuicao = distribuicoes.get(nome)
+        if distribuicao is None:
+            cenarios[nome] = np.broadcast_to(base, (num_execucoes, len(base))).copy()
+        elif callable(distribuicao):
+            cenarios[nome] = np.array([distribuicao(rng, base) for _ in range(num_execucoes)],
+                                      dtype=np.float64).reshape(num_execucoes, len(base))
+        elif distribuicao[0] == 'uniforme':
+            _, a, b = distribuicao
+            cenarios[nome] = base * rng.uniform(a, b, size=(num_execucoes, len(base)))
+        elif distribuicao[0] == 'normal':
+            _, desvio = distribuicao
+            fator = np.maximum(0.0, 1.0 + rng.normal(0.0, desvio, size=(num_execucoes, len(base))))
+            cenarios[nome] = base * fator
+        else:
+            raise ValueError(f"Distribuição inválida para {nome}: {distribuicao!r}")
+    return cenarios
+
+
+def gerar_cenarios_grade(dados: Tuple, fatores: Dict[str, Sequence[float]]) -> Dict[str, np.ndarray]:
+    """
+    Monta uma grade de cenários: cada combinação de multiplicadores vira uma execução.
+
+    Ex.: {'fatores_crescimento': [0.9, 1.0, 1.1], 'capacidades': [0.5, 1.0]} gera 6
+    cenários, multiplicando todos os valores do parâmetro pelo fator da combinação.
+    """
+    base = _valores_base(dados)
+    nomes = [nome for nome in PARAMETROS if nome in fatores]
+    combinacoes = list(product(*(fatores[nome] for nome in nomes))) or [()]
+    cenarios = {nome: np.empty((len(combinacoes), len(valores))) for nome, valores in base.items()}
+    for k, combinacao in enumerate(combinacoes):
+        multiplicadores = dict(zip(nomes, combinacao))
+        for nome, valores in base.items():
+            cenarios[nome][k] = valores * multiplicadores.get(nome, 1.0)
+    return cenarios
+
+
+# Estado de cada processo trabalhador: arrays em memória compartilhada, sem cópia
+_memorias: List[shared_memory.SharedMemory] = []
+_arrays_trabalhador: Dict[str, np.ndarray] = {}
+_config_trabalhador: Dict = {}
+
+
+def _anexar(nome: str, shape: tuple) -> np.ndarray:
+    memoria = shared_memory.SharedMemory(name=nome)
+    _memorias.append(memoria)  # mantém o bloco aberto enquanto o processo viver
+    return np.ndarray(shape, dtype=np.float64, buffer=memoria.buf)
+
+
+def _inicializar_trabalhador(blocos: Dict[str, tuple], config: Dict) -> None:
+    for nome, (nome_memoria, shape) in blocos.items():
+        _arrays_trabalhador[nome] = _anexar(nome_memoria, shape)
+    _config_trabalhador.update(config)
+
+
+def _executar_cenarios(arrays: Dict[str, np.ndarray], config: Dict,
+                       indices: range) -> List[tuple]:
+    """Roda os cenários de `indices` e devolve (sucesso, dias_totais, focos extintos) de cada um."""
+    tempos = arrays['tempos']
+    num_postos, num_focos = tempos.shape
+    saida = []
+    for k in indices:
+        simulador = SimuladorIncendios(max_dias=config['max_dias'], motor=config['motor'])
+        simulador.carregar_dados(num_focos, num_postos, arrays['capacidades'][k],
+                                 arrays['areas_iniciais'][k], arrays['fatores_crescimento'][k],
+                                 None, tempos_deslocamento=tempos)
+        resultados = simulador.simular()
+        extintos = np.array([f.status == 'extinto' for f in simulador.mapa_focos.values()])
+        saida.append((resultados['sucesso'], resultados['dias_totais'], extintos))
+    return saida
+
+
+def _executar_cenarios_trabalhador(indices: range) -> List[tuple]:
+    return _executar_cenarios(_arrays_trabalhador, _config_trabalhador, indices)
+
+
+def executar_varredura(dados: Tuple, cenarios: Dict[str, np.ndarray], max_dias: int = 100,
+                       motor: str = 'vetorizado', processos: Optional[int] = None,
+                       cache_tempos: Optional[CacheTempos] = None) -> Dict:
+    """
+    Roda muitas simulações da mesma rede variando capacidades, áreas e fatores.
+
+    Os tempos de deslocamento são calculados uma única vez e, junto com os
+    cenários, ficam em memória compartilhada: os processos trabalhadores leem
+    direto dela, sem cópia por execução.
+
+    Args:
+        dados: Tupla retornada pelo LeitorEntrada (define a rede e os valores base)
+        cenarios: Saída de gerar_cenarios_aleatorios ou gerar_cenarios_grade
+        max_dias: Limite de dias de cada simulação
+        motor: Motor do SimuladorIncendios usado nas execuções
+        processos: Processos trabalhadores (padrão: núcleos da máquina)
+        cache_tempos: Cache em disco para o cálculo inicial dos tempos
+
+    Returns:
+        Estatísticas agregadas (ver agregar_resultados)
+    """
+    num_focos, num_postos = dados[0], dados[1]
+    base = SimuladorIncendios(max_dias=max_dias, cache_tempos=cache_tempos, processos=processos)
+    base.carregar_dados(*dados)
+    focos_ids = list(base.mapa_focos)
+
+    arrays = {'tempos': np.asarray(base.alocador.tempos_deslocamento, dtype=np.float64)}
+    for nome in PARAMETROS:
+        arrays[nome] = np.asarray(cenarios[nome], dtype=np.float64)
+    num_execucoes = len(arrays['capacidades'])
+    if (arrays['capacidades'].shape[1] != num_postos or arrays['areas_iniciais'].shape[1] != num_focos
+            or arrays['fatores_crescimento'].shape[1] != num_focos):
+        raise ValueError("Cenários não correspondem ao número de focos e postos da rede")
+
+    config = {'max_dias': max_dias, 'motor': motor}
+    processos = min(processos or os.cpu_count() or 1, max(1, num_execucoes))
+    if processos == 1:
+        saida = _executar_cenarios(arrays, config, range(num_execucoes))
+        return agregar_resultados(saida, focos_ids)
+
+    memorias = []
+    try:
+        blocos = {}
+        for nome, array in arrays.items():
+            memoria = shared_memory.SharedMemory(create=True, size=max(1, array.nbytes))
+            memorias.append(memoria)
+            np.ndarray(array.shape, dtype=np.float64, buffer=memoria.buf)[...] = array
+            blocos[nome] = (memoria.name, array.shape)
+
+        tamanho_lote = max(1, num_execucoes // (4 * processos))
+        lotes = [range(i, min(i + tamanho_lote, num_execucoes))
+                 for i in range(0, num_execucoes, tamanho_lote)]
+        with ProcessPoolExecutor(max_workers=processos, initializer=_inicializar_trabalhador,
+                                 initargs=(blocos, config)) as executor:
+            saida = [r for parte in executor.map(_executar_cenarios_trabalhador, lotes) for r in parte]
+    finally:
+        for memoria in memorias:
+            memoria.close()
+            memoria.unlink()
+
+    return agregar_resultados(saida, focos_ids)
+
+
+def agregar_resultados(saida: List[tuple], focos_ids: List[str]) -> Dict:
+    """
+    Resume as execuções.
+
+    Returns:
+        {
+            'execucoes': int,
+            'taxa_falha': float,                 # fração sem extinção total
+            'dias_totais': np.ndarray,           # dias simulados por execução
+            'dias_extincao': {                   # só execuções com sucesso
+                'media', 'mediana', 'p90', 'minimo', 'maximo': float,
+                'histograma': Dict[int, int]
+            },
+            'prob_extincao_foco': Dict[str, float]
+        }
+    """
+    sucessos = np.array([s for s, _, _ in saida], dtype=bool)
+    dias = np.array([d for _, d, _ in saida], dtype=np.int64)
+    extintos = np.array([e for _, _, e in saida], dtype=bool).reshape(len(saida), len(focos_ids))
+
+    dias_sucesso = dias[sucessos]
+    if dias_sucesso.size:
+        valores, contagens = np.unique(dias_sucesso, return_counts=True)
+        dias_extincao = {
+            'media': float(dias_sucesso.mean()),
+            'mediana': float(np.median(dias_sucesso)),
+            'p90': float(np.percentile(dias_sucesso, 90)),
+            'minimo': float(dias_sucesso.min()),
+            'maximo': float(dias_sucesso.max()),
+            'histograma': dict(zip(valores.tolist(), contagens.tolist())),
+        }
+    else:
+        dias_extincao = {'media': None, 'mediana': None, 'p90': None,
+                         'minimo': None, 'maximo': None, 'histograma': {}}
+
+    probabilidades = extintos.mean(axis=0) if len(saida) else np.zeros(len(focos_ids))
+    return {
+        'execucoes': len(saida),
+        'taxa_falha': float(1.0 - sucessos.mean()) if len(saida) else 0.0,
+        'dias_totais': dias,
+        'dias_extincao': dias_extincao,
+        'prob_extincao_foco': dict(zip(focos_ids, probabilidades.tolist())),
+    }
@@ -1,93 +1,290 @@
-from typing import List
+from typing import Dict, Iterable, List, Optional
 
 import networkx as nx
-import matplotlib.pyplot as plt
+import numpy as np
+import matplotlib
+import matplotlib.style
+# Figuras desenhadas direto num canvas Agg: só geram arquivos, sem mexer no backend global do pyplot
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.collections import LineCollection
+from matplotlib.figure import Figure
 
+from entidades.historico import HistoricoSimulacao
+from servicos.cache_tempos import CacheTempos
+from servicos.grafo import hash_grafo
 
-def visualizar_grafo(num_focos: int, num_postos: int, 
-                     matriz_distancias: List[List[float]], 
-                     nome_arquivo: str = 'e'):
+CORES_NOS = {'foco': '#e74c3c', 'posto': '#3498db'}  # Vermelho, Azul
+COR_EXTINTO = '#95a5a6'
+COR_ALOCACAO = '#f39c12'
+
+LIMIAR_GRANDE = 300            # nós a partir dos quais o modo 'auto' usa o desenho para redes grandes
+LIMIAR_ROTULOS_NOS = 150       # no modo grande, acima disso os nós ficam sem nome
+LIMIAR_ROTULOS_ARESTAS = 100   # no modo grande, acima disso as arestas ficam sem o peso escrito
+ALGORITMOS_LAYOUT = ('spring', 'spectral', 'aleatorio')
+# Layouts num cache próprio: no dos tempos, desenhar poderia tirar matrizes do limite de tamanho
+DIRETORIO_CACHE_LAYOUT = 'outputs/cache/layouts'
+LIMITE_CACHE_LAYOUT = 64 * 1024 ** 2
+
+
+def _aplicar_estilo() -> None:
+    # Condição pra se seaborn tiver disponível pq por algum motivo quebrou
+    if 'seaborn' in matplotlib.style.available:
+        matplotlib.style.use('seaborn')
+    else:
+        matplotlib.style.use('default')
+        matplotlib.rcParams.update({
+            'figure.facecolor': 'white',
+            'axes.edgecolor': '0.3',
+            'axes.labelcolor': '0.3',
+            'text.color': '0.3'
+        })
+
+
+def criar_cache_layout() -> CacheTempos:
+    """Cache em disco das posições dos nós, separado do cache de tempos de deslocamento."""
+    return CacheTempos(DIRETORIO_CACHE_LAYOUT, limite_bytes=LIMITE_CACHE_LAYOUT)
+
+
+def _figura(grande: bool):
+    """Figura e eixos num canvas Agg próprio."""
+    fig = Figure(figsize=(10, 8) if not grande else (16, 13))
+    FigureCanvasAgg(fig)
+    return fig, fig.subplots()
+
+
+def _modo_grande(G: nx.Graph, modo: str) -> bool:
+    if modo not in ('auto', 'detalhado', 'grande'):
+        raise ValueError(f"Modo de visualização inválido '{modo}' - opções: auto, detalhado, grande")
+    return modo == 'grande' or (modo == 'auto' and G.number_of_nodes() >= LIMIAR_GRANDE)
+
+
+def calcular_layout(G: nx.Graph, algoritmo: str = 'spring',
+                    cache: Optional[CacheTempos] = None) -> Dict[str, np.ndarray]:
     """
-    Gera uma visualização do grafo, altera nome
-    
+    Calcula as posições dos nós, reaproveitando o cache se a mesma rede já foi desenhada.
+
     Args:
-        num_focos: Número de focos de incêndio
-        num_postos: Número de postos de brigadistas
-        matriz_distancias: Matriz de distâncias entre os nós
-        nome_arquivo: Nome alterável
+        G: Grafo da rede
+        algoritmo: 'spring' (força, lento em redes grandes), 'spectral' (autovetores do
+                   laplaciano, rápido) ou 'aleatorio'
+        cache: Cache em disco (ver criar_cache_layout); a chave é o hash da rede, a ordem dos
+               nós e o algoritmo
+
+    Returns:
+        Posição (x, y) de cada nó
     """
-    try:
-        # Condição pra se seaborn tiver disponível pq por algum motivo quebrou
-        if 'seaborn' in plt.style.available:
-            plt.style.use('seaborn')
-        else:
-            plt.style.use('default')  
-            plt.rcParams.update({
-                'figure.facecolor': 'white',
-                'axes.edgecolor': '0.3',
-                'axes.labelcolor': '0.3',
-                'text.color': '0.3'
-            })
-
-        G = nx.Graph()
-        
-        #cor dos nós
-        for i in range(0, num_focos):
-            G.add_node(f'f{i}', tipo='foco', color='#e74c3c')  # Vermelho
-        for i in range(0, num_postos):
-            G.add_node(f'b{i}', tipo='posto', color='#3498db')  # Azul
-        
-        # arestas
-        todos_nos = [f'f{i}' for i in range(0, num_focos)] + [f'b{i}' for i in range(0, num_postos)]
-        for i in range(len(todos_nos)):
-            for j in range(len(todos_nos)):
-                if matriz_distancias[i][j] > 0:
-                    G.add_edge(todos_nos[i], todos_nos[j], weight=matriz_distancias[i][j])
-        
+    if algoritmo not in ALGORITMOS_LAYOUT:
+        raise ValueError(f"Algoritmo de layout inválido '{algoritmo}' - "
+                         f"opções: {', '.join(ALGORITMOS_LAYOUT)}")
+    nos = list(G.nodes)
+    chave = None
+    if cache is not None:
+        h = hash_grafo(G)
+        h.update('\n'.join(map(str, nos)).encode())
+        h.update(algoritmo.encode())
+        chave = 'layout-' + h.hexdigest()
+        posicoes = cache.carregar(chave)
+        if posicoes is not None and posicoes.shape == (len(nos), 2):
+            return dict(zip(nos, np.array(posicoes)))
+
+    if algoritmo == 'spring':
         pos = nx.spring_layout(G, seed=42, k=0.8)
-        
-        fig, ax = plt.subplots(figsize=(10, 8))
-        
-        nx.draw_networkx_nodes(G, pos, ax=ax,
-                               node_color=[G.nodes[n]['color'] for n in G.nodes()],
-                               node_size=800,
-                               edgecolors='#2c3e50',
-                               linewidths=1.5)
-        
-        nx.draw_networkx_labels(G, pos, ax=ax,
-                                labels={n: n.upper() for n in G.nodes()},
-                                font_size=12,
-                                font_weight='bold',
-                                font_family='sans-serif')
-        
+    elif algoritmo == 'spectral':
+        try:
+            # Sem pesos: eles são distâncias, não intensidade de ligação
+            pos = _espalhar(nx.spectral_layout(G, weight=None))
+        except ImportError:
+            # Redes grandes usam o scipy no spectral_layout
+            print("scipy indisponível para o layout espectral; usando posições aleatórias")
+            pos = nx.random_layout(G, seed=42)
+    else:
+        pos = nx.random_layout(G, seed=42)
+
+    if chave is not None:
+        cache.salvar(chave, np.array([pos[n] for n in nos], dtype=np.float64).reshape(-1, 2))
+    return pos
+
+
+def _espalhar(pos: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    """
+    Troca cada coordenada pela sua posição relativa (rank) entre todos os nós.
+
+    Os autovetores do layout espectral costumam concentrar quase todos os nós num
+    ponto e jogar uns poucos para longe; pelo rank a ordem relativa é mantida e os
+    nós ocupam toda a figura.
+    """
+    nos = list(pos)
+    xy = np.array([pos[n] for n in nos], dtype=np.float64).reshape(-1, 2)
+    ranks = np.argsort(np.argsort(xy, axis=0, kind='stable'), axis=0)
+    xy = ranks / max(1, len(nos) - 1)
+    return dict(zip(nos, xy))
+
+
+def _segmentos(G: nx.Graph, pos: Dict[str, np.ndarray], arestas: Iterable[tuple]) -> np.ndarray:
+    indice = {n: i for i, n in enumerate(G.nodes)}
+    coordenadas = np.array([pos[n] for n in G.nodes], dtype=np.float64).reshape(-1, 2)
+    pares = np.array([(indice[u], indice[v]) for u, v in arestas], dtype=np.int64).reshape(-1, 2)
+    return coordenadas[pares]
+
+
+def _desenhar_rede(G: nx.Graph, pos: Dict[str, np.ndarray], ax, grande: bool) -> None:
+    """Desenha arestas e rótulos; no modo grande, arestas numa única LineCollection e rótulos só se couberem."""
+    if not grande:
         nx.draw_networkx_edges(G, pos, ax=ax,
                                width=2,
                                alpha=0.8,
                                edge_color='#7f8c8d')
-        
+    else:
+        ax.add_collection(LineCollection(_segmentos(G, pos, G.edges), colors='#7f8c8d',
+                                         linewidths=0.5, alpha=0.4, zorder=1))
+
+    if not grande or G.number_of_nodes() <= LIMIAR_ROTULOS_NOS:
+        nx.draw_networkx_labels(G, pos, ax=ax,
+                                labels={n: n.upper() for n in G.nodes()},
+                                font_size=12 if not grande else 6,
+                                font_weight='bold',
+                                font_family='sans-serif')
+
+    if not grande or G.number_of_edges() <= LIMIAR_ROTULOS_ARESTAS:
         nx.draw_networkx_edge_labels(G, pos, ax=ax,
                                      edge_labels=nx.get_edge_attributes(G, 'weight'),
                                      font_size=10,
                                      bbox=dict(facecolor='white', alpha=0.8, edgecolor='none'))
-        
+
+
+def _tamanho_no(G: nx.Graph, grande: bool) -> float:
+    return 800 if not grande else max(4.0, 800 * LIMIAR_ROTULOS_NOS / (4 * G.number_of_nodes()))
+
+
+def visualizar_grafo(G: nx.Graph, nome_arquivo: str = 'e', modo: str = 'auto',
+                     algoritmo: Optional[str] = None, cache_layout: Optional[CacheTempos] = None):
+    """
+    Gera uma visualização do grafo, altera nome
+
+    Args:
+        G: Grafo construído por servicos.grafo.construir_grafo (o mesmo da simulação)
+        nome_arquivo: Nome alterável
+        modo: 'detalhado' (nomes e pesos em tudo), 'grande' (arestas em lote, sem rótulos
+              acima dos limiares) ou 'auto' (grande a partir de LIMIAR_GRANDE nós)
+        algoritmo: Layout (ver calcular_layout); padrão 'spring', ou 'spectral' no modo grande
+        cache_layout: Cache em disco das posições dos nós (ver criar_cache_layout)
+    """
+    try:
+        grande = _modo_grande(G, modo)
+        _aplicar_estilo()
+
+        pos = calcular_layout(G, algoritmo or ('spectral' if grande else 'spring'), cache_layout)
+
+        fig, ax = _figura(grande)
+
+        nx.draw_networkx_nodes(G, pos, ax=ax,
+                               node_color=[CORES_NOS[G.nodes[n]['tipo']] for n in G.nodes()],
+                               node_size=_tamanho_no(G, grande),
+                               edgecolors='#2c3e50',
+                               linewidths=1.5 if not grande else 0.2)
+
+        _desenhar_rede(G, pos, ax, grande)
+        if grande:
+            ax.autoscale_view()
+            ax.set_xticks([])
+            ax.set_yticks([])
+
         # título e legenda resilientes
         ax.set_title(f"Rede de Combate - {nome_arquivo}", pad=20, fontsize=14)
-        fig.text(0.5, 0.02, 
-                 "FOCOS (vermelho) | POSTOS (azul)", 
+        fig.text(0.5, 0.02,
+                 "FOCOS (vermelho) | POSTOS (azul)",
                  ha='center',
                  bbox=dict(facecolor='#ecf0f1', alpha=0.7, boxstyle='round,pad=0.5'))
-           
+
         nome_saida = f"outputs/images/grafo_incendio_{nome_arquivo}.png"
         try:
-            plt.savefig(nome_saida, dpi=150, bbox_inches='tight')
+            fig.savefig(nome_saida, dpi=150, bbox_inches='tight')
             print(f"Gráfico salvo como {nome_saida}")
         except Exception as e:
             print(f"Erro ao salvar gráfico: {str(e)}")
             nome_saida = None
-        
-        plt.close()
         return nome_saida
-        
+
+    except Exception as e:
+        print(f"Erro para criar gráfico: {str(e)}")
+        return None
+
+
+def visualizar_dias(G: nx.Graph, historico: HistoricoSimulacao, nome_arquivo: str = 'e',
+                    dias: Optional[Iterable[int]] = None, modo: str = 'auto',
+                    algoritmo: Optional[str] = None,
+                    cache_layout: Optional[CacheTempos] = None) -> List[str]:
+    """
+    Gera uma imagem por dia com o estado da simulação.
+
+    O tamanho de cada foco é proporcional à raiz da sua área no fim do dia (focos
+    extintos em cinza) e as alocações do dia aparecem como linhas posto → foco. A
+    rede é desenhada uma só vez; a cada dia só os tamanhos, as cores e as linhas
+    de alocação são trocados antes de salvar.
+
+    Args:
+        G: Grafo da simulação
+        historico: HistoricoSimulacao do simulador
+        nome_arquivo: Base do nome das imagens (..._dia001.png, ...)
+        dias: Dias a desenhar (padrão: 0 até o último dia simulado)
+        modo, algoritmo, cache_layout: Como em visualizar_grafo
+
+    Returns:
+        Caminhos das imagens salvas
+    """
+    salvos = []
+    try:
+        grande = _modo_grande(G, modo)
+        _aplicar_estilo()
+        pos = calcular_layout(G, algoritmo or ('spectral' if grande else 'spring'), cache_layout)
+
+        xy_focos = np.array([pos[n] for n in historico.focos_ids], dtype=np.float64).reshape(-1, 2)
+        xy_postos = np.array([pos[n] for n in historico.postos_ids], dtype=np.float64).reshape(-1, 2)
+
+        areas = historico.areas_numpy()
+        referencia = float(np.nanmax(areas[0])) if areas.size and not np.isnan(areas[0]).all() else 0.0
+        referencia = referencia if referencia > 0 else 1.0
+        tamanho_base = _tamanho_no(G, grande)
+
+        fig, ax = _figura(grande)
+        _desenhar_rede(G, pos, ax, grande)
+        ax.scatter(xy_postos[:, 0], xy_postos[:, 1], s=tamanho_base,
+                   c=CORES_NOS['posto'], edgecolors='#2c3e50', linewidths=0.5, zorder=2)
+        pontos_focos = ax.scatter(xy_focos[:, 0], xy_focos[:, 1], s=tamanho_base,
+                                  c=CORES_NOS['foco'], edgecolors='#2c3e50', linewidths=0.5, zorder=2.5)
+        linhas_alocacao = LineCollection([], colors=COR_ALOCACAO, linewidths=1.5 if not grande else 0.4,
+                                         alpha=0.9 if not grande else 0.6, zorder=1.5)
+        ax.add_collection(linhas_alocacao)
+        ax.autoscale_view()
+        ax.set_xticks([])
+        ax.set_yticks([])
+        titulo = ax.set_title("", pad=20, fontsize=14)
+
+        primeiro = historico.primeiro_dia  # dias anteriores descartados pela retenção do histórico
+        for dia in (range(primeiro, primeiro + len(areas)) if dias is None else dias):
+            if not primeiro <= dia < primeiro + len(areas):
+                continue
+            area_dia = areas[dia - primeiro]
+            extintos = np.isnan(area_dia)
+            escala = np.sqrt(np.nan_to_num(area_dia, nan=0.0) / referencia)
+            pontos_focos.set_sizes(np.where(extintos, tamanho_base * 0.3,
+                                            np.clip(tamanho_base * escala, 2.0, tamanho_base * 6)))
+            pontos_focos.set_facecolors([COR_EXTINTO if e else CORES_NOS['foco'] for e in extintos])
+
+            alocacoes = historico.alocacoes_do_dia(dia)
+            linhas_alocacao.set_segments(np.stack((xy_postos[alocacoes['posto']],
+                                                   xy_focos[alocacoes['foco']]), axis=1))
+
+            ativos = int((~extintos).sum())
+            titulo.set_text(f"Rede de Combate - {nome_arquivo} - dia {dia} ({ativos} focos ativos)")
+            nome_saida = f"outputs/images/grafo_incendio_{nome_arquivo}_dia{dia:03d}.png"
+            try:
+                fig.savefig(nome_saida, dpi=100 if grande else 150)
+                salvos.append(nome_saida)
+            except Exception as e:
+                print(f"Erro ao salvar gráfico: {str(e)}")
+        if salvos:
+            print(f"{len(salvos)} gráficos diários salvos em outputs/images")
     except Exception as e:
         print(f"Erro para criar gráfico: {str(e)}")
-        return None
\ No newline at end of file
+    return salvos
@@ -0,0 +1,36 @@
+import asyncio
+import sys
+from servicos.cache_tempos import CacheTempos
+from servicos.servidor import servir
+from utils.linha_comando import LinhaComando
+
+USO = ("Uso: python servidor.py [--host 127.0.0.1] [--porta 8765] [--unix caminho.sock] "
+       "[--redes-residentes 4] [--simultaneas N] [--raiz diretorio] [--sem-cache] "
+       "[--precarregar rede1.txt,rede2.txt] [--arestas]")
+
+
+def main():
+    if '--ajuda' in sys.argv[1:]:
+        print(USO)
+        sys.exit(0)
+
+    argumentos = LinhaComando(USO)
+    arestas = '--arestas' in sys.argv[1:]
+    precarregar = [(caminho, arestas) for caminho in argumentos.valor('--precarregar', '').split(',') if caminho]
+    try:
+        asyncio.run(servir(
+            host=argumentos.valor('--host', '127.0.0.1'),
+            porta=argumentos.inteiro('--porta', 8765, minimo=0),
+            socket_unix=argumentos.valor('--unix'),
+            precarregar=precarregar,
+            limite=argumentos.inteiro('--redes-residentes', 4, minimo=1),
+            raiz=argumentos.valor('--raiz', '.'),
+            cache_tempos=None if '--sem-cache' in sys.argv[1:] else CacheTempos(),
+            simultaneas=argumentos.inteiro('--simultaneas', minimo=1),
+        ))
+    except KeyboardInterrupt:
+        print("Servidor encerrado")
+
+
+if __name__ == '__main__':
+    main()
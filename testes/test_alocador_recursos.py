@@ -0,0 +1,37 @@
+import networkx as nx
+import numpy as np
+
+from servicos.alocador_recursos import LIMIAR_PARALELO, AlocadorRecursos
+from servicos.simulador import SimuladorIncendios
+from utils.gerador_instancias import GeradorInstancias
+
+
+def simulador_carregado(num_focos: int, num_postos: int, semente: int = 0) -> SimuladorIncendios:
+    simulador = SimuladorIncendios(max_dias=1, processos=1)
+    simulador.carregar_dados(*GeradorInstancias.gerar(num_focos, num_postos, distancias=('uniforme', 1.0, 6.0),
+                                                      semente=semente))
+    return simulador
+
+
+def test_tempos_iguais_ao_dijkstra_completo_dentro_do_limite():
+    simulador = simulador_carregado(40, 6)
+    tempos = simulador.alocador.tempos_deslocamento
+    todos = dict(nx.all_pairs_dijkstra_path_length(simulador.grafo, weight='weight'))
+
+    alem_do_limite = 0
+    for i, posto in enumerate(simulador.mapa_postos.values()):
+        for j, foco_id in enumerate(simulador.mapa_focos):
+            distancia = todos[posto.id].get(foco_id, np.inf)
+            if distancia <= posto.tempo_trabalho_diario:
+                assert tempos[i, j] == distancia
+            else:
+                assert tempos[i, j] == np.inf
+                alem_do_limite += 1
+    assert alem_do_limite > 0
+
+
+def test_buscas_em_processos_iguais_as_seriais():
+    simulador = simulador_carregado(60, LIMIAR_PARALELO)
+    paralelo = AlocadorRecursos(simulador.mapa_focos, simulador.mapa_postos, simulador.grafo,
+                                processos=2)
+    np.testing.assert_array_equal(paralelo.tempos_deslocamento, simulador.alocador.tempos_deslocamento)
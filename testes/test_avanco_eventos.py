@@ -0,0 +1,58 @@
+import numpy as np
+import pytest
+
+from servicos.simulador import SimuladorIncendios
+from utils.gerador_instancias import GeradorInstancias
+
+# Dois focos em componentes separadas, cada um combatido por um posto que o reduz
+# um pouco por dia: um único salto longo que termina nas extinções
+DOIS_FOCOS = (2, 2, [20.0, 9.0], [10000.0, 4000.0], [1.01, 1.02],
+              [[0, 0, 1, 0], [0, 0, 0, 2], [1, 0, 0, 0], [0, 2, 0, 0]])
+
+
+def instancia_estavel(semente: int = 0):
+    """Focos de crescimento lento e postos fracos: longos trechos estáveis, com vários saltos."""
+    return GeradorInstancias.gerar(30, 8, capacidades=('constante', 0.5), fatores=('uniforme', 1.0, 1.05),
+                                   semente=semente)
+
+
+def simular(dados, **opcoes) -> SimuladorIncendios:
+    simulador = SimuladorIncendios(max_dias=400, processos=1, **opcoes)
+    simulador.carregar_dados(*dados)
+    simulador.simular()
+    return simulador
+
+
+@pytest.mark.parametrize('dados', [DOIS_FOCOS, instancia_estavel(0), instancia_estavel(4)])
+def test_eventos_igual_ao_dia_a_dia_dentro_do_arredondamento(dados):
+    dia_a_dia = simular(dados)
+    eventos = simular(dados, avanco_eventos=True)
+    assert max(salto['dias'] for salto in eventos.eventos.saltos) > 10
+
+    resultados, esperados = eventos.gerar_resultados(), dia_a_dia.gerar_resultados()
+    assert resultados['focos_ativos'] == pytest.approx(esperados['focos_ativos'], rel=1e-4)
+    del resultados['focos_ativos'], esperados['focos_ativos']
+    assert resultados == esperados
+
+    for dia in range(1, dia_a_dia.dia_atual + 1):
+        estado, esperado = eventos.estado_dia(dia), dia_a_dia.estado_dia(dia)
+        assert estado['focos_ativos'] == esperado['focos_ativos']
+        # Áreas: só o arredondamento diário de 4 casas, que a forma fechada não aplica
+        np.testing.assert_allclose(estado['areas'], esperado['areas'], rtol=1e-4, atol=1e-3)
+        for coluna in ('posto', 'foco'):
+            np.testing.assert_array_equal(estado['alocacoes'][coluna], esperado['alocacoes'][coluna])
+        np.testing.assert_allclose(estado['alocacoes']['capacidade_alocada'],
+                                   esperado['alocacoes']['capacidade_alocada'], rtol=1e-4)
+
+
+def test_saltos_seguem_a_retencao_do_historico():
+    simulador = SimuladorIncendios(max_dias=400, processos=1, avanco_eventos=True, retencao_historico=5)
+    simulador.carregar_dados(*instancia_estavel())
+    dias_saltados = 0
+    for estado in simulador.simular_dias():
+        primeiro_dia = simulador.historico.primeiro_dia
+        assert all(salto['dia_inicio'] + salto['dias'] > primeiro_dia for salto in simulador.eventos.saltos)
+        assert len(simulador.eventos.saltos) <= 5  # cada salto tem ao menos 2 dias
+        dias_saltados = max(dias_saltados, max((s['dias'] for s in simulador.eventos.saltos), default=0))
+    assert simulador.dia_atual == 400
+    assert dias_saltados > 5  # houve saltos maiores que a janela retida
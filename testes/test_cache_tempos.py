@@ -0,0 +1,88 @@
+import os
+
+import numpy as np
+
+from servicos.cache_tempos import CacheTempos
+from servicos.grafo import construir_grafo
+from servicos.simulador import SimuladorIncendios
+from testes.test_simulador import alocacoes
+from utils.gerador_instancias import GeradorInstancias
+
+
+def simular(dados, cache: CacheTempos) -> SimuladorIncendios:
+    simulador = SimuladorIncendios(max_dias=20, processos=1, cache_tempos=cache)
+    simulador.carregar_dados(*dados)
+    simulador.simular()
+    return simulador
+
+
+def sem_dijkstra(*args):
+    raise AssertionError("tempos deveriam vir do cache")
+
+
+def test_carregar_sem_arquivo_ou_com_arquivo_corrompido(tmp_path):
+    cache = CacheTempos(str(tmp_path))
+    assert cache.carregar('ausente') is None
+    (tmp_path / 'corrompido.npy').write_bytes(b'nao e um npy')
+    assert cache.carregar('corrompido') is None
+
+
+def test_salvar_e_carregar(tmp_path):
+    cache = CacheTempos(str(tmp_path / 'cache'))
+    tempos = np.array([[1.0, np.inf], [2.5, 3.0]])
+    cache.salvar('chave', tempos)
+    carregados = cache.carregar('chave')
+    np.testing.assert_array_equal(carregados, tempos)
+    assert not carregados.flags.writeable
+    assert list((tmp_path / 'cache').iterdir()) == [tmp_path / 'cache' / 'chave.npy']
+
+
+def test_segunda_simulacao_usa_o_cache_e_capacidades_nao_mudam_a_chave(tmp_path, monkeypatch):
+    cache = CacheTempos(str(tmp_path))
+    dados = GeradorInstancias.gerar(30, 8, semente=0)
+    primeira = simular(dados, cache)
+    assert len(list(tmp_path.glob('*.npy'))) == 1
+
+    monkeypatch.setattr('servicos.alocador_recursos._tempos_do_posto', sem_dijkstra)
+    segunda = simular(dados, cache)
+    assert alocacoes(segunda) == alocacoes(primeira)
+    np.testing.assert_array_equal(segunda.alocador.tempos_deslocamento,
+                                  primeira.alocador.tempos_deslocamento)
+
+    outras_capacidades = (dados[0], dados[1], [c * 2 for c in dados[2]], *dados[3:])
+    simular(outras_capacidades, cache)
+    assert len(list(tmp_path.glob('*.npy'))) == 1
+
+
+def test_chave_muda_com_a_rede_e_os_limites():
+    cache = CacheTempos()
+    dados = GeradorInstancias.gerar(10, 3, semente=0)
+    grafo = construir_grafo(*dados[:2], dados[5])
+    focos, postos = [f'f{i}' for i in range(10)], [f'b{i}' for i in range(3)]
+    chave = cache.chave(grafo, focos, postos, [12.0] * 3)
+
+    assert cache.chave(grafo.copy(), focos, postos, [12.0] * 3) == chave
+    assert cache.chave(grafo, focos, postos, [10.0] * 3) != chave
+    u, v = next(iter(grafo.edges))
+    grafo[u][v]['weight'] += 1.0
+    assert cache.chave(grafo, focos, postos, [12.0] * 3) != chave
+
+
+def test_limite_remove_o_usado_ha_mais_tempo(tmp_path):
+    tempos = np.zeros((10, 10))
+    cache = CacheTempos(str(tmp_path))
+    cache.salvar('a', tempos)
+    cache.limite_bytes = 2 * (tmp_path / 'a.npy').stat().st_size
+    cache.salvar('b', tempos)
+    os.utime(tmp_path / 'a.npy', (1000, 1000))
+    os.utime(tmp_path / 'b.npy', (2000, 2000))
+
+    assert cache.carregar('a') is not None  # 'a' passa a ser o mais recente
+    cache.salvar('c', tempos)
+    assert sorted(p.stem for p in tmp_path.glob('*.npy')) == ['a', 'c']
+
+
+def test_limite_menor_que_uma_matriz_nao_guarda_nada(tmp_path):
+    cache = CacheTempos(str(tmp_path), limite_bytes=1)
+    cache.salvar('a', np.zeros((3, 3)))
+    assert cache.carregar('a') is None
@@ -0,0 +1,51 @@
+import networkx as nx
+import numpy as np
+
+from servicos.grafo import construir_grafo, nomes_nos
+from servicos.simulador import SimuladorIncendios
+from utils.gerador_instancias import GeradorInstancias
+
+
+def grafo_celula_a_celula(num_focos: int, num_postos: int, matriz) -> nx.Graph:
+    """Construção original: percorre a matriz inteira, uma aresta por célula positiva."""
+    nomes = nomes_nos(num_focos, num_postos)
+    grafo = nx.Graph()
+    grafo.add_nodes_from(nomes[:num_focos], tipo='foco')
+    grafo.add_nodes_from(nomes[num_focos:], tipo='posto')
+    for i in range(len(nomes)):
+        for j in range(len(nomes)):
+            if matriz[i][j] > 0:
+                grafo.add_edge(nomes[i], nomes[j], weight=matriz[i][j])
+    return grafo
+
+
+def assert_mesmo_grafo(grafo, esperado):
+    assert dict(grafo.nodes(data='tipo')) == dict(esperado.nodes(data='tipo'))
+    assert ({frozenset((u, v)): w for u, v, w in grafo.edges(data='weight')} ==
+            {frozenset((u, v)): w for u, v, w in esperado.edges(data='weight')})
+
+
+def test_grafo_igual_ao_construido_celula_a_celula():
+    rng = np.random.default_rng(0)
+    matriz = rng.uniform(0.5, 5.0, (25, 25))
+    matriz[rng.random((25, 25)) < 0.7] = 0.0
+    matriz[rng.random((25, 25)) < 0.05] = -1.0
+    # Assimétrica de propósito: vale o valor de baixo da diagonal
+    assert_mesmo_grafo(construir_grafo(20, 5, matriz), grafo_celula_a_celula(20, 5, matriz))
+    assert_mesmo_grafo(construir_grafo(20, 5, matriz.tolist()), grafo_celula_a_celula(20, 5, matriz))
+
+
+def test_nos_isolados_continuam_no_grafo():
+    matriz = np.zeros((4, 4))
+    matriz[0, 3] = matriz[3, 0] = 2.0
+    grafo = construir_grafo(2, 2, matriz)
+    assert set(grafo.nodes) == {'f0', 'f1', 'b0', 'b1'}
+    assert list(grafo.edges(data='weight')) == [('f0', 'b1', 2.0)]
+
+
+def test_simulador_usa_o_grafo_recebido():
+    dados = GeradorInstancias.gerar(20, 5, semente=0)
+    grafo = construir_grafo(*dados[:2], dados[5])
+    simulador = SimuladorIncendios(max_dias=5, processos=1)
+    simulador.carregar_dados(*dados, grafo=grafo)
+    assert simulador.grafo is grafo
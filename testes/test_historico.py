@@ -0,0 +1,94 @@
+import numpy as np
+import pytest
+
+from entidades.historico import HistoricoSimulacao
+from servicos.simulador import SimuladorIncendios
+from utils.gerador_instancias import GeradorInstancias
+
+
+def historico_de_tres_dias() -> HistoricoSimulacao:
+    """Dia 1 com duas alocações, dia 2 sem nenhuma, dia 3 com três; capacidade inicial pequena."""
+    historico = HistoricoSimulacao(['f0', 'f1'], ['b0', 'b1'], capacidade_inicial=2)
+    historico.registrar_areas(np.array([10.0, 20.0]))
+    historico.registrar_dia(1, np.array([0, 1]), np.array([1, 1]), np.array([1.0, 2.0]),
+                            np.array([10.0, 10.0]), np.array([10.0, 20.0]))
+    historico.registrar_areas(np.array([11.0, 0.5]))
+    historico.registrar_dia(2, np.array([], dtype=int), np.array([], dtype=int), np.array([]),
+                            np.array([]), np.array([]))
+    historico.registrar_areas(np.array([12.0, 0.6]))
+    historico.registrar_dia(3, np.array([0, 1, 1]), np.array([0, 0, 1]), np.array([0.5, 0.5, 0.1]),
+                            np.array([11.0, 11.0, 6.0]), np.array([5.5, 5.5, 0.6]))
+    historico.registrar_areas(np.array([1.0, np.nan]))
+    return historico
+
+
+def test_colunas_crescem_e_dias_sao_fatiados():
+    historico = historico_de_tres_dias()
+    assert len(historico) == 5 and historico.num_dias == 3
+    assert historico.colunas['posto'].dtype == np.int32
+
+    np.testing.assert_array_equal(historico.alocacoes_do_dia(1)['area_reduzida'], [10.0, 20.0])
+    assert len(historico.alocacoes_do_dia(2)['dia']) == 0
+    np.testing.assert_array_equal(historico.alocacoes_do_dia(3)['foco'], [0, 0, 1])
+    np.testing.assert_array_equal(historico.areas_do_dia(0), [10.0, 20.0])
+    np.testing.assert_array_equal(historico.areas_do_dia(3), [1.0, np.nan])
+
+    exportado = historico.para_numpy()
+    exportado['dia'][:] = 0
+    assert historico.colunas['dia'][0] == 1
+    assert historico.areas_numpy().shape == (4, 2)
+
+
+def test_repetir_dia():
+    historico = historico_de_tres_dias()
+    historico.repetir_dia(3, 4)
+    assert historico.num_dias == 7 and len(historico) == 5 + 3 * 4
+    for dia in range(4, 8):
+        historico.registrar_areas(np.array([1.0, np.nan]))
+        alocacoes = historico.alocacoes_do_dia(dia)
+        np.testing.assert_array_equal(alocacoes['dia'], [dia] * 3)
+        np.testing.assert_array_equal(alocacoes['capacidade_alocada'], [0.5, 0.5, 0.1])
+
+
+def test_descartar_ate_mantem_visoes_antigas():
+    historico = historico_de_tres_dias()
+    colunas, areas = historico.visoes()
+    historico.descartar_ate(2)
+
+    assert historico.primeiro_dia == 2 and len(historico) == 3
+    np.testing.assert_array_equal(historico.areas_do_dia(2), [12.0, 0.6])
+    np.testing.assert_array_equal(historico.alocacoes_do_dia(3)['posto'], [0, 1, 1])
+    for dia in (0, 1, 4):
+        with pytest.raises(ValueError):
+            historico.areas_do_dia(dia)
+    # Visões tiradas antes do descarte (ex.: snapshots) não mudam
+    assert len(colunas['dia']) == 5 and areas.shape == (4, 2)
+    np.testing.assert_array_equal(colunas['dia'], [1, 1, 3, 3, 3])
+
+    historico.descartar_ate(1)  # antes do primeiro dia: nada muda
+    assert historico.primeiro_dia == 2
+    historico.descartar_ate(10)  # depois do último: fica só a última linha de áreas
+    assert historico.primeiro_dia == 3 and len(historico) == 0
+    np.testing.assert_array_equal(historico.areas_do_dia(3), [1.0, np.nan])
+
+
+def test_historico_alocacoes_no_formato_antigo():
+    simulador = SimuladorIncendios(max_dias=15, processos=1)
+    simulador.carregar_dados(*GeradorInstancias.gerar(20, 5, semente=0))
+    simulador.simular()
+    dias = simulador.historico_alocacoes
+    assert len(dias) == simulador.dia_atual
+    assert sum(len(dia) for dia in dias) == len(simulador.historico)
+
+    colunas = simulador.historico.para_numpy()
+    postos, focos = list(simulador.mapa_postos.values()), list(simulador.mapa_focos.values())
+    k = 0
+    for numero, dia in enumerate(dias, 1):
+        for alocacao in dia:
+            assert colunas['dia'][k] == numero
+            assert alocacao['posto'] is postos[colunas['posto'][k]]
+            assert alocacao['foco'] is focos[colunas['foco'][k]]
+            assert alocacao['area_reduzida'] == colunas['area_reduzida'][k]
+            assert alocacao['area_reduzida'] == pytest.approx(
+                alocacao['capacidade_alocada'] * alocacao['tempo_combate'])
+            k += 1
@@ -0,0 +1,24 @@
+from pathlib import Path
+import os
+import subprocess
+import sys
+
+import medir_inicializacao
+
+RAIZ = Path(__file__).resolve().parent.parent
+
+
+def test_importar_main_nao_carrega_a_visualizacao():
+    assert medir_inicializacao.modulos_carregados() == []
+
+
+def test_main_sem_grafico_nao_carrega_a_visualizacao(tmp_path):
+    (tmp_path / 'outputs' / 'relatorios').mkdir(parents=True)
+    codigo = ("import runpy, sys; "
+              f"sys.argv = ['main.py', {str(RAIZ / 'tests' / 'edisciplinas.txt')!r}, '--sem-grafico', '--sem-cache']; "
+              f"runpy.run_path({str(RAIZ / 'main.py')!r}, run_name='__main__'); "
+              f"print([m for m in {medir_inicializacao.PROIBIDOS!r} if m in sys.modules])")
+    saida = subprocess.run([sys.executable, '-c', codigo], capture_output=True, text=True, check=True,
+                           cwd=tmp_path, env={**os.environ, 'PYTHONPATH': str(RAIZ)}).stdout
+    assert saida.splitlines()[-1] == '[]'
+    assert (tmp_path / 'outputs' / 'relatorios' / 'grafo_incendio_edisciplinas.txt').is_file()
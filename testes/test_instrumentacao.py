@@ -0,0 +1,104 @@
+import json
+
+import numpy as np
+import pytest
+
+from servicos.alocador_recursos import AlocadorRecursos
+from servicos.instrumentacao import Instrumentacao
+from servicos.simulador import SimuladorIncendios
+from testes.test_simulador import alocacoes
+from utils.gerador_instancias import GeradorInstancias
+
+
+def test_simuladores_sem_instrumentacao_nao_compartilham_estado():
+    dados = GeradorInstancias.gerar(10, 3, semente=0)
+    primeiro = SimuladorIncendios(max_dias=3, processos=1)
+    primeiro.carregar_dados(*dados)
+    primeiro.instrumentacao.registrar_gancho('dia', lambda evento, registro: None)
+
+    segundo = SimuladorIncendios(max_dias=3, processos=1)
+    segundo.carregar_dados(*dados)
+    assert segundo.instrumentacao is not primeiro.instrumentacao
+    assert not segundo.instrumentacao.ganchos['dia']
+    assert not segundo.instrumentacao.ativa
+    # O alocador e o simulador usam a mesma instância
+    assert segundo.alocador.instrumentacao is segundo.instrumentacao
+    alocador = AlocadorRecursos(segundo.mapa_focos, segundo.mapa_postos, segundo.grafo, processos=1)
+    assert alocador.instrumentacao is not segundo.instrumentacao
+
+
+def test_contadores_por_dia_batem_com_o_historico_e_os_totais(tmp_path):
+    instrumentacao = Instrumentacao()
+    simulador = SimuladorIncendios(max_dias=12, processos=1, instrumentacao=instrumentacao)
+    simulador.carregar_dados(*GeradorInstancias.gerar(20, 5, semente=0))
+    resultados = simulador.simular()
+
+    referencia = SimuladorIncendios(max_dias=12, processos=1)
+    referencia.carregar_dados(*GeradorInstancias.gerar(20, 5, semente=0))
+    assert referencia.simular() == resultados
+    assert alocacoes(referencia) == alocacoes(simulador)
+
+    assert [d['dia'] for d in instrumentacao.dias] == list(range(1, simulador.dia_atual + 1))
+    assert 'caminhos_minimos' in instrumentacao.preparacao
+    for registro in instrumentacao.dias:
+        dia = registro['dia']
+        assert registro['contadores'].get('alocacoes', 0) == len(simulador.historico.alocacoes_do_dia(dia)['dia'])
+        assert registro['contadores']['focos_ativos'] == \
+            int((~np.isnan(simulador.historico.areas_do_dia(dia - 1))).sum())
+        assert {'alocacao', 'combate', 'crescimento', 'registro'} <= set(registro['tempos'])
+        assert len(registro['utilizacao_postos']) == 5
+        assert all(0.0 <= u <= 1.0 for u in registro['utilizacao_postos'])
+    for nome, total in instrumentacao.contadores_totais.items():
+        assert total == sum(d['contadores'].get(nome, 0) for d in instrumentacao.dias)
+    assert instrumentacao.contadores_totais['alocacoes'] == len(simulador.historico)
+
+    caminho = instrumentacao.exportar_json(str(tmp_path / 'perfis' / 'perfil.json'))
+    with open(caminho, encoding='utf-8') as f:
+        assert json.load(f) == json.loads(json.dumps(instrumentacao.para_dict()))
+
+
+def test_ganchos_recebem_fases_e_dias():
+    instrumentacao = Instrumentacao()
+    eventos = []
+    instrumentacao.registrar_gancho('fase', lambda evento, dados: eventos.append((evento, dict(dados))))
+    instrumentacao.registrar_gancho('dia', lambda evento, dados: eventos.append((evento, dados)))
+    with pytest.raises(ValueError):
+        instrumentacao.registrar_gancho('semana', print)
+
+    simulador = SimuladorIncendios(max_dias=3, processos=1, instrumentacao=instrumentacao)
+    simulador.carregar_dados(*GeradorInstancias.gerar(20, 5, semente=0))
+    simulador.simular()
+
+    dias = [dados for evento, dados in eventos if evento == 'dia']
+    assert dias == instrumentacao.dias
+    fases = [dados for evento, dados in eventos if evento == 'fase']
+    assert fases[0] == {'dia': None, 'fase': 'caminhos_minimos', 'segundos': fases[0]['segundos']}
+    # As fases de um dia chegam antes do fim desse dia
+    dia_aberto = 1
+    for evento, dados in eventos[1:]:
+        assert dados['dia'] == dia_aberto
+        dia_aberto += evento == 'dia'
+
+
+def test_dias_saltados_no_avanco_por_eventos():
+    instrumentacao = Instrumentacao()
+    simulador = SimuladorIncendios(max_dias=400, processos=1, avanco_eventos=True,
+                                   instrumentacao=instrumentacao)
+    simulador.carregar_dados(*GeradorInstancias.gerar(30, 8, capacidades=('constante', 0.5),
+                                                      fatores=('uniforme', 1.0, 1.05), semente=0))
+    simulador.simular()
+    saltados = sum(salto['dias'] for salto in simulador.eventos.saltos)
+    assert saltados > 0
+    assert instrumentacao.contadores_totais['dias_saltados'] == saltados
+    # Só os dias executados um a um têm registro
+    assert len(instrumentacao.dias) == simulador.dia_atual - saltados
+
+
+def test_desligada_nao_registra_nada():
+    instrumentacao = Instrumentacao(ativa=False)
+    instrumentacao.iniciar_dia(1)
+    with instrumentacao.fase('alocacao'):
+        instrumentacao.contar('alocacoes', 3)
+    instrumentacao.finalizar_dia()
+    assert instrumentacao.para_dict() == {'tempos_totais': {}, 'contadores_totais': {}, 'preparacao': {},
+                                          'postos': [], 'utilizacao_media_postos': [], 'dias': []}
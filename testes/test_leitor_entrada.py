@@ -0,0 +1,113 @@
+import numpy as np
+import pytest
+
+from entidades.lista_arestas import ListaArestas
+from servicos.grafo import construir_grafo
+from servicos.simulador import SimuladorIncendios
+from testes.test_simulador import alocacoes
+from utils.gerador_instancias import GeradorInstancias
+from utils.leitor_entrada import LeitorEntrada
+
+EDISCIPLINAS = 'tests/edisciplinas.txt'
+
+
+def escrever(caminho, texto: str) -> str:
+    caminho.write_text(texto)
+    return str(caminho)
+
+
+def assert_mesma_instancia(dados, esperado):
+    assert dados[:5] == esperado[:5]
+    np.testing.assert_array_equal(dados[5], np.array(esperado[5]))
+
+
+@pytest.mark.parametrize('arquivo', [EDISCIPLINAS, 'gerado'])
+def test_mmap_le_a_mesma_instancia_que_a_leitura_de_texto(arquivo, tmp_path):
+    if arquivo == 'gerado':
+        arquivo = str(tmp_path / 'gerado.txt')
+        GeradorInstancias.salvar(GeradorInstancias.gerar(40, 10, semente=3), arquivo, formato='matriz')
+    dados = LeitorEntrada.ler_arquivo_mmap(arquivo)
+    assert dados[5].dtype == np.float64 and dados[5].flags['C_CONTIGUOUS']
+    assert_mesma_instancia(dados, LeitorEntrada.ler_arquivo(arquivo))
+
+
+def test_mmap_em_float32():
+    dados = LeitorEntrada.ler_arquivo_mmap(EDISCIPLINAS, dtype=np.float32)
+    assert dados[5].dtype == np.float32
+    assert_mesma_instancia(dados, LeitorEntrada.ler_arquivo(EDISCIPLINAS))
+
+
+def test_mmap_linha_que_o_numpy_rejeita_passa_pela_validacao_original(tmp_path):
+    # "3_0" é um float válido para o Python, mas não para np.fromstring
+    texto = open(EDISCIPLINAS).read().replace('0 3 1 3 0', '0 3_0 1 3 0\n\n')
+    arquivo = escrever(tmp_path / 'fallback.txt', texto)
+    dados = LeitorEntrada.ler_arquivo_mmap(arquivo)
+    assert dados[5][0, 1] == 30.0
+    assert_mesma_instancia(dados, LeitorEntrada.ler_arquivo(arquivo))
+
+
+@pytest.mark.parametrize('texto, mensagem', [
+    ('', 'Arquivo de entrada incorreto'),
+    ('2 3\n10 8 5\n100 87\n', 'Arquivo de entrada incorreto'),
+    ('2 x\n10 8 5\n100 87\n1.5 1.25\n', 'linha 1'),
+    ('2 3\n10 8 5\n100 87\n1.5 1.25\n0 3 1 3 0\n3 0 2 0 4\n', 'pelo menos 9 linhas'),
+    ('2 3\n10 8 5\n100 87\n1.5 1.25\n' + '0 1 2 3 4\n' * 4 + '0 1 2 3\n', 'linha 9 da matriz'),
+    ('2 3\n10 8 5\n100 87\n1.5 1.25\n' + '0 1 2 3 4\n' * 4 + '0 1 2 3 z\n', 'linha 9 da matriz'),
+])
+def test_mmap_rejeita_os_mesmos_arquivos(texto, mensagem, tmp_path, capsys):
+    arquivo = escrever(tmp_path / 'ruim.txt', texto)
+    assert LeitorEntrada.ler_arquivo(arquivo) is None
+    erro_texto = capsys.readouterr().err
+    assert LeitorEntrada.ler_arquivo_mmap(arquivo) is None
+    erro_mmap = capsys.readouterr().err
+    assert mensagem in erro_mmap
+    assert erro_mmap == erro_texto
+
+
+def test_mmap_arquivo_inexistente(tmp_path, capsys):
+    assert LeitorEntrada.ler_arquivo_mmap(str(tmp_path / 'nao_existe.txt')) is None
+    assert 'não encontrado' in capsys.readouterr().err
+
+
+def arestas(grafo) -> dict:
+    return {frozenset((u, v)): peso for u, v, peso in grafo.edges(data='weight')}
+
+
+@pytest.mark.parametrize('semente', [0, 1])
+def test_lista_de_arestas_simula_como_a_matriz(semente, tmp_path):
+    gerados = GeradorInstancias.gerar(40, 10, semente=semente)
+    GeradorInstancias.salvar(gerados, str(tmp_path / 'matriz.txt'), formato='matriz')
+    GeradorInstancias.salvar(gerados, str(tmp_path / 'arestas.txt'), formato='arestas')
+    matriz = LeitorEntrada.ler_arquivo(str(tmp_path / 'matriz.txt'))
+    lista = LeitorEntrada.ler_arquivo_arestas(str(tmp_path / 'arestas.txt'))
+
+    assert isinstance(lista[5], ListaArestas)
+    assert lista[:5] == matriz[:5]
+    assert arestas(construir_grafo(*lista[:2], lista[5])) == arestas(construir_grafo(*matriz[:2], matriz[5]))
+
+    resultados = []
+    for dados in (matriz, lista):
+        simulador = SimuladorIncendios(max_dias=30, processos=1)
+        simulador.carregar_dados(*dados)
+        resultados.append((simulador.simular(), alocacoes(simulador)))
+    assert resultados[0] == resultados[1]
+
+
+def test_arquivo_de_arestas_do_exemplo_igual_a_matriz():
+    lista = LeitorEntrada.ler_arquivo_arestas('tests/edisciplinas-arestas.txt')
+    matriz = LeitorEntrada.ler_arquivo(EDISCIPLINAS)
+    assert lista[:5] == matriz[:5]
+    assert arestas(construir_grafo(*lista[:2], lista[5])) == arestas(construir_grafo(*matriz[:2], matriz[5]))
+
+
+@pytest.mark.parametrize('arestas_texto, mensagem', [
+    ('0 1 3\n0 5 1\n', 'Índice de nó inválido'),
+    ('0 1 3\n-1 2 1\n', 'Índice de nó inválido'),
+    ('0 1 3\n0 1.5 1\n', 'Índice de nó inválido'),
+    ('0 1 3\n0 2\n', 'aresta 2'),
+    ('0 1 3\n0 2 x\n', 'aresta 2'),
+])
+def test_arestas_invalidas(arestas_texto, mensagem, tmp_path, capsys):
+    arquivo = escrever(tmp_path / 'ruim.txt', '2 3\n10 8 5\n100 87\n1.5 1.25\n' + arestas_texto)
+    assert LeitorEntrada.ler_arquivo_arestas(arquivo) is None
+    assert mensagem in capsys.readouterr().err
@@ -0,0 +1,39 @@
+import pytest
+
+from utils.linha_comando import LinhaComando
+
+USO = "Uso: python script.py [--n 1]"
+
+
+def opcoes(*argumentos) -> LinhaComando:
+    return LinhaComando(USO, list(argumentos))
+
+
+def test_valores_validos_e_padroes():
+    argumentos = opcoes('--n', '3', '--x', '0.5', '--lista', '2,4', '--modo', 'a', '--modos', 'a,b')
+    assert argumentos.inteiro('--n', minimo=1) == 3
+    assert argumentos.numero('--x', minimo=0) == 0.5
+    assert argumentos.inteiros('--lista', minimo=2) == [2, 4]
+    assert argumentos.escolha('--modo', ('a', 'b')) == 'a'
+    assert argumentos.escolhas('--modos', ('a', 'b')) == ['a', 'b']
+    assert argumentos.inteiro('--ausente', 7) == 7
+    assert argumentos.escolha('--ausente', ('a',), 'a') == 'a'
+
+
+@pytest.mark.parametrize('argumentos, leitura, mensagem', [
+    (['--n'], lambda a: a.inteiro('--n'), 'Falta o valor de --n'),
+    (['--n', '--x', '1'], lambda a: a.inteiro('--n'), 'Falta o valor de --n'),
+    (['--n', 'dois'], lambda a: a.inteiro('--n'), "--n espera um número inteiro, recebido 'dois'"),
+    (['--n', '0'], lambda a: a.inteiro('--n', minimo=1), '--n espera um inteiro de pelo menos 1'),
+    (['--n', '2,1'], lambda a: a.inteiros('--n', minimo=2), '--n espera valores de pelo menos 2'),
+    (['--x', '0'], lambda a: a.numero('--x', minimo=0), '--x espera um valor maior que 0'),
+    (['--x', 'abc'], lambda a: a.numero('--x'), "--x espera um número, recebido 'abc'"),
+    (['--m', 'a,c'], lambda a: a.escolhas('--m', ('a', 'b')), "Valor inválido 'c' para --m - opções: a, b"),
+    (['--m', 'a,b'], lambda a: a.escolha('--m', ('a', 'b')), '--m espera uma só opção'),
+])
+def test_valor_invalido_encerra_com_a_mensagem_e_o_uso(argumentos, leitura, mensagem, capsys):
+    with pytest.raises(SystemExit) as saida:
+        leitura(opcoes(*argumentos))
+    assert saida.value.code == 1
+    linhas = capsys.readouterr().out.splitlines()
+    assert linhas[0].startswith(mensagem) and linhas[1:] == [USO]
@@ -0,0 +1,54 @@
+from pathlib import Path
+import shutil
+
+import pytest
+
+from servicos.lote import executar_lote, listar_arquivos, tabela_resumo
+from servicos.simulador import SimuladorIncendios
+from utils.gerador_instancias import GeradorInstancias
+from utils.leitor_entrada import LeitorEntrada
+
+RAIZ = Path(__file__).resolve().parent.parent
+
+
+@pytest.fixture
+def entradas(tmp_path, monkeypatch):
+    """Diretório com duas entradas válidas e uma inválida; relatórios vão para tmp_path/outputs."""
+    (tmp_path / 'outputs' / 'relatorios').mkdir(parents=True)
+    (tmp_path / 'entradas').mkdir()
+    shutil.copy(RAIZ / 'tests' / 'edisciplinas.txt', tmp_path / 'entradas' / 'a_exemplo.txt')
+    GeradorInstancias.salvar(GeradorInstancias.gerar(30, 8, semente=0),
+                             str(tmp_path / 'entradas' / 'b_gerada.txt'), formato='matriz')
+    (tmp_path / 'entradas' / 'c_invalida.txt').write_text('2 3\n10 8 5\n')
+    monkeypatch.chdir(tmp_path)
+    return listar_arquivos('entradas')
+
+
+def sem_tempo(linhas: list) -> list:
+    return [{campo: valor for campo, valor in linha.items() if campo != 'tempo_s'} for linha in linhas]
+
+
+def test_lote_resume_cada_arquivo_como_uma_simulacao_isolada(entradas):
+    assert [p.name for p in entradas] == ['a_exemplo.txt', 'b_gerada.txt', 'c_invalida.txt']
+    linhas = executar_lote(entradas, max_dias=50, processos=1)
+
+    for linha, caminho in zip(linhas[:2], entradas):
+        simulador = SimuladorIncendios(max_dias=50, processos=1)
+        simulador.carregar_dados(*LeitorEntrada.ler_arquivo(str(caminho)))
+        resultados = simulador.simular()
+        assert linha['erro'] is None
+        assert (linha['sucesso'], linha['dias_totais'], linha['limite_atingido'], linha['focos_ativos']) == \
+            (resultados['sucesso'], resultados['dias_totais'], resultados['limite_atingido'],
+             len(resultados['focos_ativos']))
+        assert Path(f"outputs/relatorios/grafo_incendio_{caminho.stem}.txt").is_file()
+
+    assert linhas[2]['arquivo'] == 'c_invalida'
+    assert 'Arquivo de entrada incorreto' in linhas[2]['erro']
+    assert linhas[2]['dias_totais'] is None
+    assert 'ERRO' in tabela_resumo(linhas)
+
+
+def test_lote_em_processos_igual_ao_serial(entradas):
+    serial = executar_lote(entradas, max_dias=50, processos=1)
+    paralelo = executar_lote(entradas, max_dias=50, processos=2)
+    assert sem_tempo(paralelo) == sem_tempo(serial)
@@ -0,0 +1,81 @@
+import csv
+import io
+import json
+
+import pytest
+
+from servicos.simulador import SimuladorIncendios
+from utils.gerador_instancias import GeradorInstancias
+from utils.relatorio import GeradorRelatorio
+
+
+@pytest.fixture(scope='module')
+def simulador() -> SimuladorIncendios:
+    simulador = SimuladorIncendios(max_dias=15, processos=1)
+    simulador.carregar_dados(*GeradorInstancias.gerar(20, 5, semente=0))
+    simulador.simular()
+    return simulador
+
+
+def alocacoes_esperadas(simulador: SimuladorIncendios) -> list:
+    return [{'dia': dia, 'posto': a['posto'].id, 'foco': a['foco'].id,
+             'capacidade_alocada': a['capacidade_alocada'], 'tempo_combate': a['tempo_combate'],
+             'area_reduzida': a['area_reduzida']}
+            for dia, alocacoes in enumerate(simulador.historico_alocacoes, 1) for a in alocacoes]
+
+
+@pytest.mark.parametrize('tamanho_bloco', [GeradorRelatorio.TAMANHO_BLOCO, 7])
+def test_alocacoes_em_jsonl(simulador, tamanho_bloco, monkeypatch):
+    monkeypatch.setattr(GeradorRelatorio, 'TAMANHO_BLOCO', tamanho_bloco)
+    saida = io.StringIO()
+    GeradorRelatorio.escrever_alocacoes(saida, simulador.historico, 'jsonl')
+    registros = [json.loads(linha) for linha in saida.getvalue().splitlines()]
+    assert len(registros) > tamanho_bloco or tamanho_bloco > len(simulador.historico)
+    assert registros == alocacoes_esperadas(simulador)
+
+
+def test_alocacoes_em_csv(simulador):
+    saida = io.StringIO(newline='')
+    GeradorRelatorio.escrever_alocacoes(saida, simulador.historico, 'csv')
+    leitor = csv.DictReader(io.StringIO(saida.getvalue(), newline=''))
+    assert tuple(leitor.fieldnames) == GeradorRelatorio.CAMPOS_ALOCACOES
+    linhas = list(leitor)
+    esperadas = alocacoes_esperadas(simulador)
+    assert len(linhas) == len(esperadas)
+    for linha, esperada in zip(linhas, esperadas):
+        assert (int(linha['dia']), linha['posto'], linha['foco']) == \
+            (esperada['dia'], esperada['posto'], esperada['foco'])
+        # repr do float: o CSV relê exatamente o valor simulado
+        assert float(linha['area_reduzida']) == esperada['area_reduzida']
+
+
+def test_focos_em_csv_e_jsonl(simulador):
+    jsonl, csv_saida = io.StringIO(), io.StringIO(newline='')
+    GeradorRelatorio.escrever_focos(jsonl, simulador.mapa_focos, 'jsonl')
+    GeradorRelatorio.escrever_focos(csv_saida, simulador.mapa_focos, 'csv')
+    registros = [json.loads(linha) for linha in jsonl.getvalue().splitlines()]
+    linhas = list(csv.DictReader(io.StringIO(csv_saida.getvalue(), newline='')))
+
+    assert [r['foco'] for r in registros] == list(simulador.mapa_focos)
+    for registro, linha, foco in zip(registros, linhas, simulador.mapa_focos.values()):
+        assert registro['status'] == linha['status'] == foco.status
+        assert registro['area_atual'] == float(linha['area_atual']) == foco.area_atual
+        if foco.status == 'extinto':
+            assert registro['dia_extincao'] == int(linha['dia_extincao']) == foco.dia_extincao
+        else:
+            assert registro['dia_extincao'] is None and linha['dia_extincao'] == ''
+
+
+def test_gerar_relatorio_grava_os_formatos_pedidos(simulador, tmp_path, monkeypatch):
+    (tmp_path / 'outputs' / 'relatorios').mkdir(parents=True)
+    monkeypatch.chdir(tmp_path)
+    salvos = GeradorRelatorio.gerar_relatorio(simulador.gerar_resultados(), simulador.mapa_focos,
+                                              simulador.mapa_postos, simulador.historico,
+                                              nome_arquivo='x', formatos=['csv', 'jsonl'])
+    assert sorted(salvos) == ['outputs/relatorios/alocacoes_x.csv', 'outputs/relatorios/alocacoes_x.jsonl',
+                              'outputs/relatorios/focos_x.csv', 'outputs/relatorios/focos_x.jsonl']
+    # Arquivo CSV sem linhas em branco no meio (quebras de linha só do módulo csv)
+    assert '\r\r' not in (tmp_path / salvos[0]).read_bytes().decode()
+
+    with pytest.raises(ValueError):
+        GeradorRelatorio.gerar_relatorio({}, {}, {}, simulador.historico, formatos=['xml'])
@@ -0,0 +1,141 @@
+import asyncio
+import json
+
+import pytest
+
+from servicos.servidor import RedesResidentes, ServidorSimulacao
+from servicos.simulador import SimuladorIncendios
+from utils.gerador_instancias import GeradorInstancias
+
+REDES = {nome: GeradorInstancias.gerar(15, 4, semente=semente) for semente, nome in enumerate(('a.txt', 'b.txt'))}
+
+
+@pytest.fixture
+def raiz(tmp_path):
+    """Diretório das redes do servidor, com um arquivo fora dele (../fora.txt)."""
+    (tmp_path / 'redes').mkdir()
+    for nome, dados in REDES.items():
+        GeradorInstancias.salvar(dados, str(tmp_path / 'redes' / nome), formato='matriz')
+    GeradorInstancias.salvar(REDES['a.txt'], str(tmp_path / 'fora.txt'), formato='matriz')
+    return tmp_path / 'redes'
+
+
+async def pedir(leitor, escritor, metodo: str, rota: str, corpo=None, fechar: bool = False,
+                bruto: bytes = None):
+    dados = bruto if bruto is not None else b'' if corpo is None else json.dumps(corpo).encode()
+    escritor.write((f"{metodo} {rota} HTTP/1.1\r\nHost: teste\r\nContent-Length: {len(dados)}\r\n"
+                    f"{'Connection: close' + chr(13) + chr(10) if fechar else ''}\r\n").encode() + dados)
+    await escritor.drain()
+    return await ler_resposta(leitor)
+
+
+async def ler_resposta(leitor):
+    status = int((await leitor.readline()).split()[1])
+    cabecalhos = {}
+    while (linha := await leitor.readline()) != b'\r\n':
+        nome, _, valor = linha.decode().partition(':')
+        cabecalhos[nome.lower()] = valor.strip()
+    corpo = json.loads(await leitor.readexactly(int(cabecalhos['content-length'])))
+    return status, corpo, cabecalhos
+
+
+def conversar(redes: RedesResidentes, roteiro):
+    """Sobe o servidor numa porta livre e roda `roteiro(leitor, escritor)` numa conexão."""
+    async def principal():
+        servidor = ServidorSimulacao(redes)
+        aberto = await servidor.iniciar('127.0.0.1', 0)
+        async with aberto:
+            leitor, escritor = await asyncio.open_connection('127.0.0.1', aberto.sockets[0].getsockname()[1])
+            try:
+                return await roteiro(leitor, escritor)
+            finally:
+                escritor.close()
+    return asyncio.run(principal())
+
+
+def resultado_direto(dados, capacidades, max_dias: int) -> dict:
+    simulador = SimuladorIncendios(max_dias=max_dias, processos=1)
+    simulador.carregar_dados(dados[0], dados[1], capacidades, *dados[3:])
+    return json.loads(json.dumps(simulador.simular()))
+
+
+def test_simular_sobre_rede_residente_igual_a_simulacao_direta(raiz):
+    redes = RedesResidentes(raiz=str(raiz))
+    capacidades = [c * 1.5 for c in REDES['a.txt'][2]]
+
+    async def roteiro(leitor, escritor):
+        respostas = [await pedir(leitor, escritor, 'GET', '/saude')]
+        for corpo in ({'rede': 'a.txt', 'max_dias': 40},
+                      {'rede': 'a.txt', 'max_dias': 40, 'capacidades': capacidades},
+                      {'rede': 'a.txt', 'max_dias': 5, 'dias': True}):
+            respostas.append(await pedir(leitor, escritor, 'POST', '/simular', corpo))
+        return respostas
+
+    saude, padrao, outras_capacidades, por_dia = conversar(redes, roteiro)
+    assert saude[:2] == (200, {'status': 'ok', 'atendidas': 0})
+    for (status, corpo, _), esperado in ((padrao, resultado_direto(REDES['a.txt'], REDES['a.txt'][2], 40)),
+                                         (outras_capacidades, resultado_direto(REDES['a.txt'], capacidades, 40))):
+        assert status == 200
+        corpo.pop('tempo_s')
+        assert corpo == esperado
+    assert [d['dia'] for d in por_dia[1]['dias']] == list(range(1, por_dia[1]['dias_totais'] + 1))
+    # A rede foi lida e teve os caminhos mínimos calculados uma única vez
+    assert (redes.faltas, redes.acertos) == (1, 2)
+
+
+def test_redes_residentes_respeitam_o_limite(raiz):
+    redes = RedesResidentes(limite=1, raiz=str(raiz))
+
+    async def roteiro(leitor, escritor):
+        carregadas = [await pedir(leitor, escritor, 'POST', '/redes', {'rede': nome})
+                      for nome in ('a.txt', 'b.txt')]
+        return carregadas, await pedir(leitor, escritor, 'GET', '/redes')
+
+    carregadas, (status, descricao, _) = conversar(redes, roteiro)
+    assert [(s, c['rede'], c['focos']) for s, c, _ in carregadas] == [(200, 'a.txt', 15), (200, 'b.txt', 15)]
+    assert status == 200
+    assert [rede['rede'] for rede in descricao['redes']] == ['b.txt']
+    with pytest.raises(ValueError):
+        RedesResidentes(limite=0)
+
+
+@pytest.mark.parametrize('metodo, rota, corpo, status, mensagem', [
+    ('POST', '/simular', {'rede': '../fora.txt'}, 400, 'fora de'),
+    ('POST', '/simular', {'rede': '/etc/passwd'}, 400, 'fora de'),
+    ('POST', '/simular', {'rede': 'nao_existe.txt'}, 400, 'não encontrada'),
+    ('POST', '/simular', {'capacidades': [1.0]}, 400, "Informe 'rede'"),
+    ('POST', '/simular', {'rede': 'a.txt', 'capacidades': [1.0]}, 400, "'capacidades' deve ser uma lista com 4"),
+    ('POST', '/simular', {'rede': 'a.txt', 'max_dias': -1}, 400, 'max_dias'),
+    ('POST', '/simular', {'rede': 'a.txt', 'motor': 'outro'}, 400, ''),
+    ('POST', '/simular', b'{nao e json', 400, ''),
+    ('GET', '/simular', None, 405, 'POST'),
+    ('DELETE', '/redes', None, 405, 'GET ou POST'),
+    ('GET', '/outra', None, 404, '/outra'),
+])
+def test_erros_do_cliente(raiz, metodo, rota, corpo, status, mensagem):
+    async def roteiro(leitor, escritor):
+        bruto = corpo if isinstance(corpo, bytes) else None
+        resposta = await pedir(leitor, escritor, metodo, rota, None if bruto else corpo, bruto=bruto)
+        # A conexão continua atendendo depois do erro
+        return resposta, await pedir(leitor, escritor, 'GET', '/saude')
+
+    (recebido, resposta, _), (status_saude, _, _) = conversar(RedesResidentes(raiz=str(raiz)), roteiro)
+    assert recebido == status
+    assert mensagem in resposta['erro']
+    assert status_saude == 200
+
+
+def test_requisicao_malformada_e_connection_close(raiz):
+    async def roteiro(leitor, escritor):
+        _, _, cabecalhos = await pedir(leitor, escritor, 'GET', '/saude', fechar=True)
+        fechou = await leitor.read() == b''
+        outro_leitor, outro_escritor = await asyncio.open_connection(*escritor.get_extra_info('peername'))
+        outro_escritor.write(b'LIXO\r\n\r\n')
+        malformada = await ler_resposta(outro_leitor)
+        outro_escritor.close()
+        return cabecalhos, fechou, malformada
+
+    cabecalhos, fechou, (status, corpo, cabecalhos_erro) = conversar(RedesResidentes(raiz=str(raiz)), roteiro)
+    assert cabecalhos['connection'] == 'close' and fechou
+    assert status == 400 and 'inválida' in corpo['erro']
+    assert cabecalhos_erro['connection'] == 'close'
@@ -0,0 +1,141 @@
+import numpy as np
+import pytest
+
+from servicos.alocador_recursos import AlocadorRecursos
+from servicos.simulador import SimuladorIncendios
+from utils.gerador_instancias import GeradorInstancias
+
+
+def instancia(semente: int = 0, num_focos: int = 30, num_postos: int = 8, capacidade: float = 0.5):
+    """Instância que não se extingue em poucos dias (capacidades baixas)."""
+    return GeradorInstancias.gerar(num_focos, num_postos, capacidades=('constante', capacidade),
+                                   semente=semente)
+
+
+def tempos_recalculados(simulador: SimuladorIncendios) -> np.ndarray:
+    """Tempos posto x foco calculados do zero sobre o grafo atual do simulador."""
+    return AlocadorRecursos(simulador.mapa_focos, simulador.mapa_postos, simulador.grafo,
+                            processos=1).tempos_deslocamento
+
+
+def test_fork_nao_enxerga_alteracao_de_aresta_do_pai():
+    simulador = SimuladorIncendios(max_dias=10, processos=1)
+    simulador.carregar_dados(*instancia())
+    vizinho = next(iter(simulador.grafo['b0']))
+    simulador.agendar_alteracao_aresta(1, 'b0', vizinho, 0.01)
+    simulador.max_dias = 1
+    simulador.simular()
+    simulador.max_dias = 10
+
+    snapshot = simulador.snapshot()
+    ramo = simulador.fork()
+    tempos_dia_1 = np.array(ramo.alocador.tempos_deslocamento)
+
+    simulador.agendar_alteracao_aresta(2, 'b0', vizinho, None)
+    simulador.max_dias = 2
+    simulador.simular()
+
+    assert not np.array_equal(simulador.alocador.tempos_deslocamento, tempos_dia_1)
+    np.testing.assert_array_equal(ramo.alocador.tempos_deslocamento, tempos_dia_1)
+    np.testing.assert_array_equal(snapshot.tempos_deslocamento, tempos_dia_1)
+    assert ramo.grafo.has_edge('b0', vizinho)
+    np.testing.assert_allclose(ramo.alocador.tempos_deslocamento, tempos_recalculados(ramo), rtol=1e-12)
+
+
+def test_estado_dia_rejeita_dias_fora_do_historico():
+    simulador = SimuladorIncendios(max_dias=20, processos=1, retencao_historico=3)
+    simulador.carregar_dados(*instancia())
+    simulador.simular()
+    assert simulador.dia_atual == 20
+
+    for dia in (1, 2, 21, 23):
+        with pytest.raises(ValueError):
+            simulador.estado_dia(dia)
+    assert simulador.estado_dia(20)['focos_ativos'] > 0
+
+
+def test_fluxo_sem_scipy_falha_em_vez_de_usar_o_guloso(monkeypatch):
+    monkeypatch.setattr('servicos.alocador_fluxo.find_spec', lambda nome: None)
+    simulador = SimuladorIncendios(max_dias=5, processos=1, estrategia_alocacao='fluxo')
+    with pytest.raises(ValueError, match='scipy'):
+        simulador.carregar_dados(*instancia())
+
+
+def alocacoes(simulador: SimuladorIncendios) -> list:
+    """Alocações de cada dia como tuplas (posto, foco, capacidade, área reduzida)."""
+    return [[(a['posto'].id, a['foco'].id, a['capacidade_alocada'], a['area_reduzida']) for a in dia]
+            for dia in simulador.historico_alocacoes]
+
+
+def simular(dados: tuple, **opcoes) -> SimuladorIncendios:
+    simulador = SimuladorIncendios(max_dias=30, **{'processos': 1, **opcoes})
+    simulador.carregar_dados(*dados)
+    simulador.simular()
+    return simulador
+
+
+# Áreas pequenas se extinguem em poucos dias; as grandes chegam ao limite de dias
+AREAS = [('uniforme', 1.0, 30.0), ('uniforme', 5.0, 200.0)]
+
+
+@pytest.mark.parametrize('areas', AREAS)
+@pytest.mark.parametrize('semente', range(4))
+def test_motor_vetorizado_aloca_como_o_de_objetos(areas, semente):
+    dados = GeradorInstancias.gerar(20 + 10 * semente, 4 + 2 * semente, areas=areas, semente=semente)
+    referencia = simular(dados)
+    simulador = simular(dados, motor='vetorizado')
+
+    assert simulador.gerar_resultados() == referencia.gerar_resultados()
+    assert alocacoes(simulador) == alocacoes(referencia)
+
+
+@pytest.mark.parametrize('areas', AREAS)
+@pytest.mark.parametrize('semente', range(4))
+def test_prioridade_aloca_como_o_guloso(areas, semente):
+    dados = GeradorInstancias.gerar(20 + 10 * semente, 4 + 2 * semente, areas=areas, semente=semente)
+    referencia = simular(dados)
+    simulador = simular(dados, estrategia_alocacao='prioridade')
+
+    assert simulador.gerar_resultados() == referencia.gerar_resultados()
+    assert alocacoes(simulador) == alocacoes(referencia)
+
+
+@pytest.mark.parametrize('processos', [1, 2])
+@pytest.mark.parametrize('areas', AREAS)
+@pytest.mark.parametrize('semente', range(3))
+def test_simulacao_por_regioes_igual_a_serial(processos, areas, semente):
+    dados = GeradorInstancias.gerar(60, 15, areas=areas, semente=semente, regioes=4)
+    referencia = simular(dados)
+    simulador = simular(dados, por_regioes=True, processos=processos)
+
+    assert simulador.dia_atual == referencia.dia_atual
+    assert simulador.gerar_resultados() == referencia.gerar_resultados()
+    assert alocacoes(simulador) == alocacoes(referencia)
+
+
+def com_alteracoes_de_rede(estrategia: str) -> SimuladorIncendios:
+    """Simulador com estradas fechadas, encurtadas, alongadas, criadas e reabertas nos dias 2 a 6."""
+    simulador = SimuladorIncendios(max_dias=8, processos=1, estrategia_alocacao=estrategia)
+    simulador.carregar_dados(*instancia(semente=3, num_focos=40, num_postos=10))
+    arestas = list(simulador.grafo.edges(data='weight'))
+    simulador.agendar_alteracao_aresta(2, arestas[0][0], arestas[0][1], None)
+    simulador.agendar_alteracao_aresta(3, arestas[1][0], arestas[1][1], arestas[1][2] / 4)
+    simulador.agendar_alteracao_aresta(4, arestas[2][0], arestas[2][1], arestas[2][2] * 3)
+    simulador.agendar_alteracao_aresta(5, 'b1', 'f7', 0.05)
+    simulador.agendar_alteracao_aresta(6, arestas[0][0], arestas[0][1], arestas[0][2])
+    return simulador
+
+
+@pytest.mark.parametrize('estrategia', ['guloso', 'prioridade'])
+def test_reparo_incremental_igual_ao_recalculo(estrategia):
+    simulador = com_alteracoes_de_rede(estrategia)
+    for _ in simulador.simular_dias():
+        np.testing.assert_allclose(simulador.alocador.tempos_deslocamento,
+                                   tempos_recalculados(simulador), rtol=1e-12)
+    assert simulador.dia_atual == 8
+
+    # A prioridade refaz os candidatos dos focos reparados e segue alocando como o guloso
+    if estrategia == 'prioridade':
+        referencia = com_alteracoes_de_rede('guloso')
+        referencia.simular()
+        assert alocacoes(simulador) == alocacoes(referencia)
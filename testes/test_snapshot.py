@@ -0,0 +1,86 @@
+import numpy as np
+import pytest
+
+from entidades.snapshot import ler_snapshot
+from servicos.simulador import SimuladorIncendios
+from testes.test_simulador import alocacoes
+from utils.gerador_instancias import GeradorInstancias
+
+DADOS = GeradorInstancias.gerar(30, 8, capacidades=('uniforme', 0.5, 2.0), semente=0)
+
+
+def simulador_no_dia(dia: int, **opcoes) -> SimuladorIncendios:
+    simulador = SimuladorIncendios(max_dias=dia, processos=1, **opcoes)
+    simulador.carregar_dados(*DADOS)
+    simulador.simular()
+    simulador.max_dias = 60
+    return simulador
+
+
+def assert_mesmos_arrays(snapshot, esperado):
+    for nome in ('areas_iniciais', 'taxas', 'areas', 'ativos', 'dias_extincao', 'capacidades',
+                 'tempo_trabalho', 'capacidades_alocadas', 'areas_historico'):
+        np.testing.assert_array_equal(getattr(snapshot, nome), getattr(esperado, nome))
+    for nome, coluna in esperado.colunas.items():
+        np.testing.assert_array_equal(snapshot.colunas[nome], coluna)
+        assert snapshot.colunas[nome].dtype == coluna.dtype
+
+
+@pytest.mark.parametrize('incluir_tempos', [False, True])
+def test_para_bytes_e_ler_snapshot(incluir_tempos):
+    snapshot = simulador_no_dia(10, retencao_historico=4).snapshot()
+    lido = ler_snapshot(snapshot.para_bytes(incluir_tempos=incluir_tempos))
+
+    assert (lido.dia_atual, lido.num_dias, lido.primeiro_dia) == \
+        (snapshot.dia_atual, snapshot.num_dias, snapshot.primeiro_dia)
+    assert lido.primeiro_dia > 0
+    assert lido.focos_ids == snapshot.focos_ids and lido.postos_ids == snapshot.postos_ids
+    assert_mesmos_arrays(lido, snapshot)
+    if incluir_tempos:
+        np.testing.assert_array_equal(lido.tempos_deslocamento, snapshot.tempos_deslocamento)
+    else:
+        assert lido.tempos_deslocamento is None
+
+
+@pytest.mark.parametrize('motor', ['objetos', 'vetorizado'])
+def test_restaurar_de_bytes_continua_como_sem_interrupcao(motor):
+    continuo = simulador_no_dia(60, motor=motor)
+    dados = simulador_no_dia(10, motor=motor).snapshot().para_bytes(incluir_tempos=True)
+
+    restaurado = SimuladorIncendios(max_dias=60, processos=1, motor=motor)
+    restaurado.restaurar(ler_snapshot(dados))
+    assert restaurado.dia_atual == 10
+    assert restaurado.simular() == continuo.gerar_resultados()
+    assert alocacoes(restaurado) == alocacoes(continuo)
+    np.testing.assert_array_equal(restaurado.historico.areas_numpy(), continuo.historico.areas_numpy())
+
+
+def test_snapshot_nao_muda_quando_a_simulacao_segue():
+    simulador = simulador_no_dia(5)
+    snapshot = simulador.snapshot()
+    gravado = ler_snapshot(snapshot.para_bytes())
+    simulador.simular()
+    assert simulador.dia_atual > 5
+    assert_mesmos_arrays(snapshot, gravado)
+
+    ramo = SimuladorIncendios(max_dias=60, processos=1)
+    ramo.restaurar(snapshot, tempos_deslocamento=simulador.alocador.tempos_deslocamento)
+    ramo.simular()
+    assert alocacoes(ramo) == alocacoes(simulador)
+
+
+def test_restaurar_sem_tempos_de_deslocamento():
+    dados = simulador_no_dia(5).snapshot().para_bytes()
+    with pytest.raises(ValueError):
+        SimuladorIncendios(processos=1).restaurar(ler_snapshot(dados))
+
+
+def test_fork_com_outra_capacidade_nao_afeta_o_original():
+    simulador = simulador_no_dia(5)
+    ramo = simulador.fork()
+    ramo.alterar_capacidade('b0', 0.0)
+    ramo.simular()
+    simulador.simular()
+    assert alocacoes(simulador) == alocacoes(simulador_no_dia(60))
+    assert alocacoes(ramo)[:5] == alocacoes(simulador)[:5]
+    assert all(posto != 'b0' for dia in alocacoes(ramo)[5:] for posto, *_ in dia)
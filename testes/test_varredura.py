@@ -0,0 +1,79 @@
+import numpy as np
+import pytest
+
+from servicos.simulador import SimuladorIncendios
+from servicos.varredura import (agregar_resultados, executar_varredura, gerar_cenarios_aleatorios,
+                                gerar_cenarios_grade)
+from utils.gerador_instancias import GeradorInstancias
+
+DADOS = GeradorInstancias.gerar(20, 5, capacidades=('uniforme', 0.5, 2.0), semente=0)
+DISTRIBUICOES = {'capacidades': ('uniforme', 0.5, 1.5), 'fatores_crescimento': ('normal', 0.05)}
+
+
+def test_cenarios_aleatorios_reproduziveis_e_parametros_ausentes_fixos():
+    cenarios = gerar_cenarios_aleatorios(DADOS, 6, DISTRIBUICOES, semente=1)
+    repetidos = gerar_cenarios_aleatorios(DADOS, 6, DISTRIBUICOES, semente=1)
+    for nome, valores in cenarios.items():
+        np.testing.assert_array_equal(valores, repetidos[nome])
+    assert cenarios['capacidades'].shape == (6, 5)
+    np.testing.assert_array_equal(cenarios['areas_iniciais'], np.tile(DADOS[3], (6, 1)))
+    razao = cenarios['capacidades'] / np.asarray(DADOS[2])
+    assert razao.min() >= 0.5 and razao.max() < 1.5
+
+    with pytest.raises(ValueError):
+        gerar_cenarios_aleatorios(DADOS, 2, {'capacidades': ('triangular', 1.0)})
+
+
+def test_cenarios_em_grade():
+    cenarios = gerar_cenarios_grade(DADOS, {'fatores_crescimento': [0.9, 1.1], 'capacidades': [0.5, 1.0, 2.0]})
+    assert len(cenarios['capacidades']) == 6
+    # Combinações na ordem de PARAMETROS, não na do dicionário
+    np.testing.assert_allclose(cenarios['capacidades'][:, 0] / DADOS[2][0], [0.5, 0.5, 1.0, 1.0, 2.0, 2.0])
+    np.testing.assert_allclose(cenarios['fatores_crescimento'][:, 0] / DADOS[4][0], [0.9, 1.1] * 3)
+    assert len(gerar_cenarios_grade(DADOS, {})['capacidades']) == 1
+
+
+@pytest.mark.parametrize('motor', ['objetos', 'vetorizado'])
+def test_varredura_igual_a_simulacoes_independentes(motor):
+    cenarios = gerar_cenarios_aleatorios(DADOS, 5, DISTRIBUICOES, semente=2)
+    agregado = executar_varredura(DADOS, cenarios, max_dias=40, motor=motor, processos=1)
+
+    saida = []
+    for k in range(5):
+        simulador = SimuladorIncendios(max_dias=40, processos=1)
+        simulador.carregar_dados(20, 5, cenarios['capacidades'][k], cenarios['areas_iniciais'][k],
+                                 cenarios['fatores_crescimento'][k], DADOS[5])
+        resultados = simulador.simular()
+        saida.append((resultados['sucesso'], resultados['dias_totais'],
+                      np.array([f.status == 'extinto' for f in simulador.mapa_focos.values()])))
+    esperado = agregar_resultados(saida, list(simulador.mapa_focos))
+
+    np.testing.assert_array_equal(agregado.pop('dias_totais'), esperado.pop('dias_totais'))
+    assert agregado == esperado
+
+
+def test_varredura_em_processos_igual_a_serial():
+    cenarios = gerar_cenarios_aleatorios(DADOS, 9, DISTRIBUICOES, semente=3)
+    serial = executar_varredura(DADOS, cenarios, max_dias=40, processos=1)
+    paralelo = executar_varredura(DADOS, cenarios, max_dias=40, processos=2)
+    np.testing.assert_array_equal(paralelo.pop('dias_totais'), serial.pop('dias_totais'))
+    assert paralelo == serial
+
+
+def test_cenarios_de_outra_rede_sao_rejeitados():
+    cenarios = gerar_cenarios_aleatorios(GeradorInstancias.gerar(20, 6, semente=0), 2, {})
+    with pytest.raises(ValueError):
+        executar_varredura(DADOS, cenarios, processos=1)
+
+
+def test_agregar_resultados():
+    saida = [(True, 4, np.array([True, True])), (False, 10, np.array([True, False])),
+             (True, 6, np.array([True, True])), (True, 4, np.array([True, True]))]
+    agregado = agregar_resultados(saida, ['f0', 'f1'])
+    assert agregado['execucoes'] == 4
+    assert agregado['taxa_falha'] == 0.25
+    assert agregado['dias_extincao']['histograma'] == {4: 2, 6: 1}
+    assert agregado['dias_extincao']['media'] == pytest.approx(14 / 3)
+    assert agregado['dias_extincao']['mediana'] == 4.0
+    assert agregado['prob_extincao_foco'] == {'f0': 1.0, 'f1': 0.75}
+    assert agregar_resultados([], ['f0'])['dias_extincao']['media'] is None
@@ -0,0 +1,70 @@
+import subprocess
+import sys
+
+import pytest
+
+import servicos.visualizacao as visualizacao
+from servicos.grafo import construir_grafo
+from servicos.simulador import SimuladorIncendios
+from utils.gerador_instancias import GeradorInstancias
+
+
+def test_importar_nao_troca_o_backend_do_matplotlib():
+    codigo = ("import matplotlib; antes = matplotlib.rcParams._get_backend_or_none(); "
+              "import servicos.visualizacao; print(antes == matplotlib.rcParams._get_backend_or_none())")
+    saida = subprocess.run([sys.executable, '-c', codigo], capture_output=True, text=True, check=True,
+                           env={'PYTHONPATH': '.', 'MPLBACKEND': ''}).stdout
+    assert saida.strip() == 'True'
+
+
+def test_layout_fica_no_cache_proprio(tmp_path, monkeypatch):
+    monkeypatch.setattr(visualizacao, 'DIRETORIO_CACHE_LAYOUT', str(tmp_path / 'layouts'))
+    dados = GeradorInstancias.gerar(20, 5, semente=0)
+    grafo = construir_grafo(dados[0], dados[1], dados[5])
+    cache = visualizacao.criar_cache_layout()
+
+    posicoes = visualizacao.calcular_layout(grafo, 'spring', cache)
+    assert len(list((tmp_path / 'layouts').glob('*.npy'))) == 1
+    assert cache.limite_bytes == visualizacao.LIMITE_CACHE_LAYOUT
+
+    # Segunda chamada vem do cache, com as mesmas posições
+    monkeypatch.setattr(visualizacao.nx, 'spring_layout', None)
+    repetidas = visualizacao.calcular_layout(grafo, 'spring', cache)
+    assert all((repetidas[n] == posicoes[n]).all() for n in grafo.nodes)
+
+
+@pytest.fixture
+def pasta_imagens(tmp_path, monkeypatch):
+    (tmp_path / 'outputs' / 'images').mkdir(parents=True)
+    monkeypatch.chdir(tmp_path)
+    return tmp_path / 'outputs' / 'images'
+
+
+def assert_png(caminho):
+    assert caminho.read_bytes()[:8] == b'\x89PNG\r\n\x1a\n'
+
+
+@pytest.mark.parametrize('num_focos, modo', [(20, 'auto'), (20, 'grande'), (visualizacao.LIMIAR_GRANDE, 'auto')])
+def test_visualizar_grafo(num_focos, modo, pasta_imagens):
+    dados = GeradorInstancias.gerar(num_focos, 5, semente=0)
+    grafo = construir_grafo(dados[0], dados[1], dados[5])
+    assert visualizacao.visualizar_grafo(grafo, 'rede', modo=modo) == 'outputs/images/grafo_incendio_rede.png'
+    assert_png(pasta_imagens / 'grafo_incendio_rede.png')
+
+
+def test_visualizar_dias_so_desenha_dias_do_historico(pasta_imagens):
+    simulador = SimuladorIncendios(max_dias=8, processos=1, retencao_historico=3)
+    simulador.carregar_dados(*GeradorInstancias.gerar(20, 5, capacidades=('constante', 0.5), semente=0))
+    simulador.simular()
+
+    primeiro = simulador.historico.primeiro_dia
+    assert 1 < primeiro < 6
+
+    salvos = visualizacao.visualizar_dias(simulador.grafo, simulador.historico, 'sim')
+    assert salvos == [f'outputs/images/grafo_incendio_sim_dia{dia:03d}.png' for dia in range(primeiro, 9)]
+    for caminho in salvos:
+        assert_png(pasta_imagens.parent.parent / caminho)
+
+    escolhidos = visualizacao.visualizar_dias(simulador.grafo, simulador.historico, 'sim', dias=[1, 6, 8, 9])
+    assert escolhidos == ['outputs/images/grafo_incendio_sim_dia006.png',
+                          'outputs/images/grafo_incendio_sim_dia008.png']
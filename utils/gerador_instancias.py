@@ -0,0 +1,151 @@
+from typing import Callable, Optional, Tuple, Union
+
+import numpy as np
+
+from entidades.lista_arestas import ListaArestas
+from servicos.grafo import arestas_da_matriz
+
+# ('uniforme', a, b): valores em U(a, b)
+# ('normal', media, desvio): valores em N(media, desvio), cortados em `minimo`
+# ('constante', valor): todos iguais
+# função(rng, n) -> array: distribuição livre
+Distribuicao = Union[Tuple, Callable[[np.random.Generator, int], np.ndarray]]
+
+
+class GeradorInstancias:
+    """Gera instâncias aleatórias conexas no formato lido pelo LeitorEntrada."""
+
+    def gerar(num_focos: int, num_postos: int, grau_medio: float = 4.0,
+              distancias: Distribuicao = ('uniforme', 0.5, 6.0),
+              capacidades: Distribuicao = ('uniforme', 1.0, 15.0),
+              areas: Distribuicao = ('uniforme', 5.0, 200.0),
+              fatores: Distribuicao = ('uniforme', 1.0, 1.6),
+              semente: Optional[int] = None, regioes: int = 1) -> Tuple:
+        """
+        Sorteia uma rede conexa (ou com `regioes` componentes) e os valores de focos e postos.
+
+        A rede começa por uma árvore aleatória (cada nó liga-se a um nó anterior
+        sorteado), o que garante a conexidade, e recebe arestas aleatórias extras
+        até o grau médio pedido. Com regioes > 1, os nós são repartidos em
+        regiões de tamanhos parecidos, cada uma com sua árvore, e as arestas
+        extras não cruzam regiões.
+
+        Args:
+            num_focos: Número de focos de incêndio
+            num_postos: Número de postos de brigadistas
+            grau_medio: Densidade da rede, em arestas por nó (x2)
+            distancias: Distribuição das distâncias das arestas (horas)
+            capacidades: Distribuição das capacidades dos postos (km²/hora)
+            areas: Distribuição das áreas iniciais dos focos (km²)
+            fatores: Distribuição dos fatores de crescimento diário
+            semente: Semente do gerador aleatório
+            regioes: Número de componentes conexas da rede (com 1, o mesmo sorteio de sempre)
+
+        Returns:
+            Mesma tupla do LeitorEntrada.ler_arquivo_arestas (rede em ListaArestas)
+        """
+        rng = np.random.default_rng(semente)
+        num_nos = num_focos + num_postos
+        if not 1 <= regioes <= max(1, num_nos):
+            raise ValueError(f"Número de regiões inválido: {regioes} (entre 1 e o número de nós)")
+
+        # Árvore aleatória em cada região (trecho da ordem sorteada): num_nos - regioes arestas
+        ordem = rng.permutation(num_nos)
+        inicios = np.linspace(0, num_nos, regioes + 1).astype(np.int64)[:-1]
+        regiao_posicao = np.searchsorted(inicios, np.arange(num_nos), side='right') - 1
+        regiao_no = np.empty(num_nos, dtype=np.int64)
+        regiao_no[ordem] = regiao_posicao
+        posicoes = np.setdiff1d(np.arange(num_nos), inicios)
+        inicio_posicao = inicios[regiao_posicao[posicoes]]
+        anteriores = inicio_posicao + (rng.random(len(posicoes)) * (posicoes - inicio_posicao)).astype(np.int64)
+        origens, destinos = ordem[posicoes], ordem[anteriores]
+
+        # Arestas extras dentro das regiões, sem laços nem repetições
+        tamanhos = np.diff(np.append(inicios, num_nos))
+        extras = max(0, int(round(grau_medio * num_nos / 2)) - len(origens))
+        maximo = int((tamanhos * (tamanhos - 1) // 2).sum())
+        extras = min(extras, maximo - len(origens))
+        if extras > 0:
+            existentes = np.minimum(origens, destinos) * num_nos + np.maximum(origens, destinos)
+            novas = np.empty(0, dtype=np.int64)
+            while len(novas) < extras:
+                u = rng.integers(0, num_nos, 2 * (extras - len(novas)) + 16)
+                v = rng.integers(0, num_nos, len(u))
+                validas = (u != v) & (regiao_no[u] == regiao_no[v])
+                codigos = np.minimum(u, v)[validas] * num_nos + np.maximum(u, v)[validas]
+                codigos = np.setdiff1d(np.unique(np.concatenate((novas, codigos))), existentes)
+                novas = rng.permutation(codigos)[:extras] if len(codigos) > extras else codigos
+            origens = np.concatenate((origens, novas // num_nos))
+            destinos = np.concatenate((destinos, novas % num_nos))
+
+        pesos = np.round(GeradorInstancias.sortear(rng, distancias, len(origens), minimo=0.01), 2)
+        rede = ListaArestas(num_nos, origens.astype(np.int64), destinos.astype(np.int64), pesos)
+
+        return (num_focos, num_postos,
+                np.round(GeradorInstancias.sortear(rng, capacidades, num_postos, minimo=0.0), 2).tolist(),
+                np.round(GeradorInstancias.sortear(rng, areas, num_focos, minimo=0.0), 2).tolist(),
+                np.round(GeradorInstancias.sortear(rng, fatores, num_focos, minimo=0.0), 3).tolist(),
+                rede)
+
+    def sortear(rng: np.random.Generator, distribuicao: Distribuicao, quantidade: int,
+                minimo: float = 0.0) -> np.ndarray:
+        """Sorteia `quantidade` valores da distribuição, sem ficar abaixo de `minimo`."""
+        if callable(distribuicao):
+            valores = np.asarray(distribuicao(rng, quantidade), dtype=np.float64).reshape(quantidade)
+        elif distribuicao[0] == 'uniforme':
+            valores = rng.uniform(distribuicao[1], distribuicao[2], quantidade)
+        elif distribuicao[0] == 'normal':
+            valores = rng.normal(distribuicao[1], distribuicao[2], quantidade)
+        elif distribuicao[0] == 'constante':
+            valores = np.full(quantidade, float(distribuicao[1]))
+        else:
+            raise ValueError(f"Distribuição inválida: {distribuicao!r}")
+        return np.maximum(valores, minimo)
+
+    def salvar(dados: Tuple, nome_arquivo: str, formato: str = 'arestas') -> None:
+        """
+        Grava a instância num arquivo de entrada.
+
+        Args:
+            dados: Tupla de gerar (ou do LeitorEntrada)
+            nome_arquivo: Caminho do arquivo
+            formato: 'arestas' (lista de arestas, para main.py --arestas) ou 'matriz'
+                     (matriz de distâncias completa, escrita linha a linha)
+        """
+        num_focos, num_postos, capacidades, areas_iniciais, fatores_crescimento, rede = dados
+        if formato not in ('arestas', 'matriz'):
+            raise ValueError(f"Formato inválido '{formato}' - opções: arestas, matriz")
+        if not isinstance(rede, ListaArestas):
+            rede = GeradorInstancias.lista_arestas(rede)
+
+        with open(nome_arquivo, 'w') as f:
+            f.write(f"{num_focos} {num_postos}\n")
+            for valores in (capacidades, areas_iniciais, fatores_crescimento):
+                f.write(" ".join(map(GeradorInstancias.numero, valores)) + "\n")
+
+            if formato == 'arestas':
+                for u, v, d in zip(rede.origens.tolist(), rede.destinos.tolist(), rede.distancias.tolist()):
+                    f.write(f"{u} {v} {GeradorInstancias.numero(d)}\n")
+                return
+
+            # Matriz: vizinhos de cada nó agrupados, uma linha montada por vez
+            origens = np.concatenate((rede.origens, rede.destinos))
+            destinos = np.concatenate((rede.destinos, rede.origens))
+            distancias = np.concatenate((rede.distancias, rede.distancias))
+            ordem = np.argsort(origens, kind='stable')
+            inicios = np.searchsorted(origens[ordem], np.arange(rede.num_nos + 1))
+            linha = np.zeros(rede.num_nos)
+            for no in range(rede.num_nos):
+                vizinhos = ordem[inicios[no]:inicios[no + 1]]
+                linha[destinos[vizinhos]] = distancias[vizinhos]
+                f.write(" ".join(map(GeradorInstancias.numero, linha.tolist())) + "\n")
+                linha[destinos[vizinhos]] = 0.0
+
+    def numero(valor: float) -> str:
+        """Texto mais curto que relê o mesmo float (0 sem casas, para matrizes esparsas)."""
+        return '0' if valor == 0 else repr(float(valor))
+
+    def lista_arestas(matriz) -> ListaArestas:
+        """Converte uma matriz de distâncias em ListaArestas (uma aresta por par)."""
+        origens, destinos, distancias = arestas_da_matriz(matriz)
+        return ListaArestas(len(matriz), origens, destinos, distancias)
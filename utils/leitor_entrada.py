@@ -1,5 +1,12 @@
 from typing import Tuple, Optional, List
+import mmap
+import os
 import sys
+import warnings
+
+import numpy as np
+
+from entidades.lista_arestas import ListaArestas
 
 
 class LeitorEntrada:
@@ -47,6 +54,141 @@ class LeitorEntrada:
             print(f"Erro no arquivo '{nome_arquivo}': {str(e)}", file=sys.stderr)
             return None
 
+    def ler_arquivo_mmap(nome_arquivo: str, dtype=np.float64) -> Optional[Tuple]:
+        """
+        Lê um arquivo de entrada grande mapeando-o em memória.
+
+        A matriz de distâncias é convertida linha a linha direto para um array
+        NumPy contíguo (float64 ou float32), sem passar por listas de floats.
+        O retorno e as mensagens de erro são os mesmos de ler_arquivo.
+        """
+        try:
+            with open(nome_arquivo, 'rb') as f:
+                if os.fstat(f.fileno()).st_size == 0:
+                    raise ValueError("Arquivo de entrada incorreto")
+                mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            with mm:
+                linhas = LeitorEntrada._linhas_nao_vazias(mm)
+                (num_focos, num_postos, capacidades, areas_iniciais,
+                 fatores_crescimento) = LeitorEntrada._ler_cabecalho(linhas)
+
+                num_nos = num_focos + num_postos
+                matriz_distancias = np.empty((num_nos, num_nos), dtype=dtype)
+                lidas = 0
+                for linha in linhas:
+                    if lidas == num_nos:
+                        break
+                    matriz_distancias[lidas] = LeitorEntrada.ler_linha_matriz(
+                        linha, num_nos, f"linha {lidas + 5} da matriz")
+                    lidas += 1
+
+                if lidas < num_nos:
+                    raise ValueError(f"Arquivo deve ter pelo menos {4 + num_nos} linhas")
+
+                return (num_focos, num_postos, capacidades, areas_iniciais,
+                        fatores_crescimento, matriz_distancias)
+
+        except FileNotFoundError:
+            print(f"Erro: Arquivo '{nome_arquivo}' não encontrado.", file=sys.stderr)
+            return None
+        except ValueError as e:
+            print(f"Erro no arquivo '{nome_arquivo}': {str(e)}", file=sys.stderr)
+            return None
+
+    def ler_arquivo_arestas(nome_arquivo: str) -> Optional[Tuple]:
+        """
+        Lê um arquivo no formato esparso de lista de arestas.
+
+        As quatro primeiras linhas são as mesmas do formato com matriz; depois
+        vem uma aresta `u v distância` por linha, com u e v sendo índices de nós
+        (focos de 0 a F-1, postos de F a F+P-1). A matriz densa nunca é montada:
+        o último elemento da tupla retornada é uma ListaArestas.
+        """
+        try:
+            with open(nome_arquivo, 'rb') as f:
+                if os.fstat(f.fileno()).st_size == 0:
+                    raise ValueError("Arquivo de entrada incorreto")
+                mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            with mm:
+                linhas = LeitorEntrada._linhas_nao_vazias(mm)
+                (num_focos, num_postos, capacidades, areas_iniciais,
+                 fatores_crescimento) = LeitorEntrada._ler_cabecalho(linhas)
+
+                num_nos = num_focos + num_postos
+                valores = LeitorEntrada._ler_valores_arestas(mm, linhas)
+                origens, destinos, distancias = valores[:, 0], valores[:, 1], valores[:, 2]
+
+                indices = np.concatenate((origens, destinos))
+                if (np.any(indices != np.floor(indices)) or np.any(indices < 0)
+                        or np.any(indices >= num_nos)):
+                    raise ValueError(f"Índice de nó inválido nas arestas - esperado inteiro "
+                                     f"entre 0 e {num_nos - 1}")
+
+                arestas = ListaArestas(num_nos, origens.astype(np.int64),
+                                       destinos.astype(np.int64), distancias)
+                return (num_focos, num_postos, capacidades, areas_iniciais,
+                        fatores_crescimento, arestas)
+
+        except FileNotFoundError:
+            print(f"Erro: Arquivo '{nome_arquivo}' não encontrado.", file=sys.stderr)
+            return None
+        except ValueError as e:
+            print(f"Erro no arquivo '{nome_arquivo}': {str(e)}", file=sys.stderr)
+            return None
+
+    def _ler_valores_arestas(mm: mmap.mmap, linhas) -> np.ndarray:
+        """Converte todo o trecho de arestas de uma vez para um array (E, 3)."""
+        inicio = mm.tell()
+        try:
+            with warnings.catch_warnings():
+                warnings.simplefilter('error')
+                valores = np.fromstring(mm[inicio:], sep=' ')
+            if len(valores) % 3 == 0:
+                return valores.reshape(-1, 3)
+        except (ValueError, DeprecationWarning):
+            pass
+        # Caminho lento só quando há erro: valida linha a linha com a mensagem de sempre
+        arestas = [LeitorEntrada.ler_lista_float(linha.decode(), 3, f"aresta {k}")
+                   for k, linha in enumerate(linhas, 1)]
+        return np.array(arestas, dtype=np.float64).reshape(-1, 3)
+
+    def _ler_cabecalho(linhas) -> Tuple:
+        """Lê e valida as quatro linhas iniciais (números, capacidades, áreas e fatores)."""
+        cabecalho = [linha.decode() for _, linha in zip(range(4), linhas)]
+        if len(cabecalho) < 4:
+            raise ValueError("Arquivo de entrada incorreto")
+
+        try:
+            num_focos, num_postos = map(int, cabecalho[0].split())
+        except ValueError:
+            raise ValueError("Formato inválido na linha 1 "
+                             "esperado dois números inteiros")
+
+        capacidades = LeitorEntrada.ler_lista_float(cabecalho[1], num_postos, "capacidades dos postos")
+        areas_iniciais = LeitorEntrada.ler_lista_float(cabecalho[2], num_focos, "áreas iniciais")
+        fatores_crescimento = LeitorEntrada.ler_lista_float(cabecalho[3], num_focos, "fatores de crescimento")
+        return num_focos, num_postos, capacidades, areas_iniciais, fatores_crescimento
+
+    def _linhas_nao_vazias(mm: mmap.mmap):
+        """Percorre as linhas não vazias do arquivo mapeado, sem os espaços das pontas."""
+        for linha in iter(mm.readline, b''):
+            linha = linha.strip()
+            if linha:
+                yield linha
+
+    def ler_linha_matriz(linha: bytes, tamanho_esperado: int, descricao: str) -> np.ndarray:
+        """Converte uma linha da matriz direto para array, validando como ler_lista_float."""
+        try:
+            with warnings.catch_warnings():
+                warnings.simplefilter('error')
+                valores = np.fromstring(linha, sep=' ')
+            if len(valores) == tamanho_esperado:
+                return valores
+        except (ValueError, DeprecationWarning):
+            pass
+        # Caminho lento só para linhas problemáticas: reproduz a validação original
+        return np.array(LeitorEntrada.ler_lista_float(linha.decode(), tamanho_esperado, descricao))
+
     def ler_lista_float(linha: str, tamanho_esperado: int, descricao: str) -> List[float]:
         """Lê e valida uma lista de valores float."""
         try:
@@ -0,0 +1,97 @@
+from typing import List, Optional, Sequence
+import sys
+
+
+class LinhaComando:
+    """
+    Opções `--nome valor` dos scripts da raiz (servidor.py, benchmark.py, ...).
+
+    Valor ausente, número inválido ou fora do intervalo e escolha fora das
+    opções encerram o script com a mensagem de erro e o uso, sem traceback.
+    """
+
+    def __init__(self, uso: str, argumentos: Optional[List[str]] = None):
+        """
+        Args:
+            uso: Mensagem de uso do script, mostrada nos erros
+            argumentos: Argumentos sem o nome do script (padrão: sys.argv[1:])
+        """
+        self.uso = uso
+        self.argumentos = sys.argv[1:] if argumentos is None else argumentos
+
+    def sair_com_uso(self, mensagem: str) -> None:
+        print(mensagem)
+        print(self.uso)
+        sys.exit(1)
+
+    def valor(self, nome: str, padrao=None):
+        """Valor que segue a opção `nome` na linha de comando, ou `padrao` se ela não foi passada."""
+        if nome not in self.argumentos:
+            return padrao
+        indice = self.argumentos.index(nome) + 1
+        if indice == len(self.argumentos) or self.argumentos[indice].startswith('--'):
+            self.sair_com_uso(f"Falta o valor de {nome}")
+        return self.argumentos[indice]
+
+    def inteiros(self, nome: str, padrao: Optional[List[int]] = None,
+                 minimo: Optional[int] = None) -> Optional[List[int]]:
+        """Inteiros (separados por vírgula) que seguem a opção `nome`, todos pelo menos `minimo`."""
+        valor = self.valor(nome)
+        if valor is None:
+            return padrao
+        try:
+            numeros = [int(parte) for parte in valor.split(',')]
+        except ValueError:
+            self.sair_com_uso(f"{nome} espera números inteiros, recebido '{valor}'")
+        if minimo is not None and min(numeros) < minimo:
+            self.sair_com_uso(f"{nome} espera valores de pelo menos {minimo}, recebido '{valor}'")
+        return numeros
+
+    def inteiro(self, nome: str, padrao: Optional[int] = None,
+                minimo: Optional[int] = None) -> Optional[int]:
+        """Inteiro que segue a opção `nome` (pelo menos `minimo`), ou `padrao` se ela não foi passada."""
+        valor = self.valor(nome)
+        if valor is None:
+            return padrao
+        try:
+            numero = int(valor)
+        except ValueError:
+            self.sair_com_uso(f"{nome} espera um número inteiro, recebido '{valor}'")
+        if minimo is not None and numero < minimo:
+            self.sair_com_uso(f"{nome} espera um inteiro de pelo menos {minimo}, recebido '{valor}'")
+        return numero
+
+    def numero(self, nome: str, padrao: Optional[float] = None,
+               minimo: Optional[float] = None) -> Optional[float]:
+        """Número real que segue a opção `nome` (maior que `minimo`), ou `padrao` se ela não foi passada."""
+        valor = self.valor(nome)
+        if valor is None:
+            return padrao
+        try:
+            numero = float(valor)
+        except ValueError:
+            self.sair_com_uso(f"{nome} espera um número, recebido '{valor}'")
+        if minimo is not None and not numero > minimo:
+            self.sair_com_uso(f"{nome} espera um valor maior que {minimo}, recebido '{valor}'")
+        return numero
+
+    def escolhas(self, nome: str, opcoes: Sequence[str],
+                 padrao: Optional[List[str]] = None) -> Optional[List[str]]:
+        """Itens (separados por vírgula) que seguem a opção `nome`, cada um entre `opcoes`."""
+        valor = self.valor(nome)
+        if valor is None:
+            return padrao
+        itens = valor.split(',')
+        for item in itens:
+            if item not in opcoes:
+                self.sair_com_uso(f"Valor inválido '{item}' para {nome} - opções: {', '.join(opcoes)}")
+        return itens
+
+    def escolha(self, nome: str, opcoes: Sequence[str], padrao: Optional[str] = None) -> Optional[str]:
+        """Valor que segue a opção `nome`, entre `opcoes`, ou `padrao` se ela não foi passada."""
+        itens = self.escolhas(nome, opcoes)
+        if itens is None:
+            return padrao
+        if len(itens) != 1:
+            self.sair_com_uso(f"{nome} espera uma só opção - opções: {', '.join(opcoes)}")
+        return itens[0]
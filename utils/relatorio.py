@@ -1,43 +1,92 @@
-from typing import Dict, List
+from typing import Dict, Iterator, List, Sequence, TextIO
 from entidades.foco import Foco
+from entidades.historico import HistoricoSimulacao
 from entidades.posto import Posto
-from servicos.simulador import SimuladorIncendios
 
-from pathlib import Path
+import csv
+import json
 
 
 class GeradorRelatorio:
     """Gera relatórios detalhados sobre a simulação. São printados na pasta output"""
-    
-    def gerar_relatorio(resultados: Dict, mapa_focos: Dict[str, Foco], 
+
+    FORMATOS = ('txt', 'csv', 'jsonl')
+    CAMPOS_ALOCACOES = ('dia', 'posto', 'foco', 'capacidade_alocada', 'tempo_combate', 'area_reduzida')
+    CAMPOS_FOCOS = ('foco', 'status', 'dia_extincao', 'area_inicial', 'area_atual', 'taxa_alpha')
+    TAMANHO_BLOCO = 65536  # alocações convertidas por vez nos formatos CSV/JSONL
+
+    def gerar_relatorio(resultados: Dict, mapa_focos: Dict[str, Foco],
                         mapa_postos: Dict[str, Posto],
-                        historico_de_alocacoes: List[List[dict]],
-                        nome_arquivo: str = "e") -> str:
-    
-        """Gera um relatório simulação, disponível em outputs."""
-        partes = []
-        
-        # Cabeçalho com resultado 
-        partes.append(GeradorRelatorio.cabecalho_relatorio(resultados))
-        
-        partes.append("\n DETALHES POR FOCO:")
-        partes.extend(GeradorRelatorio.detalhes_focos(mapa_focos))
-        
-        partes.append("\n RECURSOS DOS POSTOS:")
-        partes.extend(GeradorRelatorio.detalhes_postos(mapa_postos))
-        
-        partes.append("\n HISTÓRICO DE ALOCAÇÕES DIÁRIAS:")
-        partes.extend(GeradorRelatorio.historico_alocacoes(historico_de_alocacoes))
-        
-        texto_completo = "\n".join(partes)
-        nome_saida = f"outputs/relatorios/grafo_incendio_{nome_arquivo}.txt"
-        try:
-            with open(nome_saida, 'w', encoding='utf-8') as f:
-                f.write(texto_completo)
-            print(f'Relatório salvo com sucesso em {nome_saida}')
-        except Exception as e:
-            print(f'Erro ao salvar o relatório: {str(e)}')
-        return texto_completo
+                        historico_de_alocacoes: HistoricoSimulacao,
+                        nome_arquivo: str = "e",
+                        formatos: Sequence[str] = ('txt',)) -> List[str]:
+
+        """
+        Gera os relatórios da simulação em outputs/relatorios, escrevendo seção por seção.
+
+        Args:
+            formatos: 'txt' (relatório em texto), 'csv' e/ou 'jsonl' (alocações e
+                      resultado por foco, um arquivo de cada)
+
+        Returns:
+            Caminhos dos arquivos salvos
+        """
+        invalidos = [f for f in formatos if f not in GeradorRelatorio.FORMATOS]
+        if invalidos:
+            raise ValueError(f"Formato de relatório inválido '{invalidos[0]}' - "
+                             f"opções: {', '.join(GeradorRelatorio.FORMATOS)}")
+
+        saidas = []
+        if 'txt' in formatos:
+            saidas.append((f"outputs/relatorios/grafo_incendio_{nome_arquivo}.txt",
+                           lambda f: GeradorRelatorio.escrever_texto(
+                               f, resultados, mapa_focos, mapa_postos, historico_de_alocacoes)))
+        for formato in ('csv', 'jsonl'):
+            if formato in formatos:
+                saidas.append((f"outputs/relatorios/alocacoes_{nome_arquivo}.{formato}",
+                               lambda f, formato=formato: GeradorRelatorio.escrever_alocacoes(
+                                   f, historico_de_alocacoes, formato)))
+                saidas.append((f"outputs/relatorios/focos_{nome_arquivo}.{formato}",
+                               lambda f, formato=formato: GeradorRelatorio.escrever_focos(
+                                   f, mapa_focos, formato)))
+
+        salvos = []
+        for nome_saida, escrever in saidas:
+            try:
+                # O módulo csv controla as quebras de linha sozinho
+                novas_linhas = '' if nome_saida.endswith('.csv') else None
+                with open(nome_saida, 'w', encoding='utf-8', newline=novas_linhas) as f:
+                    escrever(f)
+                print(f'Relatório salvo com sucesso em {nome_saida}')
+                salvos.append(nome_saida)
+            except Exception as e:
+                print(f'Erro ao salvar o relatório: {str(e)}')
+        return salvos
+
+    def escrever_texto(arquivo: TextIO, resultados: Dict, mapa_focos: Dict[str, Foco],
+                       mapa_postos: Dict[str, Posto], historico: HistoricoSimulacao) -> None:
+        """Escreve o relatório em texto no arquivo, sem montá-lo inteiro na memória."""
+        linhas = GeradorRelatorio.linhas_relatorio(resultados, mapa_focos, mapa_postos, historico)
+        arquivo.write(next(linhas))
+        for linha in linhas:
+            arquivo.write("\n")
+            arquivo.write(linha)
+
+    def linhas_relatorio(resultados: Dict, mapa_focos: Dict[str, Foco],
+                         mapa_postos: Dict[str, Posto],
+                         historico: HistoricoSimulacao) -> Iterator[str]:
+        """Produz as linhas do relatório em texto, uma seção de cada vez."""
+        # Cabeçalho com resultado
+        yield GeradorRelatorio.cabecalho_relatorio(resultados)
+
+        yield "\n DETALHES POR FOCO:"
+        yield from GeradorRelatorio.detalhes_focos(mapa_focos)
+
+        yield "\n RECURSOS DOS POSTOS:"
+        yield from GeradorRelatorio.detalhes_postos(mapa_postos)
+
+        yield "\n HISTÓRICO DE ALOCAÇÕES DIÁRIAS:"
+        yield from GeradorRelatorio.linhas_historico(historico)
 
     def cabecalho_relatorio(resultados: Dict) -> str:
         """Gera o cabeçalho do relatório com o resultado geral."""
@@ -67,17 +116,67 @@ class GeradorRelatorio:
             for posto in mapa_postos.values()
         ]
 
-    def historico_alocacoes(historico: List[List[dict]]) -> List[str]:
-        """Gera o histórico de alocações."""
-        historico_str = []
-        for dia, alocacoes in enumerate(historico, 1):
-            historico_str.append(f"\n  Dia {dia}:")
-            if not alocacoes:
-                historico_str.append("    Nenhum recurso alocado")
-            for aloc in alocacoes:
-                historico_str.append(
-                    f"    {aloc['posto'].id} → {aloc['foco'].id}: "
-                    f"{aloc['capacidade_alocada']:.2f} km²/h por {aloc['tempo_combate']:.1f}h "
-                    f"(Total: {aloc['area_reduzida']:.2f} km²)"
+    def historico_alocacoes(historico: HistoricoSimulacao) -> List[str]:
+        """Gera o histórico de alocações a partir das colunas do HistoricoSimulacao."""
+        return list(GeradorRelatorio.linhas_historico(historico))
+
+    def linhas_historico(historico: HistoricoSimulacao) -> Iterator[str]:
+        """Produz o histórico de alocações dia a dia, convertendo só as colunas de cada dia."""
+        if historico.primeiro_dia > 0:
+            yield f"\n  (dias 1 a {historico.primeiro_dia} descartados pela retenção do histórico)"
+        for dia in range(historico.primeiro_dia + 1, historico.num_dias + 1):
+            yield f"\n  Dia {dia}:"
+            colunas = {nome: coluna.tolist() for nome, coluna in historico.alocacoes_do_dia(dia).items()}
+            if not colunas['dia']:
+                yield "    Nenhum recurso alocado"
+            for posto, foco, capacidade, tempo, area in zip(
+                    colunas['posto'], colunas['foco'], colunas['capacidade_alocada'],
+                    colunas['tempo_combate'], colunas['area_reduzida']):
+                yield (
+                    f"    {historico.postos_ids[posto]} → {historico.focos_ids[foco]}: "
+                    f"{capacidade:.2f} km²/h por {tempo:.1f}h "
+                    f"(Total: {area:.2f} km²)"
                 )
-        return historico_str
\ No newline at end of file
+
+    def registros_alocacoes(historico: HistoricoSimulacao) -> Iterator[Dict]:
+        """Produz uma alocação por vez, com os ids de posto e foco."""
+        for inicio in range(0, len(historico), GeradorRelatorio.TAMANHO_BLOCO):
+            fim = min(inicio + GeradorRelatorio.TAMANHO_BLOCO, len(historico))
+            colunas = [historico.colunas[nome][inicio:fim].tolist()
+                       for nome in GeradorRelatorio.CAMPOS_ALOCACOES]
+            for dia, posto, foco, capacidade, tempo, area in zip(*colunas):
+                yield {'dia': dia, 'posto': historico.postos_ids[posto],
+                       'foco': historico.focos_ids[foco], 'capacidade_alocada': capacidade,
+                       'tempo_combate': tempo, 'area_reduzida': area}
+
+    def registros_focos(mapa_focos: Dict[str, Foco]) -> Iterator[Dict]:
+        """Produz o resultado final de cada foco (dia_extincao None se não foi extinto)."""
+        for foco_id, foco in mapa_focos.items():
+            yield {'foco': foco_id, 'status': foco.status,
+                   'dia_extincao': foco.dia_extincao if foco.dia_extincao != -1 else None,
+                   'area_inicial': foco.area_inicial, 'area_atual': foco.area_atual,
+                   'taxa_alpha': foco.taxa_alpha}
+
+    def escrever_alocacoes(arquivo: TextIO, historico: HistoricoSimulacao, formato: str) -> None:
+        """Escreve o histórico de alocações em CSV ou JSONL."""
+        GeradorRelatorio.escrever_registros(arquivo, GeradorRelatorio.registros_alocacoes(historico),
+                                            GeradorRelatorio.CAMPOS_ALOCACOES, formato)
+
+    def escrever_focos(arquivo: TextIO, mapa_focos: Dict[str, Foco], formato: str) -> None:
+        """Escreve o resultado por foco em CSV ou JSONL."""
+        GeradorRelatorio.escrever_registros(arquivo, GeradorRelatorio.registros_focos(mapa_focos),
+                                            GeradorRelatorio.CAMPOS_FOCOS, formato)
+
+    def escrever_registros(arquivo: TextIO, registros: Iterator[Dict], campos: Sequence[str],
+                           formato: str) -> None:
+        """Escreve registros um a um: CSV com cabeçalho ou um objeto JSON por linha."""
+        if formato == 'csv':
+            escritor = csv.DictWriter(arquivo, fieldnames=campos)
+            escritor.writeheader()
+            escritor.writerows(registros)
+        elif formato == 'jsonl':
+            for registro in registros:
+                arquivo.write(json.dumps(registro, ensure_ascii=False))
+                arquivo.write("\n")
+        else:
+            raise ValueError(f"Formato inválido '{formato}' - opções: csv, jsonl")